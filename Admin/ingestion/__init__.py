@@ -55,6 +55,9 @@ from .validators import (
     CategoryValidator,
     PartValidator,
     DuplicateDetector,
+    MinHashLSHIndex,
+    OutlierDetector,
+    ValidationCache,
     ValidationResult,
     ValidationIssue,
     validate_part_data
@@ -64,11 +67,38 @@ from .validators import (
 from .reporters import (
     ReportGenerator,
     ConsoleReporter,
+    BatchAccumulator,
     IngestionBatchReport,
     PartIngestionRecord,
     generate_batch_id
 )
 
+# Commit backends
+from .commit_backends import (
+    CommitBackend,
+    SQLiteCommitBackend,
+    ConnectionPool,
+    BulkCommitter
+)
+
+# Report sinks
+from .sinks import (
+    ReportSink,
+    ReportSinkWriter
+)
+
+# Stage engine
+from .stage_engine import (
+    Stage,
+    StageEngine
+)
+
+# Record storage
+from .record_store import (
+    RecordStore,
+    RecordView
+)
+
 __all__ = [
     # Agent
     'DataIngestionAgent',
@@ -90,6 +120,9 @@ __all__ = [
     'CategoryValidator',
     'PartValidator',
     'DuplicateDetector',
+    'MinHashLSHIndex',
+    'OutlierDetector',
+    'ValidationCache',
     'ValidationResult',
     'ValidationIssue',
     'validate_part_data',
@@ -97,7 +130,26 @@ __all__ = [
     # Reporters
     'ReportGenerator',
     'ConsoleReporter',
+    'BatchAccumulator',
     'IngestionBatchReport',
     'PartIngestionRecord',
     'generate_batch_id',
+    
+    # Commit backends
+    'CommitBackend',
+    'SQLiteCommitBackend',
+    'ConnectionPool',
+    'BulkCommitter',
+    
+    # Report sinks
+    'ReportSink',
+    'ReportSinkWriter',
+    
+    # Stage engine
+    'Stage',
+    'StageEngine',
+    
+    # Record storage
+    'RecordStore',
+    'RecordView',
 ]
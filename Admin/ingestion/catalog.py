@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+Catalog Snapshot for Go-Kart Part Data Ingestion
+
+Keeps a local SQLite copy of the parts catalog for duplicate detection:
+- Part rows exported once from the database (or a JSONL dump)
+- Prebuilt index keys per part (normalized name, brand slug, SKU key)
+- MinHash signatures for LSH blocking
+- A Bloom filter of SKU keys, so SKUs the catalog doesn't have (most of
+  a new feed) skip the SKU query
+- Numeric spec values per category, as reference for outlier detection
+- Incremental refresh from a changes feed instead of full rebuilds
+
+Opening a snapshot reads nothing up front but the SKU filter: duplicate
+lookups go straight to its indexed tables through SQLite's memory-mapped
+pages.
+
+Usage:
+    python catalog.py build --parts parts.jsonl --snapshot catalog.sqlite
+    python catalog.py refresh --changes changes.jsonl --snapshot catalog.sqlite
+    python catalog.py info --snapshot catalog.sqlite
+"""
+
+import argparse
+import json
+import math
+import sqlite3
+import time
+from array import array
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable
+
+from validators import DuplicateDetector, MinHashLSHIndex, BloomFilter
+
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS parts (
+    part_id TEXT UNIQUE NOT NULL,
+    data TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    brand_slug TEXT NOT NULL,
+    sku_key TEXT NOT NULL,
+    signature BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_parts_name ON parts (name_key);
+CREATE INDEX IF NOT EXISTS idx_parts_sku ON parts (sku_key);
+CREATE TABLE IF NOT EXISTS lsh (
+    band INTEGER NOT NULL,
+    band_hash INTEGER NOT NULL,
+    brand_slug TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    PRIMARY KEY (band, band_hash, brand_slug, name_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_lsh_name ON lsh (name_key, brand_slug);
+CREATE TABLE IF NOT EXISTS spec_values (
+    part_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_spec_values ON spec_values (category, field);
+CREATE INDEX IF NOT EXISTS idx_spec_values_part ON spec_values (part_id);
+CREATE TABLE IF NOT EXISTS sku_filter (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    capacity INTEGER NOT NULL,
+    num_bits INTEGER NOT NULL,
+    num_hashes INTEGER NOT NULL,
+    bits BLOB NOT NULL
+);
+"""
+
+# SKU filters are sized for this many times the current SKU keys, so
+# refreshes can add keys before the filter has to be rebuilt
+SKU_FILTER_HEADROOM = 2
+
+
+class CatalogSnapshot:
+    """Local SQLite snapshot of the parts catalog with a prebuilt index."""
+    
+    def __init__(self, path: Path, lsh_bands: int = 32, lsh_rows: int = 4,
+                 read_only: bool = False):
+        """
+        Args:
+            path: Snapshot file (created if missing, unless read_only)
+            lsh_bands: LSH bands for a new snapshot
+            lsh_rows: LSH rows per band for a new snapshot
+            read_only: Open an existing, built snapshot for lookups only
+        
+        Raises:
+            ValueError: If the file is missing (read_only), not a snapshot,
+                or a snapshot of another format version
+        """
+        self.path = Path(path)
+        if read_only:
+            if not self.path.is_file():
+                raise ValueError(f"No catalog snapshot at {self.path}")
+            self.conn = sqlite3.connect(self.path.resolve().as_uri() + '?mode=ro', uri=True)
+        else:
+            self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA mmap_size = 268435456")
+        
+        try:
+            if not read_only:
+                self.conn.executescript(SCHEMA)
+            meta = self.meta()
+        except sqlite3.DatabaseError as e:
+            self.conn.close()
+            raise ValueError(f"{self.path} is not a catalog snapshot ({e})") from e
+        
+        version = meta.get('format_version')
+        if version is None and read_only:
+            self.conn.close()
+            raise ValueError(f"Catalog snapshot {self.path} has not been built")
+        if version is not None and version != str(SNAPSHOT_FORMAT_VERSION):
+            self.conn.close()
+            raise ValueError(f"Catalog snapshot {self.path} has format version {version}, "
+                             f"expected {SNAPSHOT_FORMAT_VERSION}; delete it and build it again")
+        
+        # The stored LSH table is only usable with the shape it was built with
+        if 'lsh_bands' in meta:
+            lsh_bands = int(meta['lsh_bands'])
+            lsh_rows = int(meta['lsh_rows'])
+        
+        self._keys = DuplicateDetector([], use_lsh=False)
+        self.lsh = MinHashLSHIndex(bands=lsh_bands, rows=lsh_rows)
+    
+    def close(self):
+        self.conn.close()
+    
+    def meta(self) -> Dict[str, str]:
+        """Snapshot metadata (format version, LSH shape, change cursor)."""
+        return dict(self.conn.execute("SELECT key, value FROM meta"))
+    
+    def _set_meta(self, values: Dict[str, str]):
+        """Store metadata along with the format version and LSH shape."""
+        values = dict({
+            'format_version': str(SNAPSHOT_FORMAT_VERSION),
+            'lsh_bands': str(self.lsh.bands),
+            'lsh_rows': str(self.lsh.rows)
+        }, **values)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                list(values.items())
+            )
+    
+    def _upsert(self, part_id: str, part: Dict[str, Any]) -> str:
+        """
+        Write a part with its index keys, signature and LSH bands.
+        
+        Returns:
+            The part's SKU key ('' when it has none)
+        """
+        self._delete(part_id)
+        
+        name_key, brand_slug, sku_key = self._keys.index_keys(part)
+        signature = self.lsh.signature(name_key)
+        self.conn.execute(
+            "INSERT INTO parts (part_id, data, name_key, brand_slug, sku_key, signature) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (part_id, json.dumps(part, default=str), name_key, brand_slug, sku_key,
+             array('Q', signature).tobytes())
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO lsh (band, band_hash, brand_slug, name_key) VALUES (?, ?, ?, ?)",
+            [(band, band_hash, brand_slug, name_key)
+             for band, band_hash in self.lsh.band_keys(signature)]
+        )
+        
+        category = part.get('category_slug') or part.get('category')
+        specs = part.get('specifications') or part.get('metadata') or {}
+        if isinstance(category, str) and isinstance(specs, dict):
+            self.conn.executemany(
+                "INSERT INTO spec_values (part_id, category, field, value) VALUES (?, ?, ?, ?)",
+                [(part_id, category, field_name, float(value))
+                 for field_name, value in specs.items()
+                 if isinstance(value, (int, float)) and not isinstance(value, bool)
+                 and math.isfinite(value)]
+            )
+        return sku_key
+    
+    def _delete(self, part_id: str) -> bool:
+        """Delete a part, dropping its LSH rows if no other part shares them."""
+        row = self.conn.execute(
+            "SELECT name_key, brand_slug FROM parts WHERE part_id = ?", (part_id,)
+        ).fetchone()
+        if row is None:
+            return False
+        
+        self.conn.execute("DELETE FROM parts WHERE part_id = ?", (part_id,))
+        self.conn.execute("DELETE FROM spec_values WHERE part_id = ?", (part_id,))
+        shared = self.conn.execute(
+            "SELECT 1 FROM parts WHERE name_key = ? AND brand_slug = ? LIMIT 1", row
+        ).fetchone()
+        if not shared:
+            self.conn.execute("DELETE FROM lsh WHERE name_key = ? AND brand_slug = ?", row)
+        return True
+    
+    def build(self, parts: Iterable[Dict[str, Any]]) -> int:
+        """
+        Replace the snapshot contents with a full catalog export.
+        
+        Parts are keyed by their 'id' (falling back to their position).
+        
+        Returns:
+            Number of parts written
+        """
+        count = 0
+        with self.conn:
+            self.conn.execute("DELETE FROM parts")
+            self.conn.execute("DELETE FROM lsh")
+            self.conn.execute("DELETE FROM spec_values")
+            for i, part in enumerate(parts):
+                self._upsert(str(part.get('id', i)), part)
+                count += 1
+            self._rebuild_sku_filter()
+        
+        self._set_meta({'built_at': _now(), 'change_cursor': ''})
+        return count
+    
+    def apply_changes(self, changes: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Apply a changes feed to the snapshot.
+        
+        Each change is {'op': 'upsert', 'id': ..., 'part': {...}} or
+        {'op': 'delete', 'id': ...}, optionally with a 'cursor' that is
+        stored so the next refresh can resume from it. Only changed rows are
+        re-keyed and re-signed.
+        
+        Returns:
+            Counts of upserted and deleted parts
+        """
+        counts = {'upserted': 0, 'deleted': 0}
+        cursor = None
+        sku_keys = []
+        
+        with self.conn:
+            for change in changes:
+                op = change.get('op', 'upsert')
+                part_id = str(change['id'])
+                if op == 'delete':
+                    if self._delete(part_id):
+                        counts['deleted'] += 1
+                elif op == 'upsert':
+                    sku_keys.append(self._upsert(part_id, change['part']))
+                    counts['upserted'] += 1
+                else:
+                    raise ValueError(f"Unknown change op: {op}")
+                cursor = change.get('cursor', cursor)
+            self._add_sku_keys(sku_keys)
+        
+        updates = {'refreshed_at': _now()}
+        if cursor is not None:
+            updates['change_cursor'] = str(cursor)
+        self._set_meta(updates)
+        return counts
+    
+    def sku_filter(self) -> Optional[BloomFilter]:
+        """Bloom filter of the snapshot's SKU keys (None for snapshots built without one)."""
+        row = self.conn.execute(
+            "SELECT capacity, num_bits, num_hashes, bits FROM sku_filter WHERE id = 0"
+        ).fetchone()
+        return BloomFilter.from_bits(*row) if row else None
+    
+    def _save_sku_filter(self, sku_filter: BloomFilter):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sku_filter (id, capacity, num_bits, num_hashes, bits) "
+            "VALUES (0, ?, ?, ?, ?)",
+            (sku_filter.capacity, sku_filter.num_bits, sku_filter.num_hashes, bytes(sku_filter.bits))
+        )
+    
+    def _rebuild_sku_filter(self):
+        """Build the SKU filter from scratch, with headroom for refreshes."""
+        count = self.conn.execute(
+            "SELECT COUNT(DISTINCT sku_key) FROM parts WHERE sku_key != ''"
+        ).fetchone()[0]
+        sku_filter = BloomFilter(max(1024, count * SKU_FILTER_HEADROOM))
+        for (sku_key,) in self.conn.execute("SELECT DISTINCT sku_key FROM parts WHERE sku_key != ''"):
+            sku_filter.add(sku_key)
+        self._save_sku_filter(sku_filter)
+    
+    def _add_sku_keys(self, sku_keys: List[str]):
+        """
+        Add refreshed SKU keys to the filter.
+        
+        Deleted parts leave their keys set, which only costs a query that
+        finds nothing. The filter is rebuilt once the snapshot outgrows it.
+        """
+        sku_filter = self.sku_filter()
+        count = self.conn.execute(
+            "SELECT COUNT(DISTINCT sku_key) FROM parts WHERE sku_key != ''"
+        ).fetchone()[0]
+        if sku_filter is None or count > sku_filter.capacity:
+            self._rebuild_sku_filter()
+            return
+        for sku_key in sku_keys:
+            if sku_key:
+                sku_filter.add(sku_key)
+        self._save_sku_filter(sku_filter)
+    
+    def spec_values(self, category: str, field: str) -> List[float]:
+        """Catalog values of a numeric spec within a category."""
+        return [row[0] for row in self.conn.execute(
+            "SELECT value FROM spec_values WHERE category = ? AND field = ?", (category, field)
+        )]
+    
+    def load_detector(self, use_lsh: Optional[bool] = None) -> 'SnapshotDuplicateDetector':
+        """
+        Open a DuplicateDetector that answers lookups from this snapshot.
+        
+        Nothing is read up front beyond a couple of counters and the SKU
+        filter; lookups use the snapshot's indexes through SQLite's
+        memory-mapped pages.
+        """
+        return SnapshotDuplicateDetector(self, use_lsh=use_lsh)
+
+
+class SnapshotDuplicateDetector(DuplicateDetector):
+    """
+    DuplicateDetector backed by a catalog snapshot.
+    
+    Part indices are snapshot rowids. Parts added during a run (e.g. records
+    accepted earlier in a batch) go into the regular in-memory indexes on
+    top of the snapshot, starting after the highest rowid.
+    """
+    
+    def __init__(self, snapshot: CatalogSnapshot, use_lsh: Optional[bool] = None):
+        conn = snapshot.conn
+        name_count, max_rowid = conn.execute(
+            "SELECT COUNT(DISTINCT name_key), COALESCE(MAX(rowid), 0) FROM parts"
+        ).fetchone()
+        # Small catalogs still switch to LSH once a batch adds enough names
+        if use_lsh is None and name_count > self.LSH_MIN_NAMES:
+            use_lsh = True
+        
+        self._base = max_rowid + 1
+        super().__init__([], use_lsh=use_lsh,
+                         lsh_bands=snapshot.lsh.bands, lsh_rows=snapshot.lsh.rows)
+        
+        self._conn = conn
+        self._sku_filter = snapshot.sku_filter()
+        self._removed: set = set()
+        self.existing_parts = SnapshotParts(conn, self._base)
+    
+    def remove(self, idx: int):
+        if idx >= self._base:
+            super().remove(idx)
+        else:
+            self._removed.add(idx)
+            self.existing_parts[idx] = None
+    
+    def _name_lookup(self, name: str) -> Iterable[int]:
+        indices = [
+            rowid for (rowid,) in self._conn.execute(
+                "SELECT rowid FROM parts WHERE name_key = ? ORDER BY rowid", (name,)
+            )
+            if rowid not in self._removed
+        ]
+        indices.extend(super()._name_lookup(name))
+        return indices
+    
+    def _sku_lookup(self, sku: str) -> Dict[str, Iterable[int]]:
+        # Most SKUs of a new feed aren't in the catalog; the filter answers
+        # those without a query
+        if self._sku_filter is not None and sku not in self._sku_filter:
+            return super()._sku_lookup(sku)
+        by_brand: Dict[str, List[int]] = {}
+        for rowid, brand in self._conn.execute(
+            "SELECT rowid, brand_slug FROM parts WHERE sku_key = ? ORDER BY rowid", (sku,)
+        ):
+            if rowid not in self._removed:
+                by_brand.setdefault(brand, []).append(rowid)
+        for brand, indices in super()._sku_lookup(sku).items():
+            by_brand.setdefault(brand, []).extend(indices)
+        return by_brand
+    
+    def _all_names(self) -> Dict[str, Any]:
+        names = {
+            name: rowid for name, rowid in self._conn.execute(
+                "SELECT name_key, MIN(rowid) FROM parts GROUP BY name_key ORDER BY MIN(rowid)"
+            )
+        }
+        for name in super()._all_names():
+            names.setdefault(name, None)
+        return names
+    
+    def _lsh_parts(self) -> Iterable[Optional[Dict[str, Any]]]:
+        # The snapshot's own LSH table covers its parts; only parts added
+        # during the run go into memory
+        return (self.existing_parts[idx] for idx in range(self._base, len(self.existing_parts)))
+    
+    def _lsh_candidates(self, name: str, brand_slug: str) -> set:
+        keys = self._lsh.band_keys(self._lsh.signature(name))
+        where = ' OR '.join(['(band = ? AND band_hash = ?)'] * len(keys))
+        params = [value for key in keys for value in key]
+        
+        candidates = super()._lsh_candidates(name, brand_slug)
+        for brand, candidate in self._conn.execute(
+            f"SELECT brand_slug, name_key FROM lsh WHERE {where}", params
+        ):
+            if not brand_slug or brand in (brand_slug, ''):
+                candidates.add(candidate)
+        return candidates
+    
+    def _order_candidates(self, names: Iterable[str]) -> List[str]:
+        names = list(names)
+        first: Dict[str, int] = {}
+        for i in range(0, len(names), 500):
+            chunk = names[i:i + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            first.update(self._conn.execute(
+                f"SELECT name_key, MIN(rowid) FROM parts WHERE name_key IN ({placeholders}) "
+                "GROUP BY name_key", chunk
+            ))
+        for name in names:
+            if name not in first and name in self._index:
+                first[name] = next(iter(self._index[name]))
+        return sorted(first, key=first.get)
+
+
+class SnapshotParts:
+    """existing_parts sequence that loads part JSON from a snapshot on access."""
+    
+    def __init__(self, conn: sqlite3.Connection, base: int):
+        self._conn = conn
+        self._base = base
+        self._added: List[Optional[Dict[str, Any]]] = []
+        self._overrides: Dict[int, Optional[Dict[str, Any]]] = {}
+    
+    def __len__(self) -> int:
+        return self._base + len(self._added)
+    
+    def __getitem__(self, idx: int) -> Optional[Dict[str, Any]]:
+        if idx in self._overrides:
+            return self._overrides[idx]
+        if idx >= self._base:
+            return self._added[idx - self._base]
+        row = self._conn.execute("SELECT data FROM parts WHERE rowid = ?", (idx,)).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def __setitem__(self, idx: int, part: Optional[Dict[str, Any]]):
+        self._overrides[idx] = part
+    
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+    
+    def append(self, part: Dict[str, Any]):
+        self._added.append(part)
+
+
+def read_jsonl(path: Path) -> Iterable[Dict[str, Any]]:
+    """Yield one JSON object per non-empty line."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _now() -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Go-Kart Part Picker - Catalog Snapshot')
+    parser.add_argument('command', choices=['build', 'refresh', 'info'])
+    parser.add_argument('--snapshot', '-s', type=Path, required=True,
+                        help='Snapshot file (SQLite)')
+    parser.add_argument('--parts', type=Path,
+                        help='Full catalog export (JSONL) for build')
+    parser.add_argument('--changes', type=Path,
+                        help='Changes feed (JSONL) for refresh')
+    
+    args = parser.parse_args()
+    if args.command != 'build' and not args.snapshot.is_file():
+        parser.error(f'no snapshot at {args.snapshot}; build one first')
+    try:
+        snapshot = CatalogSnapshot(args.snapshot, read_only=args.command == 'info')
+    except ValueError as e:
+        parser.error(str(e))
+    
+    try:
+        if args.command == 'build':
+            if not args.parts:
+                parser.error('build requires --parts')
+            count = snapshot.build(read_jsonl(args.parts))
+            print(f"✓ Wrote {count} parts to {args.snapshot}")
+        elif args.command == 'refresh':
+            if not args.changes:
+                parser.error('refresh requires --changes')
+            counts = snapshot.apply_changes(read_jsonl(args.changes))
+            print(f"✓ Upserted {counts['upserted']}, deleted {counts['deleted']}")
+        else:
+            start = time.perf_counter()
+            detector = snapshot.load_detector()
+            elapsed = (time.perf_counter() - start) * 1000
+            count = snapshot.conn.execute("SELECT COUNT(*) FROM parts").fetchone()[0]
+            for key, value in sorted(snapshot.meta().items()):
+                print(f"  {key}: {value}")
+            print(f"  parts: {count}")
+            print(f"  lsh: {'on' if detector._lsh is not None else 'off'}")
+            print(f"  sku filter: {'on' if detector._sku_filter is not None else 'off'}")
+            print(f"  load time: {elapsed:.1f} ms")
+    finally:
+        snapshot.close()
+
+
+if __name__ == '__main__':
+    main()
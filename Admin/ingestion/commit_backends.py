@@ -0,0 +1,718 @@
+"""
+Commit Backends for Go-Kart Part Data Ingestion
+
+Commit mode writes ready records through a CommitBackend in transaction
+chunks. Each chunk is written with a single executemany in its own
+transaction, so a failing chunk is rolled back on its own while the rest
+of the batch still commits.
+
+Commits are idempotent: part IDs are UUIDv5s derived from the brand slug
+and SKU (or name slug), and every row carries a hash of its content.
+Rows whose stored hash matches are skipped, changed rows are upserted,
+so re-running a full feed only writes what actually changed.
+
+Chunks are written through a ConnectionPool. With more than one
+connection, chunks are written concurrently, one writer per connection,
+which hides network round-trips to a remote database. Transient errors
+(lost connections, lock timeouts) are retried with exponential backoff
+and jitter before a chunk is reported as failed.
+
+Backends:
+- NullCommitBackend: Assigns IDs without writing anything (the default
+  until the production database is wired in)
+- SQLiteCommitBackend: Local SQLite parts table for testing and
+  benchmarking commit throughput
+- FakeLatencyBackend: In-process stand-in for a remote database that
+  simulates round-trip latency and transient failures, for tuning pool
+  settings locally
+"""
+
+import hashlib
+import json
+import queue
+import random
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable, Iterator, Callable, Tuple, Union
+
+from reporters import PartIngestionRecord, parse_price
+from stage_engine import Stage, IO_BOUND
+
+
+# Namespace for deterministic part IDs
+PART_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_DNS, 'gokartpartpicker.com')
+
+# Row fields covered by the content hash
+CONTENT_FIELDS = ('slug', 'name', 'brand', 'category', 'sku', 'specifications', 'price')
+
+# Name slugs are not unique: the same product name can come from two
+# brands, and a SKU correction gives an existing slug a new part ID
+PARTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parts (
+    id TEXT PRIMARY KEY,
+    slug TEXT NOT NULL,
+    name TEXT NOT NULL,
+    brand TEXT NOT NULL,
+    category TEXT NOT NULL,
+    sku TEXT,
+    specifications TEXT NOT NULL,
+    price REAL,
+    batch_id TEXT,
+    source_file TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT,
+    content_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_parts_sku ON parts (sku);
+CREATE INDEX IF NOT EXISTS idx_parts_slug ON parts (slug);
+"""
+
+
+class TransientCommitError(Exception):
+    """A write failed for a reason that may go away on retry."""
+
+
+class CommitAborted(Exception):
+    """Raised by a record source to stop a commit without writing the chunk in progress."""
+
+
+@dataclass
+class ChunkResult:
+    """Outcome of writing one transaction chunk."""
+    index: int
+    rows: int
+    seconds: float
+    error: Optional[str] = None
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    attempts: int = 1
+
+
+@dataclass
+class CommitResult:
+    """Outcome of committing a batch."""
+    committed_ids: List[str] = field(default_factory=list)
+    chunks: List[ChunkResult] = field(default_factory=list)
+    failed_rows: List[Optional[int]] = field(default_factory=list)
+    batch_size: int = 0
+    seconds: float = 0.0
+    backend: str = ''
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    pool: Dict[str, Any] = field(default_factory=dict)
+    
+    @property
+    def retries(self) -> int:
+        return sum(c.attempts - 1 for c in self.chunks)
+    
+    @property
+    def write_seconds(self) -> float:
+        """Time spent inside backend writes."""
+        return sum(c.seconds for c in self.chunks)
+    
+    @property
+    def rows_per_sec(self) -> float:
+        """Written (inserted + updated) rows per second of backend time."""
+        busy = self.write_seconds
+        return (self.inserted + self.updated) / busy if busy > 0 else 0.0
+    
+    @property
+    def failed_chunks(self) -> List[ChunkResult]:
+        return [c for c in self.chunks if c.error is not None]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        latencies = sorted(c.seconds for c in self.chunks)
+        return {
+            'backend': self.backend,
+            'committed': len(self.committed_ids),
+            'inserted': self.inserted,
+            'updated': self.updated,
+            'unchanged': self.unchanged,
+            'failed': len(self.failed_rows),
+            'failed_rows': self.failed_rows,
+            'chunks': len(self.chunks),
+            'failed_chunks': len(self.failed_chunks),
+            'batch_size': self.batch_size,
+            'seconds': round(self.seconds, 6),
+            'write_seconds': round(self.write_seconds, 6),
+            'rows_per_sec': round(self.rows_per_sec, 1),
+            'retries': self.retries,
+            'pool': self.pool,
+            'chunk_latency_ms': {
+                'min': round(latencies[0] * 1000, 3) if latencies else 0.0,
+                'median': round(latencies[len(latencies) // 2] * 1000, 3) if latencies else 0.0,
+                'max': round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            },
+            'chunk_details': [
+                {
+                    'index': c.index,
+                    'rows': c.rows,
+                    'inserted': c.inserted,
+                    'updated': c.updated,
+                    'unchanged': c.unchanged,
+                    'ms': round(c.seconds * 1000, 3),
+                    'rows_per_sec': round(c.rows / c.seconds, 1) if c.seconds > 0 else 0.0,
+                    'attempts': c.attempts,
+                    'error': c.error
+                }
+                for c in self.chunks
+            ]
+        }
+
+
+class CommitBackend(ABC):
+    """
+    Interface for commit targets.
+    
+    write_chunk() must upsert all rows by 'id' in one transaction and
+    either commit all of them or roll all of them back and raise.
+    """
+    
+    name = 'backend'
+    
+    def existing_hashes(self, ids: List[str]) -> Dict[str, str]:
+        """Stored content hashes for the given part IDs that exist."""
+        return {}
+    
+    @abstractmethod
+    def write_chunk(self, rows: List[Dict[str, Any]]):
+        ...
+    
+    def is_transient(self, error: Exception) -> bool:
+        """Whether a failed call is worth retrying."""
+        return isinstance(error, (TransientCommitError, ConnectionError, TimeoutError))
+    
+    def close(self):
+        pass
+
+
+class NullCommitBackend(CommitBackend):
+    """Accepts every chunk without writing it anywhere."""
+    
+    name = 'none'
+    
+    def write_chunk(self, rows: List[Dict[str, Any]]):
+        pass
+
+
+class SQLiteCommitBackend(CommitBackend):
+    """
+    Writes parts into a local SQLite database.
+    
+    Durability is tunable through SQLite's journal mode and synchronous
+    setting: 'full' fsyncs every transaction, 'normal' (with WAL) fsyncs
+    at checkpoints, 'off' leaves flushing to the OS.
+    """
+    
+    name = 'sqlite'
+    
+    def __init__(self, path: Path, synchronous: str = 'normal', journal_mode: str = 'wal'):
+        """
+        Args:
+            path: Database file (created if missing)
+            synchronous: 'off', 'normal' or 'full'
+            journal_mode: 'wal', 'delete', 'truncate' or 'memory'
+        """
+        if synchronous.lower() not in ('off', 'normal', 'full'):
+            raise ValueError(f"Unknown synchronous setting: {synchronous}")
+        if journal_mode.lower() not in ('wal', 'delete', 'truncate', 'memory'):
+            raise ValueError(f"Unknown journal mode: {journal_mode}")
+        
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute(f"PRAGMA journal_mode = {journal_mode.upper()}")
+        self.conn.execute(f"PRAGMA synchronous = {synchronous.upper()}")
+        self.conn.executescript(PARTS_SCHEMA)
+        
+        # Databases created before idempotent commits lack the hash columns
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(parts)")}
+        with self.conn:
+            for column in ('updated_at', 'content_hash'):
+                if column not in columns:
+                    self.conn.execute(f"ALTER TABLE parts ADD COLUMN {column} TEXT")
+        self._drop_unique_slug()
+    
+    def _drop_unique_slug(self):
+        """Rebuild parts tables created with a UNIQUE slug (SQLite can't drop constraints)."""
+        unique = any(
+            row[2] and [col[2] for col in self.conn.execute(f"PRAGMA index_info('{row[1]}')")] == ['slug']
+            for row in self.conn.execute("PRAGMA index_list(parts)")
+        )
+        if not unique:
+            return
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute("ALTER TABLE parts RENAME TO parts_unique_slug")
+            self.conn.execute("DROP INDEX IF EXISTS idx_parts_sku")
+            self.conn.execute("DROP INDEX IF EXISTS idx_parts_slug")
+            for statement in PARTS_SCHEMA.split(';'):
+                if statement.strip():
+                    self.conn.execute(statement)
+            self.conn.execute(
+                "INSERT INTO parts (id, slug, name, brand, category, sku, specifications, price, "
+                "batch_id, source_file, created_at, updated_at, content_hash) "
+                "SELECT id, slug, name, brand, category, sku, specifications, price, "
+                "batch_id, source_file, created_at, updated_at, content_hash FROM parts_unique_slug"
+            )
+            self.conn.execute("DROP TABLE parts_unique_slug")
+    
+    def existing_hashes(self, ids: List[str]) -> Dict[str, str]:
+        hashes = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            hashes.update(self.conn.execute(
+                f"SELECT id, content_hash FROM parts WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk
+            ))
+        return hashes
+    
+    def is_transient(self, error: Exception) -> bool:
+        # Another connection holding the write lock past the busy timeout
+        if isinstance(error, sqlite3.OperationalError):
+            message = str(error).lower()
+            return 'locked' in message or 'busy' in message
+        return super().is_transient(error)
+    
+    def write_chunk(self, rows: List[Dict[str, Any]]):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO parts (id, slug, name, brand, category, sku, specifications, "
+                "price, batch_id, source_file, created_at, content_hash) "
+                "VALUES (:id, :slug, :name, :brand, :category, :sku, :specifications, "
+                ":price, :batch_id, :source_file, :created_at, :content_hash) "
+                "ON CONFLICT (id) DO UPDATE SET slug = excluded.slug, name = excluded.name, "
+                "brand = excluded.brand, category = excluded.category, sku = excluded.sku, "
+                "specifications = excluded.specifications, price = excluded.price, "
+                "batch_id = excluded.batch_id, source_file = excluded.source_file, "
+                "updated_at = excluded.created_at, content_hash = excluded.content_hash",
+                rows
+            )
+    
+    def close(self):
+        self.conn.close()
+
+
+class FakeLatencyBackend(CommitBackend):
+    """
+    In-process stand-in for a remote database.
+    
+    Every call sleeps for one simulated round-trip (plus a per-row cost
+    for writes) and fails with TransientCommitError at the given rate, so
+    pool size and retry settings can be tuned without a network. Backends
+    created with the same store dict behave like connections to the same
+    database.
+    """
+    
+    name = 'fake'
+    
+    def __init__(self, store: Optional[Dict[str, str]] = None, latency: float = 0.02,
+                 row_latency: float = 0.0, failure_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            store: Shared id -> content hash table (a new one when None)
+            latency: Seconds per round-trip
+            row_latency: Extra seconds per written row
+            failure_rate: Probability (0-1) that a call fails transiently
+            seed: Seed for the failure draws
+        """
+        self.store = store if store is not None else {}
+        self.latency = latency
+        self.row_latency = row_latency
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+    
+    def _round_trip(self, rows: int = 0):
+        time.sleep(self.latency + rows * self.row_latency)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise TransientCommitError("simulated connection reset")
+    
+    def existing_hashes(self, ids: List[str]) -> Dict[str, str]:
+        self._round_trip()
+        return {i: self.store[i] for i in ids if i in self.store}
+    
+    def write_chunk(self, rows: List[Dict[str, Any]]):
+        self._round_trip(len(rows))
+        self.store.update((row['id'], row['content_hash']) for row in rows)
+
+
+class ConnectionPool:
+    """
+    Fixed set of backend connections shared by concurrent chunk writers.
+    
+    Writers borrow a connection with connection() and give it back when
+    the block ends. The pool records how long writers waited for a
+    connection and how busy the connections were.
+    
+    Usage:
+        pool = ConnectionPool(lambda: SQLiteCommitBackend(path), size=4)
+        with pool.connection() as backend:
+            backend.write_chunk(rows)
+        pool.stats()
+    """
+    
+    def __init__(self, factory: Callable[[], CommitBackend], size: int = 1):
+        """
+        Args:
+            factory: Opens one backend connection
+            size: Number of connections
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self.connections = [factory() for _ in range(size)]
+        self.name = self.connections[0].name
+        self._idle: queue.Queue = queue.Queue()
+        for backend in self.connections:
+            self._idle.put(backend)
+        self._lock = threading.Lock()
+        self.reset_stats()
+    
+    @classmethod
+    def single(cls, backend: CommitBackend) -> 'ConnectionPool':
+        """Pool around one already open backend."""
+        return cls(lambda: backend, 1)
+    
+    def reset_stats(self):
+        """Start a new measurement window."""
+        with self._lock:
+            self.acquisitions = 0
+            self.wait_seconds = 0.0
+            self.max_wait_seconds = 0.0
+            self.busy_seconds = 0.0
+            self._first_acquired: Optional[float] = None
+            self._last_released: Optional[float] = None
+    
+    @contextmanager
+    def connection(self) -> Iterator[CommitBackend]:
+        """Borrow a connection, waiting while all of them are in use."""
+        requested = time.perf_counter()
+        backend = self._idle.get()
+        acquired = time.perf_counter()
+        try:
+            yield backend
+        finally:
+            released = time.perf_counter()
+            self._idle.put(backend)
+            with self._lock:
+                waited = acquired - requested
+                self.acquisitions += 1
+                self.wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+                self.busy_seconds += released - acquired
+                if self._first_acquired is None:
+                    self._first_acquired = acquired
+                self._last_released = released
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Pool metrics for the current window.
+        
+        Utilization is the share of connection time spent holding a
+        connection between the first acquisition and the last release.
+        """
+        with self._lock:
+            active = 0.0
+            if self._first_acquired is not None:
+                active = self._last_released - self._first_acquired
+            return {
+                'connections': self.size,
+                'acquisitions': self.acquisitions,
+                'wait_ms_total': round(self.wait_seconds * 1000, 3),
+                'wait_ms_avg': round(self.wait_seconds * 1000 / self.acquisitions, 3)
+                if self.acquisitions else 0.0,
+                'wait_ms_max': round(self.max_wait_seconds * 1000, 3),
+                'active_seconds': round(active, 6),
+                'utilization': round(self.busy_seconds / (self.size * active), 4)
+                if active > 0 else 0.0
+            }
+    
+    def close(self):
+        for backend in self.connections:
+            backend.close()
+
+
+class BulkCommitter:
+    """
+    Commits ready records through a backend in fixed-size chunks.
+    
+    Chunks go through a ConnectionPool; with more than one connection, up
+    to one chunk per connection is written at a time. Chunks that fail
+    with a transient error are retried with exponential backoff and full
+    jitter.
+    """
+    
+    def __init__(self, backend: Union[CommitBackend, ConnectionPool], batch_size: int = 500,
+                 retries: int = 3, retry_delay: float = 0.05, max_retry_delay: float = 2.0):
+        """
+        Args:
+            backend: A single backend, or a pool of backend connections
+            batch_size: Records per transaction chunk
+            retries: Retries per chunk after a transient error
+            retry_delay: Base backoff delay in seconds
+            max_retry_delay: Upper bound for one backoff delay
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if retries < 0:
+            raise ValueError("retries must not be negative")
+        self.pool = backend if isinstance(backend, ConnectionPool) else ConnectionPool.single(backend)
+        self.batch_size = batch_size
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._random = random.Random()
+    
+    def commit(self, records: Iterable[PartIngestionRecord], batch_id: str,
+               timestamp: str) -> CommitResult:
+        """
+        Write records in chunks of batch_size.
+        
+        A chunk that fails is rolled back and reported; later chunks are
+        still written. If records raises CommitAborted, the chunk being
+        collected is dropped and the exception propagates once chunks
+        already handed to a connection are done.
+        """
+        result = CommitResult(batch_size=self.batch_size, backend=self.pool.name)
+        self.pool.reset_stats()
+        start = time.perf_counter()
+        
+        if self.pool.size == 1:
+            for index, chunk in enumerate(self._chunks(records)):
+                self._collect(result, self._write(index, chunk, batch_id, timestamp))
+        else:
+            # Keep a chunk queued behind each busy connection, no more
+            in_flight = set()
+            finished = []
+            with ThreadPoolExecutor(max_workers=self.pool.size,
+                                    thread_name_prefix='commit-writer') as executor:
+                for index, chunk in enumerate(self._chunks(records)):
+                    if len(in_flight) >= 2 * self.pool.size:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        finished.extend(f.result() for f in done)
+                    in_flight.add(executor.submit(self._write, index, chunk, batch_id, timestamp))
+                finished.extend(f.result() for f in in_flight)
+            for written in sorted(finished, key=lambda w: w[0].index):
+                self._collect(result, written)
+        
+        result.seconds = time.perf_counter() - start
+        result.pool = self.pool.stats()
+        return result
+    
+    def close(self):
+        """Close every backend connection."""
+        self.pool.close()
+    
+    def _chunks(self, records: Iterable[PartIngestionRecord]) -> Iterator[List[PartIngestionRecord]]:
+        chunk: List[PartIngestionRecord] = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= self.batch_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    def _write(self, index: int, chunk: List[PartIngestionRecord], batch_id: str,
+               timestamp: str) -> Tuple[ChunkResult, List[str], List[Optional[int]]]:
+        rows = [part_row(record, batch_id, timestamp) for record in chunk]
+        outcome = ChunkResult(index, len(rows), 0.0, attempts=0)
+        start = time.perf_counter()
+        while True:
+            outcome.attempts += 1
+            outcome.inserted = outcome.updated = outcome.unchanged = 0
+            with self.pool.connection() as backend:
+                try:
+                    self._write_rows(backend, rows, outcome)
+                    outcome.error = None
+                    break
+                except Exception as e:
+                    outcome.error = f"{type(e).__name__}: {e}"
+                    transient = backend.is_transient(e)
+            if not transient or outcome.attempts > self.retries:
+                outcome.inserted = outcome.updated = outcome.unchanged = 0
+                break
+            time.sleep(self._backoff(outcome.attempts))
+        outcome.seconds = time.perf_counter() - start
+        return outcome, [row['id'] for row in rows], [record.row_number for record in chunk]
+    
+    @staticmethod
+    def _write_rows(backend: CommitBackend, rows: List[Dict[str, Any]], outcome: ChunkResult):
+        # Skip rows whose stored content is identical
+        known = backend.existing_hashes(list({row['id'] for row in rows}))
+        changed = []
+        for row in rows:
+            stored = known.get(row['id'])
+            if stored is None:
+                outcome.inserted += 1
+            elif stored == row['content_hash']:
+                outcome.unchanged += 1
+                continue
+            else:
+                outcome.updated += 1
+            known[row['id']] = row['content_hash']
+            changed.append(row)
+        
+        if changed:
+            backend.write_chunk(changed)
+    
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter: a random delay up to the exponential backoff cap."""
+        return self._random.uniform(0, min(self.max_retry_delay, self.retry_delay * 2 ** (attempt - 1)))
+    
+    @staticmethod
+    def _collect(result: CommitResult,
+                 written: Tuple[ChunkResult, List[str], List[Optional[int]]]):
+        outcome, ids, row_numbers = written
+        result.chunks.append(outcome)
+        if outcome.error is None:
+            result.committed_ids.extend(ids)
+            result.inserted += outcome.inserted
+            result.updated += outcome.updated
+            result.unchanged += outcome.unchanged
+        else:
+            result.failed_rows.extend(row_numbers)
+
+
+class CommitPipeline(Stage):
+    """
+    Commits records on a background thread while the batch is still being
+    processed.
+    
+    Ready records are submitted as soon as they are classified and go
+    through a bounded queue to a committer thread, which writes them in
+    BulkCommitter chunks. A slow database applies backpressure to the
+    producer instead of letting the queue grow, and record processing and
+    database writes overlap instead of running back to back. As a pipeline
+    stage (see stage_engine.py) it commits the ready records it sees and
+    passes every record on.
+    
+    Usage:
+        pipeline = CommitPipeline(committer, batch_id, timestamp)
+        for record in ready_records:
+            pipeline.submit(record)
+        result = pipeline.finish()
+    """
+    
+    name = 'commit'
+    kind = IO_BOUND
+    owns_thread = True
+    
+    _END = object()
+    
+    def __init__(self, committer: BulkCommitter, batch_id: str, timestamp: str,
+                 queue_size: Optional[int] = None):
+        """
+        Args:
+            committer: Chunked writer to run on the committer thread
+            queue_size: Maximum records waiting to be committed (default:
+                two chunks)
+        """
+        self.committer = committer
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size or 2 * committer.batch_size)
+        self._aborted = False
+        self._result: Optional[CommitResult] = None
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._run, args=(batch_id, timestamp), name='committer', daemon=True
+        )
+        self._thread.start()
+    
+    def submit(self, record: PartIngestionRecord):
+        """Queue a record for commit; blocks while the queue is full."""
+        if self._error is not None:
+            raise RuntimeError(f"Committer failed: {self._error}") from self._error
+        self._queue.put(record)
+    
+    def process(self, record: PartIngestionRecord) -> PartIngestionRecord:
+        if record.status == 'ready':
+            self.submit(record)
+        return record
+    
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+    
+    def finish(self) -> CommitResult:
+        """Commit everything still queued and stop the committer thread."""
+        self._queue.put(self._END)
+        self._thread.join()
+        if self._error is not None:
+            raise RuntimeError(f"Committer failed: {self._error}") from self._error
+        return self._result
+    
+    def abort(self):
+        """Stop committing; records still queued are dropped."""
+        self._aborted = True
+        if self._thread.is_alive():
+            self._queue.put(self._END)
+            self._thread.join()
+    
+    def _records(self) -> Iterable[PartIngestionRecord]:
+        while True:
+            record = self._queue.get()
+            if self._aborted:
+                raise CommitAborted()
+            if record is self._END:
+                return
+            yield record
+    
+    def _run(self, batch_id: str, timestamp: str):
+        try:
+            self._result = self.committer.commit(self._records(), batch_id, timestamp)
+        except CommitAborted:
+            pass
+        except BaseException as e:
+            self._error = e
+            # Keep draining so the producer never blocks on a dead thread
+            while self._queue.get() is not self._END:
+                pass
+
+
+def part_id(brand_slug: str, sku: Optional[str], slug: str) -> str:
+    """
+    Deterministic part ID: UUIDv5 of the brand slug and the normalized SKU,
+    or of the name slug for parts without a SKU.
+    """
+    sku_key = re.sub(r'[^a-z0-9]', '', (sku or '').lower())
+    key = f"{brand_slug}:sku:{sku_key}" if sku_key else f"{brand_slug}:slug:{slug}"
+    return str(uuid.uuid5(PART_ID_NAMESPACE, key))
+
+
+def content_hash(row: Dict[str, Any]) -> str:
+    """Hash of the row fields that matter for change detection."""
+    content = json.dumps([row[name] for name in CONTENT_FIELDS], default=str)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def part_row(record: PartIngestionRecord, batch_id: str, timestamp: str) -> Dict[str, Any]:
+    """Map an ingestion record to a parts table row."""
+    normalized = record.normalized_data
+    row = {
+        'slug': normalized.get('name', {}).get('slug', ''),
+        'name': normalized.get('name', {}).get('normalized', ''),
+        'brand': normalized.get('brand', {}).get('canonical', ''),
+        'category': normalized.get('category', {}).get('slug', ''),
+        'sku': normalized.get('sku') or None,
+        'specifications': json.dumps(
+            record.validation_result.get('validated_metadata')
+            or record.extracted_specs.get('metadata', {}),
+            sort_keys=True, default=str
+        ),
+        'price': parse_price(normalized.get('price')),
+        'batch_id': batch_id,
+        'source_file': record.source_file,
+        'created_at': timestamp
+    }
+    row['id'] = part_id(normalized.get('brand', {}).get('slug', ''), row['sku'], row['slug'])
+    row['content_hash'] = content_hash(row)
+    return row
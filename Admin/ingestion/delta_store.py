@@ -0,0 +1,134 @@
+"""
+Delta State for Go-Kart Part Data Ingestion
+
+Suppliers resend their full catalog on every run with only a few rows
+changed. The delta store remembers, per feed, a content hash of every
+row from the previous run together with its normalize, extract and
+validate results. With --delta, rows whose hash still matches reuse
+those results; new and changed rows are fully processed, and rows
+missing from the new file are reported as removed.
+
+Duplicate and outlier checks depend on the rest of the batch and the
+catalog, so they still run for every row.
+
+Stored results are only valid for the configuration they were produced
+with. Each feed records the validate stage fingerprint (see
+stage_store.py), and a run with a different fingerprint processes every
+row again.
+
+Usage:
+    python ingest.py --file supplier-feed.csv --delta
+    python ingest.py --file supplier-feed.csv --delta --delta-db feeds.sqlite
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Iterable
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feeds (
+    source TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    batch_id TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS feed_rows (
+    source TEXT NOT NULL,
+    row_key TEXT NOT NULL,
+    row_hash TEXT NOT NULL,
+    name TEXT,
+    stages TEXT NOT NULL,
+    PRIMARY KEY (source, row_key)
+) WITHOUT ROWID;
+"""
+
+
+class DeltaStore:
+    """Per-feed row hashes and processed results from the previous run."""
+    
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Database file (created, with its directory, if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+    
+    def close(self):
+        self.conn.close()
+    
+    def fingerprint(self, source: str) -> Optional[str]:
+        """Config fingerprint the feed was last processed with."""
+        row = self.conn.execute(
+            "SELECT fingerprint FROM feeds WHERE source = ?", (source,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def row_hashes(self, source: str) -> Dict[str, Tuple[str, Optional[str]]]:
+        """Map of row key -> (row hash, part name) for the feed's last run."""
+        return {
+            key: (row_hash, name)
+            for key, row_hash, name in self.conn.execute(
+                "SELECT row_key, row_hash, name FROM feed_rows WHERE source = ?", (source,)
+            )
+        }
+    
+    def stages(self, source: str, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Stored stage results for the given row keys."""
+        found = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            for key, data in self.conn.execute(
+                f"SELECT row_key, stages FROM feed_rows WHERE source = ? "
+                f"AND row_key IN ({','.join('?' * len(chunk))})",
+                [source] + chunk
+            ):
+                found[key] = json.loads(data)
+        return found
+    
+    def update(self, source: str, fingerprint: str, batch_id: str,
+               rows: Iterable[Tuple[str, str, Optional[str], Dict[str, Any]]],
+               removed: Iterable[str] = ()):
+        """
+        Store the feed's new state in one transaction.
+        
+        Args:
+            source: Feed identity
+            fingerprint: Config fingerprint the rows were processed with
+            batch_id: Batch that produced the state
+            rows: (row key, row hash, part name, stage results) for new and
+                changed rows
+            removed: Row keys that are no longer in the feed
+        """
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO feeds (source, fingerprint, batch_id, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (source, fingerprint, batch_id, time.time())
+            )
+            self.conn.executemany(
+                "DELETE FROM feed_rows WHERE source = ? AND row_key = ?",
+                ((source, key) for key in removed)
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO feed_rows (source, row_key, row_hash, name, stages) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (source, key, digest, name, json.dumps(stages, default=str))
+                    for key, digest, name, stages in rows
+                )
+            )
+
+
+def row_hash(record: Dict[str, Any]) -> str:
+    """Content hash of a raw input row."""
+    content = json.dumps(record, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
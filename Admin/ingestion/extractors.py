@@ -70,6 +70,27 @@ class ExtractionReport:
             'needs_review': self.needs_review,
             'review_reasons': self.review_reasons
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ExtractionReport':
+        """Rebuild a report from to_dict() output."""
+        return cls(
+            extractions=[
+                ExtractionResult(
+                    field=e['field'],
+                    value=e['value'],
+                    confidence=e['confidence'],
+                    source=e['source'],
+                    raw_match=e.get('raw_match')
+                )
+                for e in data.get('extractions', [])
+            ],
+            metadata=dict(data.get('metadata', {})),
+            engine_family=data.get('engine_family'),
+            engine_family_confidence=data.get('engine_family_confidence', 0.0),
+            needs_review=data.get('needs_review', False),
+            review_reasons=list(data.get('review_reasons', []))
+        )
 
 
 class SpecExtractor:
@@ -23,20 +23,40 @@ Output:
 import argparse
 import csv
 import json
+import re
 import sys
+from collections import Counter
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Generator
+from typing import Optional, Dict, Any, List, Tuple, Generator, Union, Iterable, Sequence
 from io import StringIO
 
 # Local imports
 from normalizers import BrandNormalizer, NameNormalizer, CategoryNormalizer, UnitNormalizer
-from extractors import SpecExtractor
-from validators import CategoryValidator, PartValidator, DuplicateDetector
+from extractors import SpecExtractor, ExtractionReport
+from catalog import CatalogSnapshot
+from validators import (
+    CategoryValidator, PartValidator, DuplicateDetector,
+    ValidationResult, ValidationIssue, ValidationCache, OutlierDetector
+)
 from reporters import (
     ReportGenerator, ConsoleReporter, 
     IngestionBatchReport, PartIngestionRecord,
-    generate_batch_id, get_timestamp
+    generate_batch_id, get_timestamp, load_saved_batch
+)
+from commit_backends import (
+    CommitBackend, CommitResult, NullCommitBackend, SQLiteCommitBackend, FakeLatencyBackend,
+    ConnectionPool, BulkCommitter, CommitPipeline
+)
+from sinks import (
+    SINK_NAMES, DEFAULT_SINK_NAMES, ReportSink, ReportSinkWriter, JsonReportSink, DryRunReportSink,
+    NeedsReviewCsvSink, ExtractionAnalysisSink, CommitSummarySink, ReportStoreSink,
+    SavedBatchSink, parse_sink_names
 )
+from delta_store import DeltaStore, row_hash
+from stage_store import StageStore, config_fingerprint, fingerprint, input_hash
+from row_index import RowIndex, INDEXABLE_FORMATS
+from stage_engine import Stage, StageEngine, CPU_BOUND
+from record_store import RecordStore
 
 
 class DataIngestionAgent:
@@ -51,18 +71,83 @@ class DataIngestionAgent:
     5. Detect duplicates
     6. Generate reports
     7. Commit (if mode=commit)
+    
+    Stages 2-7 run per record on a StageEngine (see stage_engine.py),
+    serially or with normalize and extract in worker processes.
     """
     
-    def __init__(self, mode: str = 'dry-run', verbose: bool = True):
+    # Record statuses, in report order
+    STATUSES = ['ready', 'needs_review', 'invalid', 'duplicate']
+    
+    # Input columns that identify a part (first non-empty one wins)
+    NAME_FIELDS = ['name', 'part_name', 'title', 'product_name', 'Name', 'Title']
+    BRAND_FIELDS = ['brand', 'manufacturer', 'Brand', 'Manufacturer', 'mfg']
+    SKU_FIELDS = ['sku', 'SKU', 'part_number', 'part_no', 'item_number']
+    
+    def __init__(self, mode: str = 'dry-run', verbose: bool = True,
+                 batch_validate: bool = False,
+                 catalog_path: Optional[Path] = None,
+                 report_format: str = 'json',
+                 compress_reports: bool = False,
+                 report_sinks: Optional[List[str]] = None,
+                 report_db: Optional[Path] = None,
+                 report_retention_days: Optional[float] = None,
+                 detect_outliers: bool = False,
+                 commit_backend: Optional[Union[CommitBackend, ConnectionPool]] = None,
+                 commit_batch_size: int = 500,
+                 commit_retries: int = 3,
+                 delta_db: Optional[Path] = None,
+                 stage_db: Optional[Path] = None,
+                 workers: int = 0,
+                 memory_budget: Optional[int] = None):
         """
         Initialize the ingestion agent.
         
         Args:
             mode: One of 'dry-run', 'commit', 'report-only'
             verbose: Whether to print progress to console
+            batch_validate: Validate the whole batch column by column per
+                category instead of one record at a time
+            catalog_path: Catalog snapshot (see catalog.py) to check for
+                duplicates against; must already be built
+            report_format: JSON report layout, 'json' or 'jsonl'
+            compress_reports: gzip the JSON report
+            report_sinks: Reports to write (see sinks.SINK_NAMES); the
+                default reports (all but 'batch') that apply to the mode
+                when None
+            report_db: SQLite report store (see report_store.py) to write
+                batches into
+            report_retention_days: Prune report store batches older than
+                this many days
+            detect_outliers: Flag numeric specs that are outliers within
+                their category across the batch (and catalog snapshot)
+            commit_backend: Where commit mode writes ready records, a
+                backend or a pool of backend connections (see
+                commit_backends.py); nothing is written when None
+            commit_batch_size: Records per commit transaction
+            commit_retries: Retries per chunk after a transient error
+            delta_db: Delta state database (see delta_store.py); rows
+                unchanged since the feed's last run reuse its stage results
+            stage_db: Stage store (see stage_store.py) to materialize
+                stage outputs in; re-runs only recompute stale stages
+            workers: Worker processes for the prepare stage (see
+                stage_engine.py); 0 processes records serially
+            memory_budget: Bytes of the processed-record store to keep in
+                memory; older records spill to a file in the output
+                directory (see record_store.py). The parsed input and other
+                per-batch state are not counted. Everything stays in memory
+                when None
         """
         self.mode = mode
         self.verbose = verbose
+        self.batch_validate = batch_validate
+        self.report_format = report_format
+        self.compress_reports = compress_reports
+        self.report_sinks = list(DEFAULT_SINK_NAMES) if report_sinks is None else report_sinks
+        self.report_db = report_db
+        self.report_retention_days = report_retention_days
+        self.workers = workers
+        self.memory_budget = memory_budget
         
         # Initialize components
         self.brand_normalizer = BrandNormalizer()
@@ -70,15 +155,40 @@ class DataIngestionAgent:
         self.category_normalizer = CategoryNormalizer()
         self.unit_normalizer = UnitNormalizer()
         self.spec_extractor = SpecExtractor()
-        self.category_validator = CategoryValidator()
+        self.preparer = RecordPreparer(self.name_normalizer, self.brand_normalizer,
+                                       self.category_normalizer, self.spec_extractor)
+        self.category_validator = CategoryValidator(cache=ValidationCache())
         self.part_validator = PartValidator()
         
         # Report generators
         self.report_generator = ReportGenerator()
         self.console_reporter = ConsoleReporter()
         
-        # Duplicate detector (would be populated from DB in production)
-        self.duplicate_detector = DuplicateDetector([])
+        # Duplicate detector, loaded from a local catalog snapshot when given
+        self.catalog = None
+        if catalog_path is not None:
+            self.catalog = CatalogSnapshot(catalog_path, read_only=True)
+            self.duplicate_detector = self.catalog.load_detector()
+        else:
+            self.duplicate_detector = DuplicateDetector([])
+        
+        # Commit mode writes through a backend in transaction chunks
+        self.committer = BulkCommitter(
+            commit_backend or NullCommitBackend(), commit_batch_size, retries=commit_retries
+        )
+        
+        # Batch-level outlier detection, with catalog values as reference
+        self.outlier_detector = None
+        if detect_outliers:
+            self.outlier_detector = OutlierDetector(
+                reference=self.catalog.spec_values if self.catalog is not None else None
+            )
+        
+        # Delta ingestion against the previous run of the same feed
+        self.delta_store = DeltaStore(delta_db) if delta_db is not None else None
+        
+        # Materialized stage outputs for partial re-runs
+        self.stage_store = StageStore(stage_db) if stage_db is not None else None
     
     def ingest_file(self, file_path: Path, file_format: Optional[str] = None) -> IngestionBatchReport:
         """
@@ -114,12 +224,12 @@ class DataIngestionAgent:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        records = list(self._parse_content(content, file_format))
+        records, input_info = self._parse_stage(content, file_format)
         
         if self.verbose:
             print(f"   Found {len(records)} records")
         
-        return self._process_records(records, source_file=str(file_path))
+        return self._process_records(records, source_file=str(file_path), input_info=input_info)
     
     def ingest_stdin(self, file_format: str = 'tsv') -> IngestionBatchReport:
         """
@@ -135,12 +245,48 @@ class DataIngestionAgent:
             print("\n📋 Reading from stdin...")
         
         content = sys.stdin.read()
-        records = list(self._parse_content(content, file_format))
+        records, input_info = self._parse_stage(content, file_format)
         
         if self.verbose:
             print(f"   Found {len(records)} records")
         
-        return self._process_records(records, source_file='stdin')
+        return self._process_records(records, source_file='stdin', input_info=input_info)
+    
+    def revalidate(self, batch_id: str) -> IngestionBatchReport:
+        """
+        Re-run a batch from its materialized stage outputs.
+        
+        Only stages whose config changed since the batch was processed are
+        recomputed; the result is a new batch.
+        
+        Args:
+            batch_id: Batch processed with a stage store
+        
+        Returns:
+            IngestionBatchReport
+        """
+        if self.stage_store is None:
+            raise ValueError("Revalidating needs a stage store")
+        
+        info = self.stage_store.batch(batch_id)
+        if info is None:
+            raise ValueError(f"Batch {batch_id} is not in the stage store")
+        records = self.stage_store.load(info['input_hash'], 'parse', info['file_format'])
+        if records is None:
+            raise ValueError(f"Parsed input of batch {batch_id} is no longer in the stage store")
+        
+        if self.verbose:
+            print(f"\n🔁 Revalidating batch {batch_id} ({info['source_file']})")
+            print(f"   Found {len(records)} records")
+        
+        input_info = {
+            'input_hash': info['input_hash'],
+            'file_format': info['file_format'],
+            'parse': 'reused',
+            'revalidated_from': batch_id
+        }
+        return self._process_records(records, source_file=info['source_file'],
+                                     input_info=input_info)
     
     def ingest_data(self, data: List[Dict[str, Any]], source: str = 'direct') -> IngestionBatchReport:
         """
@@ -158,6 +304,187 @@ class DataIngestionAgent:
         
         return self._process_records(data, source_file=source)
     
+    def commit_saved_batch(self, batch_id: str) -> IngestionBatchReport:
+        """
+        Commit a batch saved by an earlier dry-run without reprocessing it.
+        
+        The input file and config must be unchanged since the dry-run, so
+        the saved results are still what processing would produce.
+        
+        Args:
+            batch_id: Batch ID of the dry-run
+        
+        Returns:
+            IngestionBatchReport
+        """
+        path = self.report_generator.saved_batch_path(batch_id)
+        if not path.exists():
+            raise ValueError(f"No saved batch for {batch_id} ({path}); "
+                             f"save dry-runs with --save-batch")
+        
+        if self.verbose:
+            print(f"\n📦 Loading saved batch: {path}")
+        header, batch = load_saved_batch(path, self._record_store())
+        
+        # The caller closes the returned batch (see IngestionBatchReport.close)
+        try:
+            # The input file and config must still match the dry-run
+            source = Path(batch.source_file)
+            if not source.exists():
+                raise ValueError(f"Input file of batch {batch_id} no longer exists: {source}")
+            with open(source, 'r', encoding='utf-8') as f:
+                content = f.read()
+            if input_hash(content, header['file_format']) != header['input_hash']:
+                raise ValueError(f"{source} changed since the dry-run of batch {batch_id}; "
+                                 f"run it again")
+            if self._stage_fingerprints()['validate'] != header['config_fingerprint']:
+                raise ValueError(f"Config changed since the dry-run of batch {batch_id}; "
+                                 f"run it again")
+            
+            if self.verbose:
+                print(f"   {batch.total_records} records, {batch.ready_count} ready; "
+                      f"input and config unchanged")
+            
+            batch.mode = 'commit'
+            batch.timestamp = get_timestamp()
+            batch.summary['committed_from'] = batch_id
+            result = self._commit_records(batch)
+            
+            if 'commit' in self.report_sinks:
+                report_path = self.report_generator.generate_commit_summary(
+                    batch, result.committed_ids, result.to_dict()
+                )
+                if self.verbose:
+                    print(f"   ✓ Commit Summary: {report_path}")
+            
+            if self.verbose:
+                self.console_reporter.print_summary(batch)
+        except BaseException:
+            batch.close()
+            raise
+        
+        return batch
+    
+    def reprocess_rows(self, batch_id: str, rows: Optional[List[int]] = None,
+                       statuses: Optional[List[str]] = None) -> IngestionBatchReport:
+        """
+        Reprocess selected rows of a saved dry-run batch in place.
+        
+        The rows are re-read from the input file by seeking to their
+        offsets in the batch's row index (see row_index.py), so reviewers
+        can fix a few rows and re-run only those. Other rows keep their
+        saved results unless their duplicate or outlier checks depend on
+        a reprocessed row. The saved batch, its index and the reports are
+        rewritten under the same batch ID.
+        
+        Args:
+            batch_id: Batch ID of a dry-run saved with the 'batch' report
+            rows: 1-based row numbers to reprocess
+            statuses: Also reprocess every row with one of these statuses
+        
+        Returns:
+            IngestionBatchReport
+        """
+        if self.mode != 'dry-run':
+            raise ValueError("Rows can only be reprocessed in dry-run mode; "
+                             "commit the batch afterwards with --commit-batch")
+        
+        path = self.report_generator.saved_batch_path(batch_id)
+        if not path.exists():
+            raise ValueError(f"No saved batch for {batch_id} ({path}); "
+                             f"save dry-runs with --save-batch")
+        header, saved = load_saved_batch(path, self._record_store())
+        try:
+            return self._reprocess_saved(batch_id, header, saved, rows, statuses)
+        finally:
+            saved.close()
+    
+    def _reprocess_saved(self, batch_id: str, header: Dict[str, Any],
+                         saved: IngestionBatchReport, rows: Optional[List[int]],
+                         statuses: Optional[List[str]]) -> IngestionBatchReport:
+        """Reprocess rows of a loaded saved batch (see reprocess_rows)."""
+        file_format = header['file_format']
+        if file_format not in INDEXABLE_FORMATS:
+            raise ValueError(f"Rows of {file_format} input can't be reprocessed one by one; "
+                             f"run the file again")
+        # Saved results of the other rows are only valid for the same config
+        if self._stage_fingerprints()['validate'] != header['config_fingerprint']:
+            raise ValueError(f"Config changed since the dry-run of batch {batch_id}; run it again")
+        
+        source = Path(saved.source_file)
+        if not source.exists():
+            raise ValueError(f"Input file of batch {batch_id} no longer exists: {source}")
+        
+        # Rows may have been edited in place; only their count must match
+        index_path = self.report_generator.row_index_path(batch_id)
+        index = RowIndex.load(index_path) if index_path.exists() else None
+        if index is None or not index.matches(source):
+            index = RowIndex.build(source, file_format)
+        if len(index) != saved.total_records:
+            raise ValueError(f"{source} has {len(index)} rows but batch {batch_id} has "
+                             f"{saved.total_records}; rows were added or removed, run it again")
+        
+        selected = set(rows or [])
+        out_of_range = sorted(n for n in selected if not 1 <= n <= saved.total_records)
+        if out_of_range:
+            raise ValueError(f"Batch {batch_id} has rows 1-{saved.total_records}, "
+                             f"not {', '.join(map(str, out_of_range))}")
+        if statuses:
+            selected.update(r.row_number for r in saved.records if r.status in statuses)
+        selected = sorted(selected)
+        
+        if self.verbose:
+            print(f"\n🔧 Reprocessing {len(selected)} of {saved.total_records} rows "
+                  f"of batch {batch_id} ({source})")
+        
+        texts = index.read_rows(source, selected)
+        records = [record.original_data for record in saved.records]
+        prepared = [self._prepared_from_record(record) for record in saved.records]
+        for row_number in selected:
+            record = next(iter(self._parse_content(texts[row_number], file_format)))
+            records[row_number - 1] = record
+            prepared[row_number - 1] = self._prepare_record(record)
+        
+        # Fewer flagged rows than before may leave no needs-review CSV
+        self.report_generator.needs_review_path(batch_id).unlink(missing_ok=True)
+        
+        with open(source, 'r', encoding='utf-8') as f:
+            content_hash = input_hash(f.read(), file_format)
+        input_info = {
+            'input_hash': content_hash,
+            'file_format': file_format,
+            'parse': 'reprocessed',
+            'reprocessed': {'rows': selected, 'previous_timestamp': saved.timestamp}
+        }
+        return self._process_records(records, source_file=saved.source_file,
+                                     input_info=input_info, prepared=prepared, batch_id=batch_id,
+                                     previous=saved.records)
+    
+    def _record_store(self) -> RecordStore:
+        """Empty store for a batch's records, spilling past the memory budget."""
+        return RecordStore(self.memory_budget, spill_dir=self.report_generator.output_dir)
+    
+    def _parse_stage(self, content: str, file_format: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Parse input content, reusing the materialized parse stage when the
+        same content was parsed before.
+        
+        Returns:
+            (records, input info: input hash, format and parse status)
+        """
+        key = input_hash(content, file_format)
+        if self.stage_store is None:
+            records = list(self._parse_content(content, file_format))
+            return records, {'input_hash': key, 'file_format': file_format, 'parse': 'computed'}
+        
+        records = self.stage_store.load(key, 'parse', file_format)
+        status = 'reused'
+        if records is None:
+            records = list(self._parse_content(content, file_format))
+            self.stage_store.save(key, 'parse', file_format, records)
+            status = 'computed'
+        return records, {'input_hash': key, 'file_format': file_format, 'parse': status}
+    
     def _parse_content(self, content: str, file_format: str) -> Generator[Dict[str, Any], None, None]:
         """Parse content based on format."""
         if file_format == 'csv':
@@ -198,111 +525,232 @@ class DataIngestionAgent:
                 yield json.loads(line)
     
     def _process_records(self, records: List[Dict[str, Any]], 
-                         source_file: str) -> IngestionBatchReport:
-        """Process a list of records through the ingestion pipeline."""
-        batch_id = generate_batch_id()
+                         source_file: str,
+                         input_info: Optional[Dict[str, Any]] = None,
+                         prepared: Optional[List[Dict[str, Any]]] = None,
+                         batch_id: Optional[str] = None,
+                         previous: Optional[Sequence[PartIngestionRecord]] = None) -> IngestionBatchReport:
+        """
+        Process a list of records through the ingestion pipeline.
+        
+        Args:
+            input_info: Input hash, format and parse status of parsed input
+                (see _parse_stage); None for data passed in directly
+            prepared: Already prepared records (reprocessing); the delta
+                and stage stores are not used
+            batch_id: Batch ID to write the reports under (default: new ID)
+            previous: Records of the batch being reprocessed; rows not in
+                input_info['reprocessed'] keep them where still valid
+        """
+        batch_id = batch_id or generate_batch_id()
         timestamp = get_timestamp()
         
-        processed_records: List[PartIngestionRecord] = []
-        ready_count = 0
-        needs_review_count = 0
-        invalid_count = 0
-        duplicate_count = 0
+        # Finished records are kept encoded; the batch report reads them
+        # back as views
+        processed_records = self._record_store()
         
-        for i, record in enumerate(records):
-            if self.verbose and (i + 1) % 100 == 0:
-                print(f"   Processing record {i + 1}/{len(records)}...")
-            
-            processed = self._process_single_record(record, row_number=i + 1, source_file=source_file)
-            processed_records.append(processed)
-            
-            if processed.status == 'ready':
-                ready_count += 1
-            elif processed.status == 'needs_review':
-                needs_review_count += 1
-            elif processed.status == 'invalid':
-                invalid_count += 1
-            elif processed.status == 'duplicate':
-                duplicate_count += 1
+        stage_key = None
+        stage_runs: Dict[str, str] = {}
+        if input_info is not None and self.stage_store is not None and prepared is None:
+            stage_key = input_info['input_hash']
+            self.stage_store.record_batch(batch_id, stage_key, input_info['file_format'], source_file)
+        
+        # Delta mode reuses the stage results of rows that are unchanged
+        # since the last run of this feed
+        delta = None
+        stored: Dict[int, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        if self.delta_store is not None and prepared is None:
+            delta = self._load_delta(records, source_file)
+            stored = delta['stored']
+        
+        # Batch-wide stages, delta state and stage materialization need
+        # every record prepared (and validated) up front
+        validation_results = None
+        outliers: Dict[int, List[ValidationIssue]] = {}
+        if prepared is None and (self.batch_validate or self.outlier_detector is not None or
+                                 delta is not None or stage_key is not None):
+            prepared = self._load_stage(stage_key, 'prepare', stage_runs)
+            if prepared is None:
+                prepared = [
+                    stored[i][0] if i in stored else self._prepare_record(record)
+                    for i, record in enumerate(records)
+                ]
+                self._save_stage(stage_key, 'prepare', prepared, stage_runs)
+        if self.batch_validate or delta is not None or stage_key is not None:
+            validation_results = self._load_stage(stage_key, 'validate', stage_runs)
+            if validation_results is None:
+                fresh = [i for i in range(len(records)) if i not in stored]
+                if self.batch_validate:
+                    fresh_results = self._validate_prepared_batch([prepared[i] for i in fresh])
+                else:
+                    fresh_results = [self._validate_prepared(prepared[i]) for i in fresh]
+                validation_results = [stored[i][1] if i in stored else None for i in range(len(records))]
+                for i, result in zip(fresh, fresh_results):
+                    validation_results[i] = result
+                self._save_stage(stage_key, 'validate', validation_results, stage_runs)
+        
+        if stage_key is not None and self.verbose:
+            print(f"   Stages: parse {input_info['parse']}, prepare {stage_runs['prepare']}, "
+                  f"validate {stage_runs['validate']}")
+        if self.outlier_detector is not None:
+            outliers = self.outlier_detector.detect([
+                (p['category_result']['slug'], p['extraction_report'].metadata)
+                for p in prepared
+            ])
+        
+        # Reports are written on a background thread as records finish;
+        # it also collects the counts and report aggregates
+        report_writer = ReportSinkWriter(
+            self._open_report_sinks(batch_id, timestamp, source_file, input_info)
+        )
+        
+        # In commit mode ready records are committed while later ones are
+        # still being processed
+        commit_pipeline = None
+        if self.mode == 'commit':
+            if self.verbose:
+                print("\n💾 Committing to database while processing...")
+            commit_pipeline = CommitPipeline(self.committer, batch_id, timestamp)
         
+        # Records run through the stage engine: prepare and validate where
+        # not done up front, then dedupe, reports and commit
+        reprocessed_rows = set(input_info['reprocessed']['rows']) if previous is not None else set()
+        stages: List[Stage] = []
+        if prepared is None:
+            stages.append(PrepareStage(self.preparer))
+        if validation_results is None:
+            stages.append(ValidateStage(self))
+        dedupe = DedupeStage(self, source_file, outliers, previous, reprocessed_rows)
+        stages += [dedupe, report_writer]
+        if commit_pipeline is not None:
+            stages.append(commit_pipeline)
+        engine = StageEngine(stages, workers=self.workers)
+        
+        work_items = (
+            {
+                'row_number': i + 1,
+                'record': record,
+                'prepared': prepared[i] if prepared is not None else None,
+                'validation': validation_results[i] if validation_results else None,
+                # Rows kept from the previous run only need validating for outliers
+                'validate': (previous is None or i + 1 in reprocessed_rows or
+                             self.outlier_detector is not None)
+            }
+            for i, record in enumerate(records)
+        )
+        
+        try:
+            for i, processed in enumerate(engine.run(work_items)):
+                if self.verbose and (i + 1) % 100 == 0:
+                    print(f"   Processing record {i + 1}/{len(records)}...")
+                processed_records.append(processed)
+            report_writer.flush()
+        except BaseException:
+            report_writer.abort()
+            if commit_pipeline is not None:
+                commit_pipeline.abort()
+            processed_records.close()
+            raise
+        
+        accumulator = report_writer.accumulator
+        counts = accumulator.status_counts
         batch = IngestionBatchReport(
             batch_id=batch_id,
             timestamp=timestamp,
             mode=self.mode,
             source_file=source_file,
             total_records=len(records),
-            ready_count=ready_count,
-            needs_review_count=needs_review_count,
-            invalid_count=invalid_count,
-            duplicate_count=duplicate_count,
+            ready_count=counts['ready'],
+            needs_review_count=counts['needs_review'],
+            invalid_count=counts['invalid'],
+            duplicate_count=counts['duplicate'],
             records=processed_records
         )
         
-        # Generate reports
-        self._generate_reports(batch)
+        batch.summary['spec_statistics'] = accumulator.spec_statistics()
+        
+        cache_stats = self.category_validator.cache.stats()
+        batch.summary['validation_cache'] = cache_stats
+        if self.verbose:
+            print(f"   Validation cache: {cache_stats['hits']} hits, "
+                  f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%} hit rate)")
+        
+        batch.summary['pipeline'] = engine.stats()
+        if self.workers > 0 and self.verbose:
+            for name, stats in batch.summary['pipeline'].items():
+                rate = f"{stats['items_per_sec']:,.0f}/s" if stats['items_per_sec'] else '-'
+                print(f"   Stage {name}: {stats['items']} items on {stats['executor']}, {rate}, "
+                      f"{stats['utilization']:.0%} busy, queue max {stats['queue_max']}")
+        
+        if delta is not None:
+            self._save_delta(batch, delta, prepared, validation_results)
+        
+        if stage_key is not None:
+            batch.summary['stages'] = dict(input_info, **stage_runs)
+        if input_info is not None and 'reprocessed' in input_info:
+            batch.summary['reprocessed'] = input_info['reprocessed']
+        
+        # Only committed records become part of the catalog
+        if self.mode != 'commit':
+            for idx in dedupe.batch_part_ids:
+                self.duplicate_detector.remove(idx)
+        
+        # Commit if in commit mode; the commit summary is one of the reports
+        commit_result = None
+        if commit_pipeline is not None:
+            commit_result = self._record_commit(batch, commit_pipeline.finish())
+        
+        # Finish the reports
+        if self.verbose:
+            print("\n📄 Generating reports...")
+        report_paths = report_writer.close(batch, commit_result=commit_result)
+        if self.verbose:
+            for report_type, path in report_paths:
+                print(f"   ✓ {report_type}: {path}")
         
         # Print console summary
         if self.verbose:
             self.console_reporter.print_summary(batch)
             if batch.needs_review_count > 0 or batch.invalid_count > 0:
-                self.console_reporter.print_validation_issues(batch)
-        
-        # Commit if in commit mode
-        if self.mode == 'commit':
-            self._commit_records(batch)
+                self.console_reporter.print_validation_issues(batch, accumulator=accumulator)
         
         return batch
     
-    def _process_single_record(self, record: Dict[str, Any], 
-                                row_number: int,
-                                source_file: str) -> PartIngestionRecord:
-        """Process a single record through the pipeline."""
-        # Get input fields (support various column name formats)
-        name = self._get_field(record, ['name', 'part_name', 'title', 'product_name', 'Name', 'Title'])
-        brand = self._get_field(record, ['brand', 'manufacturer', 'Brand', 'Manufacturer', 'mfg'])
-        description = self._get_field(record, ['description', 'desc', 'Description', 'product_description'])
-        category = self._get_field(record, ['category', 'cat', 'Category', 'product_category', 'type'])
-        sku = self._get_field(record, ['sku', 'SKU', 'part_number', 'part_no', 'item_number'])
-        price = self._get_field(record, ['price', 'Price', 'cost', 'msrp'])
-        
-        # Stage 1: Normalize
-        normalized_name = self.name_normalizer.normalize(name)
-        normalized_brand = self.brand_normalizer.normalize(brand)
-        
-        # Stage 2: Suggest category if not provided
-        if not category:
-            suggested_cat, confidence = self.category_normalizer.suggest_category(name, description)
-            category_result = {
-                'slug': suggested_cat,
-                'confidence': confidence,
-                'suggested': True
-            }
-        else:
-            category_result = {
-                'slug': category.lower().replace(' ', '-'),
-                'confidence': 1.0 if self.category_normalizer.validate_category(category) else 0.5,
-                'suggested': False
-            }
+    def _prepare_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the normalize, category and extract stages for a record."""
+        return self.preparer.prepare(record)
+    
+    def _finalize_record(self, record: Dict[str, Any],
+                         prepared: Dict[str, Any],
+                         row_number: int,
+                         source_file: str,
+                         validation_result: Optional[Dict[str, Any]] = None,
+                         outlier_issues: Optional[List[ValidationIssue]] = None) -> PartIngestionRecord:
+        """
+        Run the validate and dedupe stages and build the ingestion record.
         
-        # Stage 3: Extract specifications
-        extraction_report = self.spec_extractor.extract_all(
-            name=name,
-            description=description,
-            existing_data=self._extract_existing_specs(record)
-        )
+        Args:
+            validation_result: Precomputed validation dict (batch validation).
+                Validated here when None.
+            outlier_issues: Batch-level outlier warnings for this record
+        """
+        name = prepared['name']
+        sku = prepared['sku']
+        normalized_brand = prepared['normalized_brand']
+        category_result = prepared['category_result']
+        extraction_report = prepared['extraction_report']
         
         # Stage 4: Validate
-        validation_result = {'is_valid': True, 'issues': [], 'needs_review': False}
-        if category_result['slug']:
-            val_result = self.category_validator.validate(
-                category_result['slug'],
-                extraction_report.metadata
-            )
-            validation_result = val_result.to_dict()
+        if validation_result is None:
+            validation_result = self._validate_prepared(prepared)
+        
+        validation_result = self._with_outliers(validation_result, outlier_issues)
         
         # Stage 5: Check for duplicates
-        duplicates = self.duplicate_detector.find_duplicates(name, brand, sku)
-        is_duplicate = len(duplicates) > 0 and duplicates[0].get('similarity', 0) > 0.95
+        duplicates = self.duplicate_detector.find_duplicates(
+            name, normalized_brand.get('slug', ''), sku
+        )
+        is_duplicate = self.duplicate_detector.is_duplicate(duplicates)
         
         # Determine status
         review_reasons = []
@@ -311,7 +759,10 @@ class DataIngestionAgent:
             status = 'invalid'
         elif is_duplicate:
             status = 'duplicate'
-            review_reasons.append('duplicate_detected')
+            if duplicates[0]['part'].get('in_batch'):
+                review_reasons.append('duplicate_in_batch')
+            else:
+                review_reasons.append('duplicate_detected')
         elif (normalized_brand.get('needs_review') or 
               extraction_report.needs_review or
               validation_result.get('needs_review') or
@@ -324,18 +775,20 @@ class DataIngestionAgent:
                 review_reasons.extend(extraction_report.review_reasons)
             if category_result.get('confidence', 0) < 0.7:
                 review_reasons.append('low_category_confidence')
+            if outlier_issues:
+                review_reasons.append('spec_outlier')
         else:
             status = 'ready'
         
         return PartIngestionRecord(
             original_data=record,
             normalized_data={
-                'name': normalized_name,
+                'name': prepared['normalized_name'],
                 'brand': normalized_brand,
                 'category': category_result,
                 'sku': sku,
-                'description': description,
-                'price': price
+                'description': prepared['description'],
+                'price': prepared['price']
             },
             extracted_specs=extraction_report.to_dict(),
             validation_result=validation_result,
@@ -345,7 +798,249 @@ class DataIngestionAgent:
             source_file=source_file
         )
     
-    def _get_field(self, record: Dict[str, Any], field_names: List[str]) -> str:
+    @staticmethod
+    def _with_outliers(validation_result: Dict[str, Any],
+                       outlier_issues: Optional[List[ValidationIssue]]) -> Dict[str, Any]:
+        """Add outlier warnings on top of the category checks."""
+        if not outlier_issues:
+            return validation_result
+        validation_result = dict(validation_result)
+        validation_result['issues'] = (
+            list(validation_result.get('issues', [])) +
+            ValidationResult(is_valid=True, issues=outlier_issues).to_dict()['issues']
+        )
+        validation_result['warning_count'] = (
+            validation_result.get('warning_count', 0) + len(outlier_issues)
+        )
+        validation_result['needs_review'] = True
+        return validation_result
+    
+    def _validate_prepared(self, prepared: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate one prepared record against its category."""
+        category_slug = prepared['category_result']['slug']
+        if not category_slug:
+            return {'is_valid': True, 'issues': [], 'needs_review': False}
+        return self.category_validator.validate(
+            category_slug, prepared['extraction_report'].metadata
+        ).to_dict()
+    
+    def _remember_batch_part(self, processed: PartIngestionRecord) -> int:
+        """Add an accepted record to the duplicate detector's indexes."""
+        return self.duplicate_detector.add(self._batch_part(processed))
+    
+    @staticmethod
+    def _batch_part(processed: PartIngestionRecord) -> Dict[str, Any]:
+        """Duplicate detector entry for an accepted record."""
+        normalized = processed.normalized_data
+        return {
+            'name': normalized['name'].get('original', ''),
+            'brand_slug': normalized['brand'].get('slug', ''),
+            'sku': normalized.get('sku', ''),
+            'row_number': processed.row_number,
+            'source_file': processed.source_file,
+            'in_batch': True
+        }
+    
+    def _still_current(self, previous: PartIngestionRecord, prepared: Dict[str, Any],
+                       validation_result: Optional[Dict[str, Any]],
+                       outlier_issues: Optional[List[ValidationIssue]],
+                       changed_parts: DuplicateDetector) -> bool:
+        """
+        Whether an unchanged row of a reprocessed batch keeps its result.
+        
+        Its validation can only change through batch-wide outliers, and
+        its duplicate status only if it matches a record whose acceptance
+        changed (changed_parts holds their old and new entries).
+        """
+        if self.outlier_detector is not None:
+            if validation_result is None:
+                validation_result = self._validate_prepared(prepared)
+            expected = self._with_outliers(validation_result, outlier_issues)
+            if json.loads(json.dumps(expected, default=str)) != previous.validation_result:
+                return False
+        return not changed_parts.find_duplicates(
+            prepared['name'], prepared['normalized_brand'].get('slug', ''), prepared['sku']
+        )
+    
+    def _validate_prepared_batch(self, prepared: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Validate all prepared records at once, column by column per category."""
+        items = []
+        positions = []
+        for i, p in enumerate(prepared):
+            if p['category_result']['slug']:
+                positions.append(i)
+                items.append((p['category_result']['slug'], p['extraction_report'].metadata))
+        
+        issues = self.category_validator.validate_batch(items)
+        
+        validation_results = [
+            {'is_valid': True, 'issues': [], 'needs_review': False}
+            for _ in prepared
+        ]
+        for k, i in enumerate(positions):
+            result = issues.get(k)
+            if result is None:
+                result = ValidationResult(is_valid=True, validated_metadata=items[k][1].copy())
+            validation_results[i] = result.to_dict()
+        
+        return validation_results
+    
+    def _row_keys(self, records: List[Dict[str, Any]]) -> List[str]:
+        """
+        Identity of each row within its feed: brand plus normalized SKU, or
+        brand plus name for rows without a SKU. Repeats get a #n suffix.
+        """
+        keys = []
+        seen: Counter = Counter()
+        for record in records:
+            brand = self._get_field(record, self.BRAND_FIELDS).lower()
+            sku = re.sub(r'[^a-z0-9]', '', self._get_field(record, self.SKU_FIELDS).lower())
+            if sku:
+                key = f"{brand}:sku:{sku}"
+            else:
+                key = f"{brand}:name:{self._get_field(record, self.NAME_FIELDS).lower()}"
+            seen[key] += 1
+            keys.append(key if seen[key] == 1 else f"{key}#{seen[key]}")
+        return keys
+    
+    def _load_delta(self, records: List[Dict[str, Any]], source_file: str) -> Dict[str, Any]:
+        """Match rows against the feed's last run and load reusable stage results."""
+        validate_fingerprint = self._stage_fingerprints()['validate']
+        config_changed = self.delta_store.fingerprint(source_file) not in (None, validate_fingerprint)
+        previous = self.delta_store.row_hashes(source_file)
+        keys = self._row_keys(records)
+        hashes = [row_hash(record) for record in records]
+        
+        unchanged = [i for i, key in enumerate(keys) if previous.get(key, (None,))[0] == hashes[i]]
+        stored = {}
+        if not config_changed:
+            states = self.delta_store.stages(source_file, [keys[i] for i in unchanged])
+            stored = {
+                i: (self._load_prepared(states[keys[i]]['prepared']), states[keys[i]]['validation'])
+                for i in unchanged
+            }
+        
+        current = set(keys)
+        delta = {
+            'source': source_file,
+            'fingerprint': validate_fingerprint,
+            'keys': keys,
+            'hashes': hashes,
+            'stored': stored,
+            'config_changed': config_changed,
+            'new': sum(1 for key in keys if key not in previous),
+            'changed': sum(1 for key in keys if key in previous) - len(unchanged),
+            'unchanged': len(unchanged),
+            'removed': [
+                {'key': key, 'name': name}
+                for key, (_, name) in previous.items() if key not in current
+            ]
+        }
+        
+        if self.verbose:
+            print(f"   Delta: {delta['new']} new, {delta['changed']} changed, "
+                  f"{delta['unchanged']} unchanged, {len(delta['removed'])} removed")
+            if config_changed:
+                print("   Config changed since the last run; reprocessing every row")
+        
+        return delta
+    
+    def _save_delta(self, batch: IngestionBatchReport, delta: Dict[str, Any],
+                    prepared: List[Dict[str, Any]], validation_results: List[Dict[str, Any]]):
+        """Store the feed's new row state and attach the delta summary."""
+        stored = delta['stored']
+        keys = delta['keys']
+        self.delta_store.update(
+            delta['source'], delta['fingerprint'], batch.batch_id,
+            (
+                (keys[i], delta['hashes'][i], prepared[i]['normalized_name'].get('normalized'),
+                 {'prepared': self._dump_prepared(prepared[i]), 'validation': validation_results[i]})
+                for i in range(len(keys)) if i not in stored
+            ),
+            removed=[row['key'] for row in delta['removed']]
+        )
+        
+        batch.summary['delta'] = {
+            'source': delta['source'],
+            'config_fingerprint': delta['fingerprint'],
+            'config_changed': delta['config_changed'],
+            'new': delta['new'],
+            'changed': delta['changed'],
+            'unchanged': delta['unchanged'],
+            'reused': len(stored),
+            'removed': len(delta['removed']),
+            'removed_rows': delta['removed']
+        }
+        
+        if self.verbose and delta['removed']:
+            print(f"   Removed since the last run ({len(delta['removed'])}):")
+            for row in delta['removed'][:10]:
+                print(f"     - {row['name'] or row['key']}")
+            if len(delta['removed']) > 10:
+                print(f"     ... and {len(delta['removed']) - 10} more")
+    
+    def _stage_fingerprints(self) -> Dict[str, str]:
+        """Config fingerprints of the prepare and validate stages (see stage_store.py)."""
+        prepare = fingerprint(
+            config_fingerprint(['brand-aliases.json', 'extraction-patterns.json']),
+            sorted(self.category_normalizer.categories)
+        )
+        return {
+            'prepare': prepare,
+            'validate': fingerprint(prepare, self.category_validator.specs_fingerprint)
+        }
+    
+    def _load_stage(self, stage_key: Optional[str], stage: str,
+                    stage_runs: Dict[str, str]) -> Optional[List[Dict[str, Any]]]:
+        """Materialized output of a stage, or None when it has to be computed."""
+        if stage_key is None:
+            return None
+        rows = self.stage_store.load(stage_key, stage, self._stage_fingerprints()[stage])
+        if rows is not None:
+            stage_runs[stage] = 'reused'
+            if stage == 'prepare':
+                rows = [self._load_prepared(row) for row in rows]
+        return rows
+    
+    def _save_stage(self, stage_key: Optional[str], stage: str, rows: List[Dict[str, Any]],
+                    stage_runs: Dict[str, str]):
+        if stage_key is None:
+            return
+        stage_runs[stage] = 'computed'
+        if stage == 'prepare':
+            rows = [self._dump_prepared(row) for row in rows]
+        self.stage_store.save(stage_key, stage, self._stage_fingerprints()[stage], rows)
+    
+    @staticmethod
+    def _dump_prepared(prepared: Dict[str, Any]) -> Dict[str, Any]:
+        """Serializable form of a row's normalize, category and extract results."""
+        state = dict(prepared)
+        state['extraction_report'] = prepared['extraction_report'].to_dict()
+        return state
+    
+    @staticmethod
+    def _load_prepared(state: Dict[str, Any]) -> Dict[str, Any]:
+        prepared = dict(state)
+        prepared['extraction_report'] = ExtractionReport.from_dict(state['extraction_report'])
+        return prepared
+    
+    def _prepared_from_record(self, record: PartIngestionRecord) -> Dict[str, Any]:
+        """Normalize, category and extract results of an already processed record."""
+        normalized = record.normalized_data
+        return {
+            'name': self._get_field(record.original_data, self.NAME_FIELDS),
+            'brand': self._get_field(record.original_data, self.BRAND_FIELDS),
+            'description': normalized['description'],
+            'sku': normalized['sku'],
+            'price': normalized['price'],
+            'normalized_name': normalized['name'],
+            'normalized_brand': normalized['brand'],
+            'category_result': normalized['category'],
+            'extraction_report': ExtractionReport.from_dict(record.extracted_specs)
+        }
+    
+    @staticmethod
+    def _get_field(record: Dict[str, Any], field_names: List[str]) -> str:
         """Get a field value trying multiple possible column names."""
         for name in field_names:
             if name in record and record[name]:
@@ -355,7 +1050,8 @@ class DataIngestionAgent:
                 return str(value)
         return ''
     
-    def _extract_existing_specs(self, record: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _extract_existing_specs(record: Dict[str, Any]) -> Dict[str, Any]:
         """Extract any pre-existing specs from the record."""
         specs = {}
         
@@ -391,55 +1087,291 @@ class DataIngestionAgent:
         
         return specs
     
-    def _generate_reports(self, batch: IngestionBatchReport):
-        """Generate all applicable reports."""
-        if self.verbose:
-            print("\n📄 Generating reports...")
+    def _open_report_sinks(self, batch_id: str, timestamp: str, source_file: str,
+                           input_info: Optional[Dict[str, Any]] = None) -> List[ReportSink]:
+        """Create the selected report sinks that apply to the current mode."""
+        sinks: List[ReportSink] = []
+        selected = set(self.report_sinks)
         
-        reports = []
+        if 'json' in selected:
+            sinks.append(JsonReportSink(
+                self.report_generator, batch_id, timestamp, self.mode, source_file,
+                fmt=self.report_format, compress=self.compress_reports
+            ))
         
-        # Always generate JSON report
-        json_path = self.report_generator.generate_json_report(batch)
-        reports.append(('JSON Report', json_path))
+        if 'dry-run' in selected and self.mode == 'dry-run':
+            sinks.append(DryRunReportSink(self.report_generator, review_csv='review' in selected))
         
-        if self.mode == 'dry-run':
-            dry_run_path = self.report_generator.generate_dry_run_report(batch)
-            reports.append(('Dry Run Report', dry_run_path))
+        if 'review' in selected:
+            sinks.append(NeedsReviewCsvSink(self.report_generator, batch_id))
         
-        if batch.needs_review_count > 0 or batch.invalid_count > 0:
-            review_path = self.report_generator.generate_needs_review_report(batch)
-            reports.append(('Needs Review CSV', review_path))
+        if 'analysis' in selected:
+            sinks.append(ExtractionAnalysisSink(self.report_generator))
         
-        # Extraction analysis
-        analysis_path = self.report_generator.generate_extraction_analysis(batch)
-        reports.append(('Extraction Analysis', analysis_path))
+        if 'commit' in selected and self.mode == 'commit':
+            sinks.append(CommitSummarySink(self.report_generator))
         
-        if self.verbose:
-            for report_type, path in reports:
-                print(f"   ✓ {report_type}: {path}")
+        # Only file input can be verified again before a later commit; a
+        # reprocessed batch was saved before, so it is always saved again
+        if (self.mode == 'dry-run' and input_info is not None and source_file != 'stdin' and
+                ('batch' in selected or 'reprocessed' in input_info)):
+            sinks.append(SavedBatchSink(
+                self.report_generator, batch_id, timestamp, self.mode, source_file,
+                {
+                    'input_hash': input_info['input_hash'],
+                    'file_format': input_info['file_format'],
+                    'config_fingerprint': self._stage_fingerprints()['validate']
+                }
+            ))
+        
+        if 'db' in selected and self.report_db is not None:
+            sinks.append(ReportStoreSink(
+                self.report_db, batch_id, timestamp, self.mode, source_file,
+                retention_days=self.report_retention_days
+            ))
+        
+        return sinks
     
-    def _commit_records(self, batch: IngestionBatchReport):
-        """Commit records to database (placeholder for actual DB integration)."""
+    def _commit_records(self, batch: IngestionBatchReport) -> CommitResult:
+        """Commit the ready records of an already processed batch."""
         if self.verbose:
             print("\n💾 Committing to database...")
         
-        committed_ids = []
-        
-        for record in batch.records:
-            if record.status == 'ready':
-                # In production, this would insert into the database
-                # For now, we'll just generate a fake ID
-                import uuid
-                part_id = str(uuid.uuid4())
-                committed_ids.append(part_id)
+        result = self.committer.commit(
+            (record for record in batch.records if record.status == 'ready'),
+            batch.batch_id, batch.timestamp
+        )
+        return self._record_commit(batch, result)
+    
+    def _record_commit(self, batch: IngestionBatchReport, result: CommitResult) -> CommitResult:
+        """Attach commit statistics to the batch and report them."""
+        batch.summary['commit'] = result.to_dict()
         
         if self.verbose:
-            print(f"   ✓ Committed {len(committed_ids)} records")
+            print(f"   ✓ Committed {len(result.committed_ids)} records: {result.inserted} inserted, "
+                  f"{result.updated} updated, {result.unchanged} unchanged "
+                  f"({result.write_seconds:.2f}s writing, {result.rows_per_sec:,.0f} rows/sec)")
+            pool = result.pool
+            if pool.get('connections', 1) > 1 or result.retries:
+                print(f"   Pool: {pool['connections']} connections, "
+                      f"{pool['utilization']:.0%} utilized, "
+                      f"{pool['wait_ms_avg']:.1f} ms avg wait, {result.retries} retries")
+            if result.failed_rows:
+                print(f"   ✗ Rolled back {len(result.failed_chunks)} chunk(s) "
+                      f"({len(result.failed_rows)} records)")
         
-        # Generate commit summary
-        commit_path = self.report_generator.generate_commit_summary(batch, committed_ids)
-        if self.verbose:
-            print(f"   ✓ Commit Summary: {commit_path}")
+        return result
+    
+    def close(self):
+        """Release the commit backend, catalog snapshot and local stores."""
+        self.committer.close()
+        if self.catalog is not None:
+            self.catalog.close()
+        if self.delta_store is not None:
+            self.delta_store.close()
+        if self.stage_store is not None:
+            self.stage_store.close()
+
+
+class RecordPreparer:
+    """
+    The normalize, category and extract stages, split from DataIngestionAgent
+    so they can be pickled to worker processes with the agent's own
+    normalizers and extractor.
+    """
+    
+    def __init__(self, name_normalizer: NameNormalizer,
+                 brand_normalizer: BrandNormalizer,
+                 category_normalizer: CategoryNormalizer,
+                 spec_extractor: SpecExtractor):
+        self.name_normalizer = name_normalizer
+        self.brand_normalizer = brand_normalizer
+        self.category_normalizer = category_normalizer
+        self.spec_extractor = spec_extractor
+    
+    def prepare(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the normalize, category and extract stages for a record."""
+        agent = DataIngestionAgent
+        
+        # Get input fields (support various column name formats)
+        name = agent._get_field(record, agent.NAME_FIELDS)
+        brand = agent._get_field(record, agent.BRAND_FIELDS)
+        description = agent._get_field(record, ['description', 'desc', 'Description', 'product_description'])
+        category = agent._get_field(record, ['category', 'cat', 'Category', 'product_category', 'type'])
+        sku = agent._get_field(record, agent.SKU_FIELDS)
+        price = agent._get_field(record, ['price', 'Price', 'cost', 'msrp'])
+        
+        # Stage 1: Normalize
+        normalized_name = self.name_normalizer.normalize(name)
+        normalized_brand = self.brand_normalizer.normalize(brand)
+        
+        # Stage 2: Suggest category if not provided
+        if not category:
+            suggested_cat, confidence = self.category_normalizer.suggest_category(name, description)
+            category_result = {
+                'slug': suggested_cat,
+                'confidence': confidence,
+                'suggested': True
+            }
+        else:
+            category_result = {
+                'slug': category.lower().replace(' ', '-'),
+                'confidence': 1.0 if self.category_normalizer.validate_category(category) else 0.5,
+                'suggested': False
+            }
+        
+        # Stage 3: Extract specifications
+        extraction_report = self.spec_extractor.extract_all(
+            name=name,
+            description=description,
+            existing_data=agent._extract_existing_specs(record)
+        )
+        
+        return {
+            'name': name,
+            'brand': brand,
+            'description': description,
+            'sku': sku,
+            'price': price,
+            'normalized_name': normalized_name,
+            'normalized_brand': normalized_brand,
+            'category_result': category_result,
+            'extraction_report': extraction_report
+        }
+
+
+class PrepareStage(Stage):
+    """Normalize, category and extract; stateless, so it can run in worker processes."""
+    
+    name = 'prepare'
+    kind = CPU_BOUND
+    
+    def __init__(self, preparer: RecordPreparer):
+        self.preparer = preparer
+    
+    def process(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        item['prepared'] = self.preparer.prepare(item['record'])
+        return item
+
+
+class AgentStage(Stage):
+    """
+    Pipeline stage that runs part of DataIngestionAgent on a work item
+    ({'row_number', 'record', 'prepared', 'validation', 'validate'}).
+    """
+    
+    kind = CPU_BOUND
+    
+    def __init__(self, agent: DataIngestionAgent):
+        self.agent = agent
+
+
+class ValidateStage(AgentStage):
+    """Validate against category-specs, through the batch's validation cache."""
+    
+    name = 'validate'
+    stateful = True
+    
+    def process(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        if item['validation'] is None and item['validate']:
+            item['validation'] = self.agent._validate_prepared(item['prepared'])
+        return item
+
+
+class DedupeStage(AgentStage):
+    """
+    Check for duplicates against the catalog and the records accepted so
+    far, and build the ingestion record.
+    
+    When a batch is reprocessed, rows that weren't selected keep their
+    previous record while nothing they depend on changed.
+    """
+    
+    name = 'dedupe'
+    stateful = True
+    
+    def __init__(self, agent: DataIngestionAgent, source_file: str,
+                 outliers: Dict[int, List[ValidationIssue]],
+                 previous: Optional[Sequence[PartIngestionRecord]] = None,
+                 reprocessed_rows: Iterable[int] = ()):
+        super().__init__(agent)
+        self.source_file = source_file
+        self.outliers = outliers
+        self.previous = previous
+        self.reprocessed_rows = set(reprocessed_rows)
+        self.batch_part_ids: List[int] = []
+        # Old and new entries of rows whose acceptance changed
+        self.changed_parts = DuplicateDetector([], use_lsh=False) if previous is not None else None
+    
+    def process(self, item: Dict[str, Any]) -> PartIngestionRecord:
+        agent = self.agent
+        row_number = item['row_number']
+        i = row_number - 1
+        previous = self.previous[i] if self.previous is not None else None
+        
+        reused = None
+        if previous is not None and row_number not in self.reprocessed_rows:
+            if agent._still_current(previous, item['prepared'], item['validation'],
+                                    self.outliers.get(i), self.changed_parts):
+                reused = previous
+        
+        if reused is not None:
+            processed = reused
+        else:
+            processed = agent._finalize_record(
+                item['record'], item['prepared'], row_number=row_number,
+                source_file=self.source_file, validation_result=item['validation'],
+                outlier_issues=self.outliers.get(i)
+            )
+        
+        if previous is not None and reused is None:
+            old_part = agent._batch_part(previous) if previous.status == 'ready' else None
+            new_part = agent._batch_part(processed) if processed.status == 'ready' else None
+            if old_part != new_part:
+                for part in (old_part, new_part):
+                    if part is not None:
+                        self.changed_parts.add(part)
+        
+        if processed.status == 'ready':
+            # Later rows are checked against records accepted so far
+            self.batch_part_ids.append(agent._remember_batch_part(processed))
+        return processed
+
+
+def _sink_list(value: str) -> List[str]:
+    try:
+        return parse_sink_names(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _row_selection(value: str) -> Tuple[List[int], List[str]]:
+    """Parse --rows: row numbers and/or record statuses."""
+    rows = []
+    statuses = []
+    for item in value.split(','):
+        item = item.strip()
+        if item.isdigit():
+            rows.append(int(item))
+        elif item in DataIngestionAgent.STATUSES:
+            statuses.append(item)
+        elif item:
+            raise argparse.ArgumentTypeError(
+                f"'{item}' is neither a row number nor a status "
+                f"({', '.join(DataIngestionAgent.STATUSES)})"
+            )
+    if not rows and not statuses:
+        raise argparse.ArgumentTypeError('no rows given')
+    return rows, statuses
+
+
+def _byte_size(value: str) -> int:
+    """Parse a size like 512M, 2G or 65536 (bytes)."""
+    units = {'': 1, 'K': 2**10, 'M': 2**20, 'G': 2**30}
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*', value.upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a size (e.g. 512M, 2G)")
+    return int(float(match.group(1)) * units[match.group(2)])
 
 
 def main():
@@ -460,6 +1392,21 @@ Examples:
   
   # Report only (no commit, just analysis)
   python ingest.py --file parts.csv --mode report-only
+  
+  # Save a dry-run, then commit it once reviewed without reprocessing the file
+  python ingest.py --file parts.csv --save-batch
+  python ingest.py --commit-batch 20260116-103741-8c1f4074
+  
+  # Materialize stage outputs, then re-check after editing category-specs.json
+  python ingest.py --file parts.csv --materialize
+  python ingest.py --revalidate 20260116-103741-8c1f4074
+  
+  # Re-run only fixed rows of a dry-run, or all rows that needed review
+  python ingest.py --reprocess 20260116-103741-8c1f4074 --rows 17,204,9981
+  python ingest.py --reprocess 20260116-103741-8c1f4074 --rows needs_review
+  
+  # Keep at most 512 MB of the processed-record store in memory, spill the rest
+  python ingest.py --file huge-feed.csv --memory-budget 512M
         """
     )
     
@@ -469,6 +1416,14 @@ Examples:
                              help='Input file path (CSV, JSON, JSONL, TSV)')
     input_group.add_argument('--stdin', action='store_true',
                              help='Read from stdin (for copy/paste data)')
+    input_group.add_argument('--commit-batch', metavar='BATCH_ID',
+                             help='Commit a batch saved by an earlier dry-run without reprocessing it')
+    input_group.add_argument('--revalidate', metavar='BATCH_ID',
+                             help='Re-run a materialized batch, recomputing only stages whose '
+                                  'config changed (see stage_store.py)')
+    input_group.add_argument('--reprocess', metavar='BATCH_ID',
+                             help='Reprocess the --rows of a saved dry-run batch and patch '
+                                  'its reports in place (see row_index.py)')
     
     # Options
     parser.add_argument('--format', choices=['csv', 'json', 'jsonl', 'tsv'],
@@ -481,23 +1436,131 @@ Examples:
                         help='Suppress console output')
     parser.add_argument('--output-dir', '-o', type=Path,
                         help='Output directory for reports')
+    parser.add_argument('--batch-validate', action='store_true',
+                        help='Validate the whole batch column by column (faster for large feeds)')
+    parser.add_argument('--catalog', type=Path,
+                        help='Catalog snapshot for duplicate detection (see catalog.py)')
+    parser.add_argument('--report-format', choices=['json', 'jsonl'], default='json',
+                        help='JSON report layout (default: json)')
+    parser.add_argument('--gzip', action='store_true',
+                        help='gzip-compress the JSON report')
+    parser.add_argument('--reports', type=_sink_list, default=None, metavar='SINKS',
+                        help='Comma-separated reports to write: '
+                             f"{','.join(SINK_NAMES)}, all or none "
+                             f"(default: {','.join(DEFAULT_SINK_NAMES)})")
+    parser.add_argument('--save-batch', action='store_true',
+                        help="Also save a dry-run for --commit-batch and --reprocess "
+                             "(adds the 'batch' report)")
+    parser.add_argument('--commit-db', type=Path,
+                        help='Commit into a local SQLite database (see commit_backends.py)')
+    parser.add_argument('--commit-batch-size', type=int, default=500,
+                        help='Records per commit transaction (default: 500)')
+    parser.add_argument('--commit-sync', choices=['off', 'normal', 'full'], default='normal',
+                        help='SQLite commit durability (default: normal)')
+    parser.add_argument('--commit-journal', choices=['wal', 'delete', 'truncate', 'memory'],
+                        default='wal', help='SQLite commit journal mode (default: wal)')
+    parser.add_argument('--commit-connections', type=int, default=1,
+                        help='Commit connections writing chunks concurrently (default: 1)')
+    parser.add_argument('--commit-retries', type=int, default=3,
+                        help='Retries per commit chunk after a transient error (default: 3)')
+    parser.add_argument('--commit-fake-latency', type=float, metavar='MS',
+                        help='Commit to an in-process fake database with this round-trip '
+                             'latency, for tuning pool settings')
+    parser.add_argument('--delta', action='store_true',
+                        help='Only fully process rows that are new or changed since the '
+                             'last run of the same feed (see delta_store.py)')
+    parser.add_argument('--delta-db', type=Path,
+                        help='Delta state database (default: delta-state.sqlite in the output directory)')
+    parser.add_argument('--materialize', action='store_true',
+                        help='Materialize stage outputs so re-runs only recompute stale stages')
+    parser.add_argument('--stage-db', type=Path,
+                        help='Stage store database (default: stages.sqlite in the output directory)')
+    parser.add_argument('--rows', type=_row_selection, metavar='ROWS',
+                        help='Rows to reprocess: comma-separated row numbers and/or statuses '
+                             f"({', '.join(DataIngestionAgent.STATUSES)})")
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Worker processes for normalizing and extracting records '
+                             '(default: 0, serial)')
+    parser.add_argument('--memory-budget', type=_byte_size, metavar='SIZE',
+                        help='Memory for the processed-record store only (e.g. 512M); older '
+                             'records spill to disk in the output directory. The parsed '
+                             'input is not counted (default: no limit)')
+    parser.add_argument('--outliers', action='store_true',
+                        help='Flag numeric specs that are outliers within their category')
+    parser.add_argument('--report-db', type=Path,
+                        help='Also write batches to an indexed SQLite report store (see report_store.py)')
+    parser.add_argument('--report-retention-days', type=float,
+                        help='Prune report store batches older than this many days')
     
     args = parser.parse_args()
+    if args.reprocess and args.rows is None:
+        parser.error('--reprocess needs --rows')
+    if args.save_batch:
+        reports = list(DEFAULT_SINK_NAMES) if args.reports is None else args.reports
+        args.reports = reports + ['batch'] if 'batch' not in reports else reports
+    
+    # Commit target: a pool of connections to the SQLite or fake database
+    commit_backend = None
+    if args.commit_fake_latency is not None:
+        fake_store: Dict[str, str] = {}
+        commit_backend = ConnectionPool(
+            lambda: FakeLatencyBackend(fake_store, latency=args.commit_fake_latency / 1000),
+            args.commit_connections
+        )
+    elif args.commit_db:
+        commit_backend = ConnectionPool(
+            lambda: SQLiteCommitBackend(args.commit_db, synchronous=args.commit_sync,
+                                        journal_mode=args.commit_journal),
+            args.commit_connections
+        )
     
     # Initialize agent
-    agent = DataIngestionAgent(
-        mode=args.mode,
-        verbose=not args.quiet
-    )
+    try:
+        agent = DataIngestionAgent(
+            mode=args.mode,
+            verbose=not args.quiet,
+            batch_validate=args.batch_validate,
+            catalog_path=args.catalog,
+            report_format=args.report_format,
+            compress_reports=args.gzip,
+            report_sinks=args.reports,
+            report_db=args.report_db,
+            report_retention_days=args.report_retention_days,
+            detect_outliers=args.outliers,
+            commit_backend=commit_backend,
+            commit_batch_size=args.commit_batch_size,
+            commit_retries=args.commit_retries,
+            delta_db=(
+                args.delta_db or (args.output_dir or Path(__file__).parent / 'output') / 'delta-state.sqlite'
+                if args.delta else None
+            ),
+            workers=args.workers,
+            memory_budget=args.memory_budget,
+            stage_db=(
+                args.stage_db or (args.output_dir or Path(__file__).parent / 'output') / 'stages.sqlite'
+                if args.materialize or args.revalidate else None
+            )
+        )
+    except ValueError as e:
+        print(f"\n❌ Error: {e}", file=sys.stderr)
+        sys.exit(3)
     
     if args.output_dir:
         agent.report_generator.output_dir = args.output_dir
         args.output_dir.mkdir(parents=True, exist_ok=True)
     
     # Run ingestion
+    batch = None
     try:
         if args.stdin:
             batch = agent.ingest_stdin(file_format=args.format or 'tsv')
+        elif args.revalidate:
+            batch = agent.revalidate(args.revalidate)
+        elif args.commit_batch:
+            batch = agent.commit_saved_batch(args.commit_batch)
+        elif args.reprocess:
+            rows, statuses = args.rows
+            batch = agent.reprocess_rows(args.reprocess, rows, statuses)
         else:
             batch = agent.ingest_file(args.file, file_format=args.format)
         
@@ -515,6 +1578,10 @@ Examples:
             import traceback
             traceback.print_exc()
         sys.exit(3)
+    finally:
+        if batch is not None:
+            batch.close()
+        agent.close()
 
 
 if __name__ == '__main__':
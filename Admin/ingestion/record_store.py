@@ -0,0 +1,355 @@
+"""
+Compact Record Store for Go-Kart Part Data Ingestion
+
+Holds the processed records of a batch in far less memory than a list of
+PartIngestionRecord objects with their nested dicts:
+
+- Low-cardinality values are dictionary-encoded into typed array columns:
+  status, review reasons, source file, the original column names, the
+  normalized brand and category, and the validation result (records of
+  one category with the same issues share one entry).
+- Fields that repeat other fields are not stored twice. Normalized name,
+  SKU, description and price point at the original column they came
+  from, and validated metadata that equals the extracted metadata is a
+  flag.
+- Everything else for a record is one marshal blob.
+
+With a memory budget, blobs are kept in memory only up to the budget;
+when the window is full it is appended to a spill file (an anonymous
+temporary file) and records are read back from there with a seek. The
+columns stay in memory, about 40 bytes per record. The budget covers
+this store only: the parsed input rows and other per-batch state held by
+the agent are not counted, so peak memory of a run stays above it.
+
+Records are read back as RecordView objects, PartIngestionRecords whose
+fields are decoded on access. Every access returns fresh objects, so
+views can be modified freely without touching the store. Values come
+back the way they would from a saved batch: JSON types only.
+
+Usage:
+    store = RecordStore(memory_budget=256 * 2**20, spill_dir=Path('output'))
+    for record in processed:
+        store.append(record)
+    for view in store:
+        print(view.status, view.normalized_data['name']['normalized'])
+"""
+
+import json
+import marshal
+import tempfile
+import threading
+from array import array
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterator, Union
+
+from reporters import PartIngestionRecord
+
+
+# Stands in for validated_metadata in the encoded validation result
+_METADATA_SLOT = '<validated_metadata>'
+
+# Marks validated metadata that equals the extracted metadata
+_SAME_METADATA = 1
+
+# Normalized fields stored in their own dictionary-encoded columns
+_CODED_FIELDS = ('brand', 'category')
+
+
+class _Dictionary:
+    """Value <-> code mapping for one dictionary-encoded column."""
+    
+    def __init__(self):
+        self._codes: Dict[Any, int] = {}
+        self.values: List[Any] = []
+    
+    def encode(self, value: Any) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+    
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+# Key order is kept, so decoded dicts read like the stored ones
+_json_key = json.JSONEncoder(separators=(',', ':'), default=str).encode
+
+
+_MARSHAL_SCALARS = (str, int, float, bool, type(None))
+
+
+def _marshallable(value: Any) -> Any:
+    """Copy of value with what marshal can't encode turned into strings."""
+    # Containers keep their type: (position,) tuples are column references
+    if isinstance(value, dict):
+        return {
+            k if isinstance(k, _MARSHAL_SCALARS) else str(k): _marshallable(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return type(value)(_marshallable(v) for v in value)
+    if isinstance(value, _MARSHAL_SCALARS):
+        return value
+    return str(value)
+
+
+def _dumps(value: Any) -> bytes:
+    try:
+        return marshal.dumps(value)
+    except ValueError:
+        # Non-JSON values end up as strings, as in reports
+        return marshal.dumps(_marshallable(value))
+
+
+class RecordStore:
+    """Append-only, compact storage of a batch's processed records."""
+    
+    def __init__(self, memory_budget: Optional[int] = None, spill_dir: Optional[Path] = None):
+        """
+        Args:
+            memory_budget: Bytes of record blobs to keep in memory before
+                spilling to disk; None keeps everything in memory
+            spill_dir: Directory for the spill file (default: the system
+                temporary directory)
+        """
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        
+        self._statuses = _Dictionary()
+        self._reasons = _Dictionary()
+        self._sources = _Dictionary()
+        self._columns = _Dictionary()
+        self._fields = _Dictionary()
+        self._brands = _Dictionary()
+        self._categories = _Dictionary()
+        self._validations = _Dictionary()
+        
+        self._status = array('B')
+        self._reason = array('I')
+        self._source = array('I')
+        self._column = array('I')
+        self._field = array('I')
+        self._brand = array('I')
+        self._category = array('I')
+        self._validation = array('I')
+        self._row_number = array('q')
+        
+        # Blobs of the newest records; older ones are in the spill file,
+        # from _offsets[i] to _offsets[i + 1]
+        self._blobs: List[bytes] = []
+        self._window_bytes = 0
+        self._spilled = 0
+        self._offsets = array('Q', [0])
+        self._spill_file = None
+        self._spill_lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return self._spilled + len(self._blobs)
+    
+    def __iter__(self) -> Iterator['RecordView']:
+        for index in range(len(self)):
+            yield RecordView(self, index)
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union['RecordView', List['RecordView']]:
+        if isinstance(index, slice):
+            return [RecordView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('record index out of range')
+        return RecordView(self, index)
+    
+    def append(self, record: PartIngestionRecord):
+        """Encode a record (or a view of another store) into the columns."""
+        original = record.original_data
+        keys = tuple(original)
+        sources = {}
+        for position, value in enumerate(original.values()):
+            if isinstance(value, str):
+                sources.setdefault(value, position)
+        
+        normalized = record.normalized_data
+        values = []
+        for key, value in normalized.items():
+            if key in _CODED_FIELDS:
+                continue
+            if key == 'name' and isinstance(value, dict):
+                value = {k: self._ref(v, sources) for k, v in value.items()}
+            values.append(self._ref(value, sources))
+        
+        extracted = record.extracted_specs
+        validation = record.validation_result
+        validated = None
+        if 'validated_metadata' in validation:
+            validated = validation['validated_metadata']
+            if validated == extracted.get('metadata'):
+                validated = _SAME_METADATA
+            validation = dict(validation, validated_metadata=_METADATA_SLOT)
+        
+        self._status.append(self._statuses.encode(record.status))
+        self._reason.append(self._reasons.encode(tuple(record.review_reasons)))
+        self._source.append(self._sources.encode(record.source_file))
+        self._column.append(self._columns.encode(keys))
+        self._field.append(self._fields.encode(tuple(normalized)))
+        self._brand.append(self._brands.encode(_json_key(normalized.get('brand'))))
+        self._category.append(self._categories.encode(_json_key(normalized.get('category'))))
+        self._validation.append(self._validations.encode(_json_key(validation)))
+        self._row_number.append(-1 if record.row_number is None else record.row_number)
+        blob = _dumps((tuple(original.values()), tuple(values), extracted, validated))
+        self._blobs.append(blob)
+        self._window_bytes += len(blob)
+        if self.memory_budget is not None and self._window_bytes > self.memory_budget:
+            self._spill()
+    
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+    
+    def _spill(self):
+        """Append the in-memory window to the spill file."""
+        with self._spill_lock:
+            if self._spill_file is None:
+                self._spill_file = tempfile.TemporaryFile(
+                    prefix='records-', suffix='.spill', dir=self.spill_dir
+                )
+            self._spill_file.seek(0, 2)
+            self._spill_file.write(b''.join(self._blobs))
+            self._spill_file.flush()
+            for blob in self._blobs:
+                self._offsets.append(self._offsets[-1] + len(blob))
+            self._spilled += len(self._blobs)
+            self._blobs = []
+            self._window_bytes = 0
+    
+    def _blob(self, index: int) -> bytes:
+        if index >= self._spilled:
+            return self._blobs[index - self._spilled]
+        start, end = self._offsets[index], self._offsets[index + 1]
+        with self._spill_lock:
+            self._spill_file.seek(start)
+            return self._spill_file.read(end - start)
+    
+    def close(self):
+        """Remove the spill file; spilled records can't be read afterwards."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+    
+    @staticmethod
+    def _ref(value: Any, sources: Dict[str, int]) -> Any:
+        # A value copied from an original column is stored as (position,)
+        if isinstance(value, str) and value in sources:
+            return (sources[value],)
+        return value
+    
+    def memory_stats(self) -> Dict[str, Any]:
+        """Bytes held in memory by the columns, blobs and dictionaries (approximate)."""
+        columns = sum(
+            column.itemsize * len(column) for column in (
+                self._status, self._reason, self._source, self._column, self._field, self._brand,
+                self._category, self._validation, self._row_number
+            )
+        )
+        blobs = self._window_bytes + 8 * len(self._blobs)
+        dictionaries = sum(
+            len(value) if isinstance(value, str) else len(repr(value))
+            for dictionary in (
+                self._statuses, self._reasons, self._sources, self._columns, self._fields,
+                self._brands, self._categories, self._validations
+            )
+            for value in dictionary.values
+        )
+        return {
+            'records': len(self),
+            'column_bytes': columns,
+            'blob_bytes': blobs,
+            'dictionary_bytes': dictionaries,
+            'bytes_per_record': round((columns + blobs + dictionaries) / len(self), 1) if len(self) else 0.0,
+            'spilled_records': self._spilled,
+            'spilled_bytes': self._offsets[-1],
+            'distinct': {
+                'status': len(self._statuses),
+                'review_reasons': len(self._reasons),
+                'brand': len(self._brands),
+                'category': len(self._categories),
+                'validation': len(self._validations)
+            }
+        }
+
+
+class RecordView(PartIngestionRecord):
+    """
+    A record in a RecordStore, decoded on access.
+    
+    Behaves like the PartIngestionRecord it was stored from (dataclass
+    fields, equality, asdict) without keeping the decoded dicts around.
+    """
+    
+    def __init__(self, store: RecordStore, index: int):
+        # Fields are properties; the dataclass __init__ is not used
+        object.__setattr__(self, '_store', store)
+        object.__setattr__(self, '_index', index)
+    
+    def _blob(self):
+        return marshal.loads(self._store._blob(self._index))
+    
+    @property
+    def status(self) -> str:
+        return self._store._statuses.values[self._store._status[self._index]]
+    
+    @property
+    def review_reasons(self) -> List[str]:
+        return list(self._store._reasons.values[self._store._reason[self._index]])
+    
+    @property
+    def row_number(self) -> Optional[int]:
+        row_number = self._store._row_number[self._index]
+        return None if row_number < 0 else row_number
+    
+    @property
+    def source_file(self) -> Optional[str]:
+        return self._store._sources.values[self._store._source[self._index]]
+    
+    @property
+    def original_data(self) -> Dict[str, Any]:
+        keys = self._store._columns.values[self._store._column[self._index]]
+        return dict(zip(keys, self._blob()[0]))
+    
+    @property
+    def normalized_data(self) -> Dict[str, Any]:
+        store = self._store
+        index = self._index
+        original, values = self._blob()[:2]
+        
+        def deref(value):
+            return original[value[0]] if isinstance(value, tuple) else value
+        
+        data = {}
+        stored = iter(values)
+        for key in store._fields.values[store._field[index]]:
+            if key == 'brand':
+                data[key] = json.loads(store._brands.values[store._brand[index]])
+            elif key == 'category':
+                data[key] = json.loads(store._categories.values[store._category[index]])
+            else:
+                value = next(stored)
+                if key == 'name' and isinstance(value, dict):
+                    value = {k: deref(v) for k, v in value.items()}
+                data[key] = deref(value)
+        return data
+    
+    @property
+    def extracted_specs(self) -> Dict[str, Any]:
+        return self._blob()[2]
+    
+    @property
+    def validation_result(self) -> Dict[str, Any]:
+        store = self._store
+        _, _, extracted, validated = self._blob()
+        result = json.loads(store._validations.values[store._validation[self._index]])
+        if result.get('validated_metadata') == _METADATA_SLOT:
+            result['validated_metadata'] = (
+                extracted.get('metadata') if validated == _SAME_METADATA else validated
+            )
+        return result
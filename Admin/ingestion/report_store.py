@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Report Store for Go-Kart Part Data Ingestion
+
+Optional SQLite backend for batch reports. Batches, records, validation
+issues and extracted fields are written to indexed tables, so review
+queues and cross-batch questions ("all invalid engines from Predator in
+the last 30 days") are answered with an indexed query instead of parsing
+every output/report-*.json file.
+
+The database runs in WAL mode, so it can be queried while an ingestion
+run is writing to it. Old batches are removed with prune().
+
+Usage:
+    python ingest.py --file parts.csv --report-db reports.sqlite
+    python report_store.py query --db reports.sqlite --status invalid --category engines --brand Predator --days 30
+    python report_store.py batches --db reports.sqlite
+    python report_store.py prune --db reports.sqlite --keep-days 90
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable
+
+from reporters import IngestionBatchReport, PartIngestionRecord, as_number
+
+
+STORE_FORMAT_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS batches (
+    batch_id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    mode TEXT NOT NULL,
+    source_file TEXT,
+    total_records INTEGER NOT NULL DEFAULT 0,
+    ready_count INTEGER NOT NULL DEFAULT 0,
+    needs_review_count INTEGER NOT NULL DEFAULT 0,
+    invalid_count INTEGER NOT NULL DEFAULT 0,
+    duplicate_count INTEGER NOT NULL DEFAULT 0,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_batches_created ON batches (created_at);
+CREATE TABLE IF NOT EXISTS records (
+    batch_id TEXT NOT NULL,
+    record_no INTEGER NOT NULL,
+    row_number INTEGER,
+    created_at REAL NOT NULL,
+    status TEXT NOT NULL,
+    name TEXT NOT NULL,
+    brand TEXT NOT NULL COLLATE NOCASE,
+    category TEXT NOT NULL,
+    sku TEXT,
+    review_reasons TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (batch_id, record_no)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_records_status ON records (status, category, created_at);
+CREATE INDEX IF NOT EXISTS idx_records_brand ON records (brand, status, created_at);
+CREATE TABLE IF NOT EXISTS issues (
+    batch_id TEXT NOT NULL,
+    record_no INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    message TEXT NOT NULL,
+    suggestion TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_issues_record ON issues (batch_id, record_no);
+CREATE INDEX IF NOT EXISTS idx_issues_field ON issues (field, severity);
+CREATE TABLE IF NOT EXISTS fields (
+    batch_id TEXT NOT NULL,
+    record_no INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT,
+    num_value REAL
+);
+CREATE INDEX IF NOT EXISTS idx_fields_record ON fields (batch_id, record_no);
+CREATE INDEX IF NOT EXISTS idx_fields_value ON fields (field, num_value);
+"""
+
+
+class ReportStore:
+    """Indexed SQLite store of ingestion batches and their records."""
+    
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Database file (created if missing)
+        """
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('format_version', ?)",
+                (str(STORE_FORMAT_VERSION),)
+            )
+        
+        self._created_at: Dict[str, float] = {}
+        self._next_record: Dict[str, int] = {}
+    
+    def close(self):
+        self.conn.close()
+    
+    def begin_batch(self, batch_id: str, timestamp: str, mode: str,
+                    source_file: Optional[str]):
+        """
+        Register a batch before its records are written. A batch that is
+        already stored (one being reprocessed) is replaced.
+        """
+        created_at = time.time()
+        with self.conn:
+            for table in ('issues', 'fields', 'records'):
+                self.conn.execute(f"DELETE FROM {table} WHERE batch_id = ?", (batch_id,))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO batches (batch_id, timestamp, created_at, mode, source_file) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (batch_id, timestamp, created_at, mode, source_file)
+            )
+        self._created_at[batch_id] = created_at
+        self._next_record[batch_id] = 0
+    
+    def add_records(self, batch_id: str, records: Iterable[PartIngestionRecord]) -> int:
+        """
+        Write a chunk of records, their issues and extracted fields in one
+        transaction.
+        
+        Returns:
+            Number of records written
+        """
+        created_at = self._created_at[batch_id]
+        record_no = self._next_record[batch_id]
+        record_rows = []
+        issue_rows = []
+        field_rows = []
+        
+        for record in records:
+            normalized = record.normalized_data
+            record_rows.append((
+                batch_id, record_no, record.row_number, created_at, record.status,
+                normalized.get('name', {}).get('normalized', ''),
+                normalized.get('brand', {}).get('canonical', ''),
+                normalized.get('category', {}).get('slug', ''),
+                normalized.get('sku'),
+                json.dumps(record.review_reasons),
+                json.dumps({
+                    'original_data': record.original_data,
+                    'validation_result': record.validation_result
+                }, default=str)
+            ))
+            for issue in record.validation_result.get('issues', []):
+                issue_rows.append((
+                    batch_id, record_no, issue.get('field', ''), issue.get('severity', 'info'),
+                    issue.get('message', ''), issue.get('suggestion')
+                ))
+            for name, value in record.extracted_specs.get('metadata', {}).items():
+                field_rows.append((batch_id, record_no, name, str(value), as_number(value)))
+            record_no += 1
+        
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO records (batch_id, record_no, row_number, created_at, status, name, "
+                "brand, category, sku, review_reasons, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                record_rows
+            )
+            self.conn.executemany(
+                "INSERT INTO issues (batch_id, record_no, field, severity, message, suggestion) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                issue_rows
+            )
+            self.conn.executemany(
+                "INSERT INTO fields (batch_id, record_no, field, value, num_value) "
+                "VALUES (?, ?, ?, ?, ?)",
+                field_rows
+            )
+        
+        written = record_no - self._next_record[batch_id]
+        self._next_record[batch_id] = record_no
+        return written
+    
+    def finish_batch(self, batch: IngestionBatchReport):
+        """Store the final counts and summary of a batch."""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE batches SET total_records = ?, ready_count = ?, needs_review_count = ?, "
+                "invalid_count = ?, duplicate_count = ?, summary = ? WHERE batch_id = ?",
+                (batch.total_records, batch.ready_count, batch.needs_review_count,
+                 batch.invalid_count, batch.duplicate_count,
+                 json.dumps(batch.summary, default=str), batch.batch_id)
+            )
+        self._created_at.pop(batch.batch_id, None)
+        self._next_record.pop(batch.batch_id, None)
+    
+    def write_batch(self, batch: IngestionBatchReport, chunk_size: int = 1000):
+        """Store a complete batch in one go."""
+        self.begin_batch(batch.batch_id, batch.timestamp, batch.mode, batch.source_file)
+        for start in range(0, len(batch.records), chunk_size):
+            self.add_records(batch.batch_id, batch.records[start:start + chunk_size])
+        self.finish_batch(batch)
+    
+    def query_records(self, status: Optional[str] = None,
+                      category: Optional[str] = None,
+                      brand: Optional[str] = None,
+                      days: Optional[float] = None,
+                      batch_id: Optional[str] = None,
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find stored records.
+        
+        Args:
+            status: Record status ('needs_review', 'invalid', ...)
+            category: Category slug or top-level prefix ('engines' matches
+                'engines/complete-engines')
+            brand: Canonical brand name (case-insensitive)
+            days: Only batches from the last N days
+            batch_id: Only this batch
+            limit: Maximum number of rows
+        
+        Returns:
+            Records, newest first, with their issues
+        """
+        clauses = []
+        params: List[Any] = []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if category:
+            clauses.append("(category = ? OR (category >= ? AND category < ?))")
+            params.extend([category, category + '/', category + '0'])
+        if brand:
+            clauses.append("brand = ?")
+            params.append(brand)
+        if days is not None:
+            clauses.append("created_at >= ?")
+            params.append(time.time() - days * 86400)
+        if batch_id:
+            clauses.append("batch_id = ?")
+            params.append(batch_id)
+        
+        sql = ("SELECT batch_id, record_no, row_number, status, name, brand, category, sku, "
+               "review_reasons FROM records")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC, batch_id, record_no"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        
+        results = []
+        for row in self.conn.execute(sql, params):
+            item = dict(row)
+            item['review_reasons'] = json.loads(item['review_reasons'])
+            item['issues'] = [dict(i) for i in self.conn.execute(
+                "SELECT field, severity, message, suggestion FROM issues "
+                "WHERE batch_id = ? AND record_no = ?", (row['batch_id'], row['record_no'])
+            )]
+            results.append(item)
+        return results
+    
+    def batches(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Stored batches, newest first."""
+        sql = ("SELECT batch_id, timestamp, mode, source_file, total_records, ready_count, "
+               "needs_review_count, invalid_count, duplicate_count FROM batches "
+               "ORDER BY created_at DESC")
+        params: List[Any] = []
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+    
+    def prune(self, keep_days: Optional[float] = None,
+              keep_batches: Optional[int] = None) -> int:
+        """
+        Delete old batches and everything stored for them.
+        
+        Args:
+            keep_days: Drop batches older than this many days
+            keep_batches: Keep only the newest N batches
+        
+        Returns:
+            Number of batches deleted
+        """
+        stale = set()
+        if keep_days is not None:
+            cutoff = time.time() - keep_days * 86400
+            stale.update(row[0] for row in self.conn.execute(
+                "SELECT batch_id FROM batches WHERE created_at < ?", (cutoff,)
+            ))
+        if keep_batches is not None:
+            stale.update(row[0] for row in self.conn.execute(
+                "SELECT batch_id FROM batches ORDER BY created_at DESC LIMIT -1 OFFSET ?",
+                (keep_batches,)
+            ))
+        
+        if stale:
+            ids = [(batch_id,) for batch_id in stale]
+            with self.conn:
+                for table in ('issues', 'fields', 'records', 'batches'):
+                    self.conn.executemany(f"DELETE FROM {table} WHERE batch_id = ?", ids)
+        return len(stale)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Go-Kart Part Picker - Report Store')
+    parser.add_argument('command', choices=['query', 'batches', 'prune'])
+    parser.add_argument('--db', type=Path, required=True,
+                        help='Report database (SQLite)')
+    parser.add_argument('--status', help='Record status for query')
+    parser.add_argument('--category', help='Category slug or prefix for query')
+    parser.add_argument('--brand', help='Brand for query')
+    parser.add_argument('--days', type=float, help='Only the last N days for query')
+    parser.add_argument('--batch', help='Only this batch for query')
+    parser.add_argument('--limit', type=int, default=100, help='Maximum rows (default: 100)')
+    parser.add_argument('--keep-days', type=float, help='Retention in days for prune')
+    parser.add_argument('--keep-batches', type=int, help='Batches to keep for prune')
+    
+    args = parser.parse_args()
+    store = ReportStore(args.db)
+    
+    try:
+        if args.command == 'query':
+            start = time.perf_counter()
+            rows = store.query_records(status=args.status, category=args.category,
+                                       brand=args.brand, days=args.days,
+                                       batch_id=args.batch, limit=args.limit)
+            elapsed = (time.perf_counter() - start) * 1000
+            for row in rows:
+                reasons = ', '.join(row['review_reasons'])
+                print(f"  {row['batch_id']} row {row['row_number']}: {row['name']} "
+                      f"[{row['brand']} | {row['category']}] {row['status']}"
+                      + (f" ({reasons})" if reasons else ""))
+                for issue in row['issues']:
+                    print(f"      {issue['severity'].upper()}: {issue['message']}")
+            print(f"✓ {len(rows)} records in {elapsed:.1f} ms")
+        elif args.command == 'batches':
+            for row in store.batches(limit=args.limit):
+                print(f"  {row['batch_id']}  {row['timestamp']}  {row['mode']}  "
+                      f"total={row['total_records']} ready={row['ready_count']} "
+                      f"review={row['needs_review_count']} invalid={row['invalid_count']} "
+                      f"duplicate={row['duplicate_count']}")
+        else:
+            if args.keep_days is None and args.keep_batches is None:
+                parser.error('prune requires --keep-days or --keep-batches')
+            count = store.prune(keep_days=args.keep_days, keep_batches=args.keep_batches)
+            print(f"✓ Pruned {count} batches")
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
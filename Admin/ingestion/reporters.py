@@ -9,11 +9,35 @@ Generates various reports:
 - needs_review summaries
 """
 
+import csv
+import gzip
+import hashlib
+import heapq
 import json
+import math
+from array import array
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass, field, asdict
+from typing import Optional, Dict, Any, List, Tuple, TextIO, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field, asdict, fields
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; spec statistics fall back to the stdlib
+    np = None
+
+
+# Numeric spec distributions in the extraction analysis
+SPEC_PERCENTILES = (5, 25, 50, 75, 95)
+SPEC_HISTOGRAM_BINS = 10
+
+# Error bounds for the value-frequency sketches in the extraction analysis
+TOP_VALUE_ERROR = 0.001
+DISTINCT_COUNT_ERROR = 0.02
+
+# Layout version of saved batches (batch-*.jsonl.gz); bump on changes
+# that old loaders can't read
+BATCH_FORMAT_VERSION = 1
 
 
 @dataclass
@@ -27,11 +51,21 @@ class PartIngestionRecord:
     review_reasons: List[str] = field(default_factory=list)
     row_number: Optional[int] = None
     source_file: Optional[str] = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PartIngestionRecord':
+        """Rebuild a record from its serialized fields."""
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
 
 
 @dataclass
 class IngestionBatchReport:
-    """Report for a batch ingestion operation."""
+    """
+    Report for a batch ingestion operation.
+    
+    Batches from DataIngestionAgent keep their records in a RecordStore;
+    close them (or use a with block) once the records have been read.
+    """
     batch_id: str
     timestamp: str
     mode: str  # 'dry-run', 'commit', 'report-only'
@@ -41,30 +75,490 @@ class IngestionBatchReport:
     needs_review_count: int
     invalid_count: int
     duplicate_count: int
-    records: List[PartIngestionRecord]
+    records: Sequence[PartIngestionRecord]  # list or RecordStore
     summary: Dict[str, Any] = field(default_factory=dict)
     
+    def close(self):
+        """Release the record store's spill file; spilled records can't be read afterwards."""
+        close = getattr(self.records, 'close', None)
+        if close is not None:
+            close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             'batch_id': self.batch_id,
             'timestamp': self.timestamp,
             'mode': self.mode,
             'source_file': self.source_file,
-            'statistics': {
-                'total': self.total_records,
-                'ready': self.ready_count,
-                'needs_review': self.needs_review_count,
-                'invalid': self.invalid_count,
-                'duplicate': self.duplicate_count
-            },
+            'statistics': self.statistics(),
             'summary': self.summary,
             'records': [asdict(r) for r in self.records]
         }
+    
+    def statistics(self) -> Dict[str, int]:
+        return {
+            'total': self.total_records,
+            'ready': self.ready_count,
+            'needs_review': self.needs_review_count,
+            'invalid': self.invalid_count,
+            'duplicate': self.duplicate_count
+        }
+
+
+class StreamingReportWriter:
+    """
+    Writes a batch JSON report incrementally, one record at a time.
+    
+    Memory use doesn't depend on batch size: records are serialized as they
+    arrive instead of being deep-copied into one tree. Formats:
+    - 'json':  one object; header fields, "records": [...], then
+               "statistics" and "summary" once the batch is done
+    - 'jsonl': a header line, one line per record, then a trailer line with
+               statistics and summary; each line has a "type" field
+    """
+    
+    SEPARATORS = (',', ':')
+    
+    def __init__(self, path: Path, fmt: str = 'json', compress: bool = False):
+        if fmt not in ('json', 'jsonl'):
+            raise ValueError(f"Unknown report format: {fmt}")
+        
+        self.fmt = fmt
+        self.path = Path(f"{path}.gz") if compress else Path(path)
+        self.record_count = 0
+        
+        if compress:
+            self._file: TextIO = gzip.open(self.path, 'wt', encoding='utf-8')
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8')
+    
+    def _dumps(self, value: Any) -> str:
+        return json.dumps(value, separators=self.SEPARATORS, default=str)
+    
+    def begin(self, batch_id: str, timestamp: str, mode: str, source_file: Optional[str],
+              extra: Optional[Dict[str, Any]] = None):
+        """Write the batch header, with optional extra header fields."""
+        header = {
+            'batch_id': batch_id,
+            'timestamp': timestamp,
+            'mode': mode,
+            'source_file': source_file
+        }
+        if extra:
+            header.update(extra)
+        if self.fmt == 'jsonl':
+            self._file.write(self._dumps({'type': 'header', **header}) + '\n')
+        else:
+            self._file.write(self._dumps(header)[:-1] + ',"records":[')
+    
+    def write_record(self, record: 'PartIngestionRecord'):
+        """Serialize one record (shallow; nested dicts are not copied)."""
+        data = {f.name: getattr(record, f.name) for f in fields(record)}
+        if self.fmt == 'jsonl':
+            self._file.write(self._dumps({'type': 'record', **data}) + '\n')
+        else:
+            if self.record_count:
+                self._file.write(',')
+            self._file.write('\n' + self._dumps(data))
+        self.record_count += 1
+    
+    def finish(self, statistics: Dict[str, Any], summary: Dict[str, Any]) -> str:
+        """Write statistics and summary, close the file and return its path."""
+        if self.fmt == 'jsonl':
+            self._file.write(self._dumps({
+                'type': 'trailer', 'statistics': statistics, 'summary': summary
+            }) + '\n')
+        else:
+            self._file.write('\n],"statistics":' + self._dumps(statistics) +
+                             ',"summary":' + self._dumps(summary) + '}\n')
+        self.close()
+        return str(self.path)
+    
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class SpaceSavingCounter:
+    """
+    Space-Saving heavy-hitters sketch (Metwally et al.).
+    
+    Tracks at most ceil(1 / error) values. Any value that occurs more than
+    error * total times is guaranteed to be tracked, and each reported
+    count overestimates the true count by at most error * total. Counts
+    stay exact until the first value has to be evicted.
+    """
+    
+    def __init__(self, error: float = 0.01):
+        self.capacity = max(1, math.ceil(1 / error))
+        self.total = 0
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.evictions = 0
+        # Lower bounds of the counts; refreshed lazily when an eviction
+        # finds a stale entry on top
+        self._heap: List[Tuple[int, str]] = []
+    
+    @property
+    def exact(self) -> bool:
+        return self.evictions == 0
+    
+    def add(self, value: str):
+        self.total += 1
+        counts = self.counts
+        if value in counts:
+            counts[value] += 1
+            return
+        
+        if len(counts) < self.capacity:
+            counts[value] = 1
+            self.errors[value] = 0
+            heapq.heappush(self._heap, (1, value))
+            return
+        
+        # Replace the current minimum; the newcomer inherits its count
+        heap = self._heap
+        while True:
+            count, victim = heap[0]
+            if counts[victim] == count:
+                break
+            heapq.heapreplace(heap, (counts[victim], victim))
+        del counts[victim]
+        del self.errors[victim]
+        counts[value] = count + 1
+        self.errors[value] = count
+        heapq.heapreplace(heap, (count + 1, value))
+        self.evictions += 1
+    
+    def top(self, n: int) -> List[Tuple[str, int]]:
+        """The n most frequent values with their (upper-bound) counts."""
+        return heapq.nlargest(n, self.counts.items(), key=lambda x: x[1])
+    
+    @property
+    def max_error(self) -> int:
+        """Upper bound on how much any reported count is overestimated."""
+        return 0 if self.exact else self.total // self.capacity
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count estimator (Flajolet et al.).
+    
+    Uses 2**precision one-byte registers; the precision is chosen from the
+    target relative standard error (1.04 / sqrt(registers)).
+    """
+    
+    def __init__(self, error: float = 0.02):
+        self.precision = min(16, max(4, math.ceil(math.log2((1.04 / error) ** 2))))
+        self.m = 1 << self.precision
+        self.registers = bytearray(self.m)
+        self._shift = 64 - self.precision
+    
+    @property
+    def error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+    
+    def add(self, value: str):
+        h = int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+        idx = h >> self._shift
+        rest = h & ((1 << self._shift) - 1)
+        rank = self._shift - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+    
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / math.fsum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # Linear counting for small sets
+        return int(round(estimate))
+
+
+class BatchAccumulator:
+    """
+    Aggregates everything the reports need in one pass over the records.
+    
+    Call add() as each record leaves the pipeline; report generators then
+    render from the accumulator instead of re-walking batch.records. Memory
+    doesn't grow with the batch: flagged rows (needs_review/invalid) are
+    kept as compact entries up to flagged_sample_size per status for the
+    text report (the needs-review CSV sink streams all of them), ready and
+    issue samples are bounded, and per-field value frequencies use
+    fixed-size sketches.
+    """
+    
+    def __init__(self, ready_sample_size: int = 10, issue_sample_size: int = 10,
+                 flagged_sample_size: int = 500,
+                 top_value_error: float = TOP_VALUE_ERROR,
+                 distinct_count_error: float = DISTINCT_COUNT_ERROR):
+        """
+        Args:
+            flagged_sample_size: Needs-review and invalid rows, each, listed
+                in the dry-run report
+            top_value_error: Space-Saving error bound; top-value counts are
+                off by at most this fraction of the field's occurrences
+            distinct_count_error: HyperLogLog relative standard error for
+                distinct-value counts
+        """
+        self.ready_sample_size = ready_sample_size
+        self.issue_sample_size = issue_sample_size
+        self.flagged_sample_size = flagged_sample_size
+        self.top_value_error = top_value_error
+        self.distinct_count_error = distinct_count_error
+        
+        self.total = 0
+        self.status_counts = {'ready': 0, 'needs_review': 0, 'invalid': 0, 'duplicate': 0}
+        
+        # Dry-run breakdowns
+        self.categories: Dict[str, int] = {}
+        self.brands: Dict[str, int] = {}
+        
+        # Bounded samples; flagged rows are the first ones, in record order
+        self.needs_review_items: List[Dict[str, Any]] = []
+        self.invalid_items: List[Dict[str, Any]] = []
+        self.ready_samples: List[Dict[str, Any]] = []
+        self.issue_samples: List[Dict[str, Any]] = []
+        
+        # Extraction analysis
+        self.field_counts: Dict[str, int] = {}
+        self.field_values: Dict[str, SpaceSavingCounter] = {}
+        self.field_distinct: Dict[str, HyperLogLog] = {}
+        self.engine_families: Dict[str, int] = {}
+        self.confidence_levels = {'high': 0, 'medium': 0, 'low': 0}
+        
+        # Numeric spec columns per category (plus price)
+        self.numeric_columns: Dict[str, Dict[str, array]] = {}
+        self._spec_statistics: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None
+    
+    @classmethod
+    def from_records(cls, records: List[PartIngestionRecord]) -> 'BatchAccumulator':
+        accumulator = cls()
+        for record in records:
+            accumulator.add(record)
+        return accumulator
+    
+    @staticmethod
+    def review_entry(record: PartIngestionRecord) -> Dict[str, Any]:
+        """Compact needs-review entry for a flagged record."""
+        normalized = record.normalized_data
+        return {
+            'row_number': record.row_number,
+            'name': normalized.get('name', {}).get('normalized', ''),
+            'brand': normalized.get('brand', {}).get('canonical', ''),
+            'category': normalized.get('category', {}).get('slug', ''),
+            'status': record.status,
+            'reasons': list(record.review_reasons),
+            'suggestions': [
+                i['suggestion'] for i in record.validation_result.get('issues', [])
+                if i.get('suggestion')
+            ]
+        }
+    
+    @property
+    def flagged_count(self) -> int:
+        return self.status_counts['needs_review'] + self.status_counts['invalid']
+    
+    def add(self, record: PartIngestionRecord):
+        """Fold one processed record into every aggregate."""
+        self.total += 1
+        if record.status in self.status_counts:
+            self.status_counts[record.status] += 1
+        
+        normalized = record.normalized_data
+        name = normalized.get('name', {}).get('normalized', 'Unknown')
+        cat = normalized.get('category', {}).get('slug', 'uncategorized')
+        brand = normalized.get('brand', {}).get('canonical', 'Unknown')
+        self.categories[cat] = self.categories.get(cat, 0) + 1
+        self.brands[brand] = self.brands.get(brand, 0) + 1
+        
+        issues = record.validation_result.get('issues', [])
+        
+        if record.status == 'needs_review':
+            if len(self.needs_review_items) < self.flagged_sample_size:
+                self.needs_review_items.append({
+                    'row_number': record.row_number,
+                    'name': name,
+                    'reasons': list(record.review_reasons)
+                })
+        elif record.status == 'invalid':
+            if len(self.invalid_items) < self.flagged_sample_size:
+                self.invalid_items.append({
+                    'row_number': record.row_number,
+                    'name': record.original_data.get('name', 'Unknown'),
+                    'errors': [i.get('message', '') for i in issues if i.get('severity') == 'error']
+                })
+        elif record.status == 'ready' and len(self.ready_samples) < self.ready_sample_size:
+            self.ready_samples.append({
+                'name': name,
+                'brand': brand,
+                'category': normalized.get('category', {}).get('slug', 'Unknown'),
+                'specs': list(record.extracted_specs.get('metadata', {}).items())[:5]
+            })
+        
+        if record.status in ('needs_review', 'invalid'):
+            if len(self.issue_samples) < self.issue_sample_size:
+                self.issue_samples.append({
+                    'name': name,
+                    'status': record.status,
+                    'issues': [(i.get('severity', 'info'), i.get('message', '')) for i in issues]
+                })
+        
+        specs = record.extracted_specs
+        columns = None
+        for field_name, value in specs.get('metadata', {}).items():
+            self.field_counts[field_name] = self.field_counts.get(field_name, 0) + 1
+            values = self.field_values.get(field_name)
+            if values is None:
+                values = self.field_values[field_name] = SpaceSavingCounter(self.top_value_error)
+                self.field_distinct[field_name] = HyperLogLog(self.distinct_count_error)
+            value_str = str(value)
+            values.add(value_str)
+            self.field_distinct[field_name].add(value_str)
+            
+            number = as_number(value)
+            if number is not None:
+                if columns is None:
+                    columns = self.numeric_columns.setdefault(cat, {})
+                columns.setdefault(field_name, array('d')).append(number)
+        
+        price = parse_price(normalized.get('price'))
+        if price is not None:
+            self.numeric_columns.setdefault(cat, {}).setdefault('price', array('d')).append(price)
+        self._spec_statistics = None
+        
+        ef = specs.get('engine_family')
+        if ef:
+            self.engine_families[ef] = self.engine_families.get(ef, 0) + 1
+        
+        for extraction in specs.get('extractions', []):
+            conf = extraction.get('confidence', 0)
+            if conf >= 0.9:
+                self.confidence_levels['high'] += 1
+            elif conf >= 0.7:
+                self.confidence_levels['medium'] += 1
+            else:
+                self.confidence_levels['low'] += 1
+    
+    def spec_statistics(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Distribution of every numeric spec, per category.
+        
+        Returns:
+            {category: {field: summary}} where summary has count, min, max,
+            mean, percentiles and a histogram (see numeric_summary)
+        """
+        if self._spec_statistics is None:
+            self._spec_statistics = {
+                cat: {name: numeric_summary(column) for name, column in sorted(columns.items())}
+                for cat, columns in sorted(self.numeric_columns.items())
+            }
+        return self._spec_statistics
+    
+    def distinct_values(self, field_name: str) -> Tuple[int, bool]:
+        """
+        Distinct values seen for a field.
+        
+        Returns:
+            (count, exact); exact while the top-value sketch still holds
+            every value, otherwise a HyperLogLog estimate
+        """
+        values = self.field_values[field_name]
+        if values.exact:
+            return len(values.counts), True
+        return self.field_distinct[field_name].count(), False
+
+
+def numeric_summary(column: array, bins: int = SPEC_HISTOGRAM_BINS) -> Dict[str, Any]:
+    """
+    Summarize a numeric column: count, min, max, mean, percentiles and an
+    equal-width histogram. Uses NumPy when installed, otherwise sorts the
+    column once and interpolates percentiles the same way (linear).
+    """
+    n = len(column)
+    if n == 0:
+        return {'count': 0}
+    
+    if np is not None:
+        values = np.frombuffer(column, dtype=np.float64)
+        low, high = float(values.min()), float(values.max())
+        mean = float(values.mean())
+        percentiles = [float(p) for p in np.percentile(values, SPEC_PERCENTILES)]
+        counts, edges = np.histogram(values, bins=bins)
+        counts, edges = counts.tolist(), edges.tolist()
+    else:
+        ordered = sorted(column)
+        low, high = ordered[0], ordered[-1]
+        mean = math.fsum(ordered) / n
+        percentiles = []
+        for p in SPEC_PERCENTILES:
+            pos = (n - 1) * p / 100
+            lo = int(pos)
+            hi = min(lo + 1, n - 1)
+            percentiles.append(ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo))
+        
+        # Same bin layout as numpy.histogram (a flat column gets a unit range)
+        start, stop = (low - 0.5, high + 0.5) if low == high else (low, high)
+        width = (stop - start) / bins
+        edges = [start + width * i for i in range(bins)] + [stop]
+        counts = [0] * bins
+        for v in ordered:
+            counts[min(int((v - start) / width), bins - 1)] += 1
+    
+    return {
+        'count': n,
+        'min': low,
+        'max': high,
+        'mean': round(mean, 6),
+        'percentiles': {f"p{p}": round(v, 6) for p, v in zip(SPEC_PERCENTILES, percentiles)},
+        'histogram': {'edges': [round(e, 6) for e in edges], 'counts': counts}
+    }
+
+
+def as_number(value: Any) -> Optional[float]:
+    """
+    Finite numeric spec value, or None for text, booleans, NaN and inf.
+    
+    The one definition of a numeric spec shared by the extraction
+    analysis and the report store's range queries.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    number = float(value)
+    return number if math.isfinite(number) else None
+
+
+def parse_price(value: Any) -> Optional[float]:
+    """Parse a raw price such as '89.99' or '$1,249.00'."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return as_number(value)
+    try:
+        number = float(str(value).strip().lstrip('$').replace(',', ''))
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
 
 
 class ReportGenerator:
     """Generates various report formats."""
     
+    NEEDS_REVIEW_HEADER = ['row', 'name', 'brand', 'category', 'status', 'reasons', 'suggested_fixes']
+    
     def __init__(self, output_dir: Optional[Path] = None):
         if output_dir is None:
             output_dir = Path(__file__).parent / "output"
@@ -72,14 +566,47 @@ class ReportGenerator:
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
-    def generate_dry_run_report(self, batch: IngestionBatchReport) -> str:
+    @staticmethod
+    def _write_lines(report_path: Path, lines: Iterable[str]) -> str:
+        """Write report lines as they are produced, newline-separated."""
+        with open(report_path, 'w') as f:
+            for i, line in enumerate(lines):
+                f.write(f"\n{line}" if i else line)
+        
+        return str(report_path)
+    
+    def generate_dry_run_report(self, batch: IngestionBatchReport,
+                                accumulator: Optional[BatchAccumulator] = None,
+                                review_csv: bool = True) -> str:
         """
         Generate a dry-run report showing what would be ingested.
         
+        Args:
+            accumulator: Aggregates collected while processing; built from
+                batch.records when omitted
+            review_csv: Whether the needs-review CSV is written alongside,
+                so rows left out of the report can be found there
+        
         Returns:
             Path to the generated report file
         """
-        report_lines = [
+        acc = accumulator or BatchAccumulator.from_records(batch.records)
+        report_path = self.output_dir / f"dry-run-{batch.batch_id}.txt"
+        return self._write_lines(report_path, self._dry_run_lines(batch, acc, review_csv))
+    
+    def _more_flagged(self, batch: IngestionBatchReport, listed: int, total: int,
+                      review_csv: bool) -> Iterator[str]:
+        """Note the flagged rows left out of a report section."""
+        if total > listed:
+            if review_csv:
+                yield f"  ... and {total - listed} more (see {self.needs_review_path(batch.batch_id).name})"
+            else:
+                yield f"  ... and {total - listed} more"
+            yield ""
+    
+    def _dry_run_lines(self, batch: IngestionBatchReport,
+                       acc: BatchAccumulator, review_csv: bool = True) -> Iterator[str]:
+        yield from [
             "=" * 80,
             "DRY RUN INGESTION REPORT",
             "=" * 80,
@@ -102,175 +629,203 @@ class ReportGenerator:
         ]
         
         # Category breakdown
-        categories = {}
-        brands = {}
-        for record in batch.records:
-            cat = record.normalized_data.get('category', {}).get('slug', 'uncategorized')
-            brand = record.normalized_data.get('brand', {}).get('canonical', 'Unknown')
-            
-            categories[cat] = categories.get(cat, 0) + 1
-            brands[brand] = brands.get(brand, 0) + 1
-        
-        report_lines.extend([
+        yield from [
             "-" * 80,
             "BY CATEGORY",
             "-" * 80,
             ""
-        ])
-        for cat, count in sorted(categories.items(), key=lambda x: -x[1]):
-            report_lines.append(f"  {cat}: {count}")
+        ]
+        for cat, count in sorted(acc.categories.items(), key=lambda x: -x[1]):
+            yield f"  {cat}: {count}"
         
-        report_lines.extend([
+        yield from [
             "",
             "-" * 80,
             "BY BRAND",
             "-" * 80,
             ""
-        ])
-        for brand, count in sorted(brands.items(), key=lambda x: -x[1]):
-            report_lines.append(f"  {brand}: {count}")
+        ]
+        for brand, count in sorted(acc.brands.items(), key=lambda x: -x[1]):
+            yield f"  {brand}: {count}"
         
         # Needs review section
         if batch.needs_review_count > 0:
-            report_lines.extend([
+            yield from [
                 "",
                 "-" * 80,
                 "ITEMS NEEDING REVIEW",
                 "-" * 80,
                 ""
-            ])
+            ]
             
-            for record in batch.records:
-                if record.status == 'needs_review':
-                    name = record.normalized_data.get('name', {}).get('normalized', 'Unknown')
-                    reasons = ', '.join(record.review_reasons) if record.review_reasons else 'Unknown reason'
-                    row = f"Row {record.row_number}: " if record.row_number else ""
-                    report_lines.append(f"  {row}{name}")
-                    report_lines.append(f"    Reasons: {reasons}")
-                    report_lines.append("")
+            for item in acc.needs_review_items:
+                reasons = ', '.join(item['reasons']) if item['reasons'] else 'Unknown reason'
+                row = f"Row {item['row_number']}: " if item['row_number'] else ""
+                yield f"  {row}{item['name']}"
+                yield f"    Reasons: {reasons}"
+                yield ""
+            yield from self._more_flagged(batch, len(acc.needs_review_items),
+                                          acc.status_counts['needs_review'], review_csv)
         
         # Invalid items section
         if batch.invalid_count > 0:
-            report_lines.extend([
+            yield from [
                 "-" * 80,
                 "INVALID ITEMS",
                 "-" * 80,
                 ""
-            ])
+            ]
             
-            for record in batch.records:
-                if record.status == 'invalid':
-                    name = record.original_data.get('name', 'Unknown')
-                    errors = record.validation_result.get('issues', [])
-                    error_msgs = [e.get('message', '') for e in errors if e.get('severity') == 'error']
-                    
-                    row = f"Row {record.row_number}: " if record.row_number else ""
-                    report_lines.append(f"  {row}{name}")
-                    for msg in error_msgs:
-                        report_lines.append(f"    - {msg}")
-                    report_lines.append("")
+            for item in acc.invalid_items:
+                row = f"Row {item['row_number']}: " if item['row_number'] else ""
+                yield f"  {row}{item['name']}"
+                for msg in item['errors']:
+                    yield f"    - {msg}"
+                yield ""
+            yield from self._more_flagged(batch, len(acc.invalid_items),
+                                          acc.status_counts['invalid'], review_csv)
         
         # Sample of ready items
-        ready_items = [r for r in batch.records if r.status == 'ready']
-        if ready_items:
-            report_lines.extend([
+        if acc.ready_samples:
+            yield from [
                 "-" * 80,
-                f"READY TO COMMIT (showing first 10 of {len(ready_items)})",
+                f"READY TO COMMIT (showing first {acc.ready_sample_size} of {acc.status_counts['ready']})",
                 "-" * 80,
                 ""
-            ])
+            ]
             
-            for record in ready_items[:10]:
-                name = record.normalized_data.get('name', {}).get('normalized', 'Unknown')
-                brand = record.normalized_data.get('brand', {}).get('canonical', 'Unknown')
-                cat = record.normalized_data.get('category', {}).get('slug', 'Unknown')
-                
-                report_lines.append(f"  • {name}")
-                report_lines.append(f"    Brand: {brand} | Category: {cat}")
+            for item in acc.ready_samples:
+                yield f"  • {item['name']}"
+                yield f"    Brand: {item['brand']} | Category: {item['category']}"
                 
                 # Show extracted specs
-                specs = record.extracted_specs.get('metadata', {})
-                if specs:
-                    spec_str = ', '.join([f"{k}={v}" for k, v in list(specs.items())[:5]])
-                    report_lines.append(f"    Specs: {spec_str}")
-                report_lines.append("")
+                if item['specs']:
+                    spec_str = ', '.join([f"{k}={v}" for k, v in item['specs']])
+                    yield f"    Specs: {spec_str}"
+                yield ""
         
-        report_lines.extend([
+        yield from [
             "=" * 80,
             "END OF REPORT",
             "=" * 80
-        ])
-        
-        # Write report
-        report_content = '\n'.join(report_lines)
-        report_path = self.output_dir / f"dry-run-{batch.batch_id}.txt"
-        
-        with open(report_path, 'w') as f:
-            f.write(report_content)
+        ]
+    
+    def open_json_report(self, batch_id: str, timestamp: str, mode: str,
+                         source_file: Optional[str], fmt: str = 'json',
+                         compress: bool = False) -> StreamingReportWriter:
+        """
+        Start a streaming JSON report that records are written to as they
+        finish processing.
         
-        return str(report_path)
+        Returns:
+            StreamingReportWriter; call finish() once the batch is done
+        """
+        writer = StreamingReportWriter(
+            self.output_dir / f"report-{batch_id}.{fmt}", fmt=fmt, compress=compress
+        )
+        writer.begin(batch_id, timestamp, mode, source_file)
+        return writer
     
-    def generate_json_report(self, batch: IngestionBatchReport) -> str:
+    def generate_json_report(self, batch: IngestionBatchReport, fmt: str = 'json',
+                             compress: bool = False) -> str:
         """
         Generate a JSON report with full details.
         
+        Args:
+            fmt: 'json' (single object) or 'jsonl' (one record per line)
+            compress: gzip the report
+        
         Returns:
             Path to the generated report file
         """
-        report_path = self.output_dir / f"report-{batch.batch_id}.json"
+        with self.open_json_report(batch.batch_id, batch.timestamp, batch.mode,
+                                   batch.source_file, fmt=fmt, compress=compress) as writer:
+            for record in batch.records:
+                writer.write_record(record)
+            return writer.finish(batch.statistics(), batch.summary)
+    
+    def needs_review_path(self, batch_id: str) -> Path:
+        return self.output_dir / f"needs-review-{batch_id}.csv"
+    
+    def saved_batch_path(self, batch_id: str) -> Path:
+        return self.output_dir / f"batch-{batch_id}.jsonl.gz"
+    
+    def row_index_path(self, batch_id: str) -> Path:
+        return self.output_dir / f"batch-{batch_id}.idx"
+    
+    def open_saved_batch(self, batch_id: str, timestamp: str, mode: str,
+                         source_file: Optional[str],
+                         header: Dict[str, Any]) -> StreamingReportWriter:
+        """
+        Start a saved batch: the processed batch as gzipped JSONL, for
+        committing later without reprocessing (see load_saved_batch).
         
-        with open(report_path, 'w') as f:
-            json.dump(batch.to_dict(), f, indent=2, default=str)
+        Args:
+            header: Extra header fields (input hash, config fingerprint)
         
-        return str(report_path)
+        Returns:
+            StreamingReportWriter; call finish() once the batch is done
+        """
+        path = self.saved_batch_path(batch_id)
+        writer = StreamingReportWriter(path.with_suffix(''), fmt='jsonl', compress=True)
+        writer.begin(batch_id, timestamp, mode, source_file,
+                     extra=dict(header, format_version=BATCH_FORMAT_VERSION))
+        return writer
+    
+    @staticmethod
+    def needs_review_row(entry: Dict[str, Any]) -> List[Any]:
+        """Format a BatchAccumulator review entry as a CSV row."""
+        return [
+            entry['row_number'] or '',
+            entry['name'],
+            entry['brand'],
+            entry['category'],
+            entry['status'],
+            '; '.join(entry['reasons']),
+            '; '.join(entry['suggestions'])
+        ]
     
     def generate_needs_review_report(self, batch: IngestionBatchReport) -> str:
         """
-        Generate a CSV-style report of items needing review.
+        Generate a CSV report of items needing review.
         
         Returns:
             Path to the generated report file
         """
-        lines = [
-            "row,name,brand,category,status,reasons,suggested_fixes"
-        ]
+        report_path = self.needs_review_path(batch.batch_id)
         
-        for record in batch.records:
-            if record.status in ('needs_review', 'invalid'):
-                row = record.row_number or ''
-                name = record.normalized_data.get('name', {}).get('normalized', '')
-                name = name.replace('"', '""')  # Escape quotes for CSV
-                brand = record.normalized_data.get('brand', {}).get('canonical', '')
-                cat = record.normalized_data.get('category', {}).get('slug', '')
-                reasons = '; '.join(record.review_reasons)
-                
-                # Collect suggestions
-                suggestions = []
-                for issue in record.validation_result.get('issues', []):
-                    if issue.get('suggestion'):
-                        suggestions.append(issue['suggestion'])
-                suggestion_str = '; '.join(suggestions)
-                
-                lines.append(
-                    f'{row},"{name}","{brand}","{cat}",{record.status},"{reasons}","{suggestion_str}"'
-                )
-        
-        report_path = self.output_dir / f"needs-review-{batch.batch_id}.csv"
-        
-        with open(report_path, 'w') as f:
-            f.write('\n'.join(lines))
+        with open(report_path, 'w', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(self.NEEDS_REVIEW_HEADER)
+            writer.writerows(
+                self.needs_review_row(BatchAccumulator.review_entry(record))
+                for record in batch.records if record.status in ('needs_review', 'invalid')
+            )
         
         return str(report_path)
     
     def generate_commit_summary(self, batch: IngestionBatchReport, 
-                                 committed_ids: List[str]) -> str:
+                                 committed_ids: List[str],
+                                 commit_stats: Optional[Dict[str, Any]] = None) -> str:
         """
         Generate a summary report after committing to database.
         
+        Args:
+            commit_stats: CommitResult.to_dict() from the commit backend, for
+                the throughput and per-chunk latency sections
+        
         Returns:
             Path to the generated report file
         """
-        report_lines = [
+        report_path = self.output_dir / f"commit-{batch.batch_id}.txt"
+        return self._write_lines(
+            report_path, self._commit_summary_lines(batch, committed_ids, commit_stats)
+        )
+    
+    def _commit_summary_lines(self, batch: IngestionBatchReport,
+                              committed_ids: List[str],
+                              commit_stats: Optional[Dict[str, Any]]) -> Iterator[str]:
+        yield from [
             "=" * 80,
             "COMMIT SUMMARY REPORT",
             "=" * 80,
@@ -290,76 +845,112 @@ class ReportGenerator:
             f"",
         ]
         
+        if commit_stats and 'inserted' in commit_stats:
+            yield from [
+                f"  Inserted:             {commit_stats['inserted']}",
+                f"  Updated:              {commit_stats['updated']}",
+                f"  Unchanged (skipped):  {commit_stats['unchanged']}",
+                f""
+            ]
+        
+        if commit_stats:
+            latency = commit_stats['chunk_latency_ms']
+            yield from [
+                "-" * 80,
+                "PERFORMANCE",
+                "-" * 80,
+                f"",
+                f"Backend:                {commit_stats.get('backend', 'N/A')}",
+                f"Batch Size:             {commit_stats['batch_size']}",
+                f"Chunks:                 {commit_stats['chunks']}",
+                f"Total Time:             {commit_stats['seconds']:.3f}s",
+                f"Write Time:             {commit_stats.get('write_seconds', commit_stats['seconds']):.3f}s",
+                f"Throughput:             {commit_stats['rows_per_sec']:,.1f} rows/sec",
+                f"Chunk Latency (ms):     min {latency['min']:.2f} | "
+                f"median {latency['median']:.2f} | max {latency['max']:.2f}",
+                f"Retries:                {commit_stats.get('retries', 0)}",
+                f""
+            ]
+            
+            pool = commit_stats.get('pool')
+            if pool:
+                yield from [
+                    f"Connections:            {pool['connections']}",
+                    f"Pool Utilization:       {pool['utilization']:.1%}",
+                    f"Connection Wait (ms):   avg {pool['wait_ms_avg']:.2f} | "
+                    f"max {pool['wait_ms_max']:.2f} | total {pool['wait_ms_total']:.2f}",
+                    f""
+                ]
+            
+            details = commit_stats.get('chunk_details', [])
+            for chunk in details[:50]:
+                status = f"ROLLED BACK: {chunk['error']}" if chunk['error'] else 'ok'
+                attempts = chunk.get('attempts', 1)
+                retried = f", {attempts} attempts" if attempts > 1 else ''
+                yield (
+                    f"  chunk {chunk['index']}: {chunk['rows']} rows in {chunk['ms']:.2f} ms "
+                    f"({chunk['rows_per_sec']:,.0f} rows/sec; {chunk.get('inserted', 0)} inserted, "
+                    f"{chunk.get('updated', 0)} updated, {chunk.get('unchanged', 0)} unchanged"
+                    f"{retried}) {status}"
+                )
+            if len(details) > 50:
+                yield f"  ... and {len(details) - 50} more chunks"
+            yield ""
+            
+            if commit_stats['failed']:
+                yield from [
+                    "-" * 80,
+                    "FAILED (rolled back)",
+                    "-" * 80,
+                    f"",
+                    f"Chunks Rolled Back:     {commit_stats['failed_chunks']}",
+                    f"Records Not Committed:  {commit_stats['failed']}",
+                    f"Rows: {', '.join(str(r) for r in commit_stats['failed_rows'][:50])}"
+                    + (" ..." if commit_stats['failed'] > 50 else ""),
+                    f""
+                ]
+        
         if committed_ids:
-            report_lines.extend([
+            yield from [
                 "-" * 80,
                 "COMMITTED PART IDs",
                 "-" * 80,
                 ""
-            ])
+            ]
             for pid in committed_ids[:50]:
-                report_lines.append(f"  {pid}")
+                yield f"  {pid}"
             
             if len(committed_ids) > 50:
-                report_lines.append(f"  ... and {len(committed_ids) - 50} more")
+                yield f"  ... and {len(committed_ids) - 50} more"
         
-        report_lines.extend([
+        yield from [
             "",
             "=" * 80,
             "END OF COMMIT SUMMARY",
             "=" * 80
-        ])
-        
-        report_content = '\n'.join(report_lines)
-        report_path = self.output_dir / f"commit-{batch.batch_id}.txt"
-        
-        with open(report_path, 'w') as f:
-            f.write(report_content)
-        
-        return str(report_path)
+        ]
     
-    def generate_extraction_analysis(self, batch: IngestionBatchReport) -> str:
+    def generate_extraction_analysis(self, batch: IngestionBatchReport,
+                                     accumulator: Optional[BatchAccumulator] = None) -> str:
         """
         Generate an analysis of extracted specifications.
         
         Returns:
             Path to the generated report file
         """
-        # Collect extraction statistics
-        field_counts = {}
-        field_values = {}
-        engine_families = {}
-        confidence_levels = {'high': 0, 'medium': 0, 'low': 0}
-        
-        for record in batch.records:
-            specs = record.extracted_specs
-            
-            # Count extracted fields
-            for field, value in specs.get('metadata', {}).items():
-                field_counts[field] = field_counts.get(field, 0) + 1
-                
-                if field not in field_values:
-                    field_values[field] = {}
-                
-                value_str = str(value)
-                field_values[field][value_str] = field_values[field].get(value_str, 0) + 1
-            
-            # Count engine families
-            ef = specs.get('engine_family')
-            if ef:
-                engine_families[ef] = engine_families.get(ef, 0) + 1
-            
-            # Track confidence levels
-            for extraction in specs.get('extractions', []):
-                conf = extraction.get('confidence', 0)
-                if conf >= 0.9:
-                    confidence_levels['high'] += 1
-                elif conf >= 0.7:
-                    confidence_levels['medium'] += 1
-                else:
-                    confidence_levels['low'] += 1
-        
-        report_lines = [
+        acc = accumulator or BatchAccumulator.from_records(batch.records)
+        report_path = self.output_dir / f"analysis-{batch.batch_id}.txt"
+        return self._write_lines(report_path, self._extraction_analysis_lines(batch, acc))
+    
+    def _extraction_analysis_lines(self, batch: IngestionBatchReport,
+                                   acc: BatchAccumulator) -> Iterator[str]:
+        # Extraction statistics collected while processing
+        field_counts = acc.field_counts
+        field_values = acc.field_values
+        engine_families = acc.engine_families
+        confidence_levels = acc.confidence_levels
+        
+        yield from [
             "=" * 80,
             "EXTRACTION ANALYSIS REPORT",
             "=" * 80,
@@ -383,48 +974,74 @@ class ReportGenerator:
         
         for field, count in sorted(field_counts.items(), key=lambda x: -x[1]):
             pct = (count / batch.total_records * 100) if batch.total_records > 0 else 0
-            report_lines.append(f"  {field}: {count} ({pct:.1f}%)")
+            yield f"  {field}: {count} ({pct:.1f}%)"
         
         if engine_families:
-            report_lines.extend([
+            yield from [
                 f"",
                 "-" * 80,
                 "ENGINE FAMILIES DETECTED",
                 "-" * 80,
                 f""
-            ])
+            ]
             for family, count in sorted(engine_families.items(), key=lambda x: -x[1]):
-                report_lines.append(f"  {family}: {count}")
+                yield f"  {family}: {count}"
         
         # Top values for each field
-        report_lines.extend([
+        yield from [
             f"",
             "-" * 80,
             "TOP VALUES BY FIELD",
             "-" * 80,
             f""
-        ])
+        ]
+        
+        if not all(values.exact for values in field_values.values()):
+            yield (
+                f"  (~ marks approximate figures: top-value counts may be high by up to "
+                f"{acc.top_value_error:.2%} of a field's occurrences, distinct counts are "
+                f"estimated within ±{acc.distinct_count_error:.0%})"
+            )
+            yield ""
         
         for field, values in field_values.items():
-            report_lines.append(f"  {field}:")
-            top_values = sorted(values.items(), key=lambda x: -x[1])[:5]
-            for value, count in top_values:
-                report_lines.append(f"    {value}: {count}")
-            report_lines.append("")
+            distinct, exact = acc.distinct_values(field)
+            yield f"  {field}: ({'' if exact else '~'}{distinct} distinct)"
+            mark = '' if values.exact else '~'
+            for value, count in values.top(5):
+                yield f"    {value}: {mark}{count}"
+            yield ""
         
-        report_lines.extend([
+        # Numeric distributions per category
+        spec_stats = acc.spec_statistics()
+        if spec_stats:
+            yield from [
+                "-" * 80,
+                "NUMERIC SPEC DISTRIBUTIONS (by category)",
+                "-" * 80,
+                f""
+            ]
+            
+            for cat, stats in spec_stats.items():
+                yield f"  {cat}:"
+                for field, summary in stats.items():
+                    pct = summary['percentiles']
+                    yield (
+                        f"    {field}: n={summary['count']}  min={summary['min']:g}  "
+                        f"p25={pct['p25']:g}  median={pct['p50']:g}  p75={pct['p75']:g}  "
+                        f"p95={pct['p95']:g}  max={summary['max']:g}  mean={summary['mean']:g}"
+                    )
+                    hist = summary['histogram']
+                    if summary['count'] > 1 and summary['min'] != summary['max']:
+                        counts = ' '.join(str(c) for c in hist['counts'])
+                        yield f"      histogram [{hist['edges'][0]:g} .. {hist['edges'][-1]:g}]: {counts}"
+                yield ""
+        
+        yield from [
             "=" * 80,
             "END OF ANALYSIS",
             "=" * 80
-        ])
-        
-        report_content = '\n'.join(report_lines)
-        report_path = self.output_dir / f"analysis-{batch.batch_id}.txt"
-        
-        with open(report_path, 'w') as f:
-            f.write(report_content)
-        
-        return str(report_path)
+        ]
 
 
 class ConsoleReporter:
@@ -491,37 +1108,38 @@ class ConsoleReporter:
         print(self._color("=" * 60, 'cyan'))
         print()
     
-    def print_validation_issues(self, batch: IngestionBatchReport, max_items: int = 10):
+    def print_validation_issues(self, batch: IngestionBatchReport, max_items: int = 10,
+                                accumulator: Optional[BatchAccumulator] = None):
         """Print validation issues to console."""
+        if accumulator is None:
+            accumulator = BatchAccumulator(issue_sample_size=max_items)
+            for record in batch.records:
+                accumulator.add(record)
+        
         issues_found = False
         count = 0
         
-        for record in batch.records:
-            if record.status in ('needs_review', 'invalid') and count < max_items:
-                if not issues_found:
-                    print()
-                    print(self._color("VALIDATION ISSUES:", 'yellow'))
-                    print()
-                    issues_found = True
-                
-                name = record.normalized_data.get('name', {}).get('normalized', 'Unknown')
-                status_color = 'red' if record.status == 'invalid' else 'yellow'
-                
-                print(f"  {self._color('•', status_color)} {name}")
-                
-                for issue in record.validation_result.get('issues', []):
-                    severity = issue.get('severity', 'info')
-                    msg = issue.get('message', '')
-                    
-                    if severity == 'error':
-                        print(f"      {self._color('ERROR:', 'red')} {msg}")
-                    elif severity == 'warning':
-                        print(f"      {self._color('WARN:', 'yellow')} {msg}")
-                
-                count += 1
+        for item in accumulator.issue_samples[:max_items]:
+            if not issues_found:
+                print()
+                print(self._color("VALIDATION ISSUES:", 'yellow'))
+                print()
+                issues_found = True
+            
+            status_color = 'red' if item['status'] == 'invalid' else 'yellow'
+            
+            print(f"  {self._color('•', status_color)} {item['name']}")
+            
+            for severity, msg in item['issues']:
+                if severity == 'error':
+                    print(f"      {self._color('ERROR:', 'red')} {msg}")
+                elif severity == 'warning':
+                    print(f"      {self._color('WARN:', 'yellow')} {msg}")
+            
+            count += 1
         
         if count >= max_items:
-            remaining = sum(1 for r in batch.records if r.status in ('needs_review', 'invalid')) - count
+            remaining = accumulator.flagged_count - count
             if remaining > 0:
                 print(f"\n  ... and {remaining} more items with issues")
         
@@ -529,6 +1147,62 @@ class ConsoleReporter:
             print()
 
 
+def load_saved_batch(path: Path, records=None) -> Tuple[Dict[str, Any], IngestionBatchReport]:
+    """
+    Read a saved batch written by ReportGenerator.open_saved_batch().
+    
+    Args:
+        records: Empty RecordStore to read the records into (e.g. one with
+            a memory budget); a new in-memory store when None
+    
+    Returns:
+        (header, batch)
+    
+    Raises:
+        ValueError: If the file is incomplete or from an unknown format version
+    """
+    from record_store import RecordStore
+    
+    header = None
+    trailer = None
+    if records is None:
+        records = RecordStore()
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            entry = json.loads(line)
+            kind = entry.pop('type', None)
+            if kind == 'header':
+                header = entry
+            elif kind == 'record':
+                records.append(PartIngestionRecord.from_dict(entry))
+            elif kind == 'trailer':
+                trailer = entry
+    
+    if header is None or trailer is None:
+        raise ValueError(f"Saved batch is incomplete: {path}")
+    if header.get('format_version') != BATCH_FORMAT_VERSION:
+        raise ValueError(
+            f"Saved batch format version {header.get('format_version')} is not supported "
+            f"(expected {BATCH_FORMAT_VERSION}): {path}"
+        )
+    
+    statistics = trailer['statistics']
+    batch = IngestionBatchReport(
+        batch_id=header['batch_id'],
+        timestamp=header['timestamp'],
+        mode=header['mode'],
+        source_file=header['source_file'],
+        total_records=statistics['total'],
+        ready_count=statistics['ready'],
+        needs_review_count=statistics['needs_review'],
+        invalid_count=statistics['invalid'],
+        duplicate_count=statistics['duplicate'],
+        records=records,
+        summary=trailer['summary']
+    )
+    return header, batch
+
+
 def generate_batch_id() -> str:
     """Generate a unique batch ID."""
     import uuid
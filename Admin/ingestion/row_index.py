@@ -0,0 +1,146 @@
+"""
+Row Index for Go-Kart Part Data Ingestion
+
+Maps each input row of a batch to its byte range in the source file, so
+single rows can be re-read with a seek instead of parsing the whole file.
+The index is written next to the saved batch (batch-<id>.idx) and used
+by --reprocess to re-run only the rows reviewers fixed.
+
+CSV and TSV rows may span several lines (quoted newlines); the index
+follows the csv module's row boundaries and skips blank lines the same
+way csv.DictReader does. JSONL rows are single lines. JSON arrays have
+no row boundaries and are not indexed.
+
+The index remembers the file's size and modification time. If the file
+changed since, the index is rebuilt with a scan that only finds row
+boundaries, which is still far cheaper than reprocessing every row.
+"""
+
+import csv
+import io
+import json
+import os
+from array import array
+from pathlib import Path
+from typing import Dict, List
+
+
+INDEX_FORMAT_VERSION = 1
+
+INDEXABLE_FORMATS = ('csv', 'tsv', 'jsonl')
+
+
+class RowIndex:
+    """Byte ranges of the data rows of one input file."""
+    
+    def __init__(self, file_format: str, spans: array, header_end: int,
+                 file_size: int, mtime_ns: int):
+        """
+        Args:
+            file_format: 'csv', 'tsv' or 'jsonl'
+            spans: Start and end offset of every row, interleaved
+            header_end: End offset of the CSV/TSV header row (0 for JSONL)
+            file_size: Size of the indexed file
+            mtime_ns: Modification time of the indexed file
+        """
+        self.file_format = file_format
+        self.spans = spans
+        self.header_end = header_end
+        self.file_size = file_size
+        self.mtime_ns = mtime_ns
+    
+    def __len__(self) -> int:
+        return len(self.spans) // 2
+    
+    @classmethod
+    def build(cls, path: Path, file_format: str) -> 'RowIndex':
+        """Scan a file for row boundaries."""
+        if file_format not in INDEXABLE_FORMATS:
+            raise ValueError(f"Rows of {file_format} input can't be indexed")
+        
+        stat = os.stat(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+        
+        spans = array('Q')
+        header_end = 0
+        if file_format == 'jsonl':
+            pos = 0
+            for line in io.BytesIO(data):
+                if line.strip():
+                    spans.extend((pos, pos + len(line)))
+                pos += len(line)
+        else:
+            # Line end offsets, filled as the csv reader pulls lines
+            ends: List[int] = [0]
+            
+            def lines():
+                for line in io.BytesIO(data):
+                    ends.append(ends[-1] + len(line))
+                    yield line.decode('utf-8')
+            
+            reader = csv.reader(lines(), delimiter='\t' if file_format == 'tsv' else ',')
+            consumed = 0
+            for row in reader:
+                # The row spans the lines pulled since the previous row
+                if not header_end:
+                    header_end = ends[reader.line_num]
+                elif row:
+                    spans.extend((ends[consumed], ends[reader.line_num]))
+                consumed = reader.line_num
+        
+        return cls(file_format, spans, header_end, stat.st_size, stat.st_mtime_ns)
+    
+    def matches(self, path: Path) -> bool:
+        """Whether the file still looks like the one that was indexed."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return stat.st_size == self.file_size and stat.st_mtime_ns == self.mtime_ns
+    
+    def read_rows(self, path: Path, row_numbers: List[int]) -> Dict[int, str]:
+        """
+        Read single rows by seeking to their offsets.
+        
+        Args:
+            row_numbers: 1-based data row numbers
+        
+        Returns:
+            Map of row number -> parseable text (with the header row for
+            CSV/TSV), newlines normalized like text-mode reads
+        """
+        rows = {}
+        with open(path, 'rb') as f:
+            header = f.read(self.header_end)
+            for row_number in row_numbers:
+                start, end = self.spans[2 * (row_number - 1)], self.spans[2 * row_number - 1]
+                f.seek(start)
+                text = (header + f.read(end - start)).decode('utf-8')
+                rows[row_number] = text.replace('\r\n', '\n').replace('\r', '\n')
+        return rows
+    
+    def save(self, path: Path):
+        header = {
+            'format_version': INDEX_FORMAT_VERSION,
+            'file_format': self.file_format,
+            'rows': len(self),
+            'header_end': self.header_end,
+            'file_size': self.file_size,
+            'mtime_ns': self.mtime_ns
+        }
+        with open(path, 'wb') as f:
+            f.write(json.dumps(header).encode('utf-8') + b'\n')
+            self.spans.tofile(f)
+    
+    @classmethod
+    def load(cls, path: Path) -> 'RowIndex':
+        with open(path, 'rb') as f:
+            header = json.loads(f.readline())
+            if header.get('format_version') != INDEX_FORMAT_VERSION:
+                raise ValueError(f"Row index format version {header.get('format_version')} "
+                                 f"is not supported: {path}")
+            spans = array('Q')
+            spans.fromfile(f, 2 * header['rows'])
+        return cls(header['file_format'], spans, header['header_end'],
+                   header['file_size'], header['mtime_ns'])
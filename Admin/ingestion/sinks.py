@@ -0,0 +1,393 @@
+"""
+Report Sinks for Go-Kart Part Data Ingestion
+
+Each report is a sink that receives processed records as they leave the
+pipeline and renders its output once the batch is complete. Sinks run on
+a background writer thread fed through a bounded queue, so report I/O
+overlaps with record processing instead of following it.
+
+Available sinks:
+- json:     Full JSON/JSONL report, streamed record by record
+- dry-run:  Human-readable dry-run report (dry-run mode only)
+- review:   needs-review CSV, streamed as flagged records arrive
+- analysis: Extraction analysis
+- commit:   Commit summary (commit mode only)
+- db:       Indexed SQLite report store (needs a database path)
+- batch:    Saved batch for --commit-batch (dry-run mode only; not on by
+            default, as it writes a full copy of the batch and a row index)
+"""
+
+import csv
+import queue
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, TextIO
+
+from reporters import (
+    ReportGenerator, BatchAccumulator, IngestionBatchReport,
+    PartIngestionRecord, StreamingReportWriter
+)
+from report_store import ReportStore
+from row_index import RowIndex, INDEXABLE_FORMATS
+from stage_engine import Stage, IO_BOUND
+
+
+SINK_NAMES = ('json', 'dry-run', 'review', 'analysis', 'commit', 'db', 'batch')
+
+# Sinks written when none are selected
+DEFAULT_SINK_NAMES = tuple(name for name in SINK_NAMES if name != 'batch')
+
+
+class ReportSink(ABC):
+    """
+    Base class for report sinks.
+    
+    add() is called for every record in pipeline order; close() is called
+    once with the finished batch and returns the report path, or None if
+    the sink had nothing to write. abort() releases resources when the
+    batch fails part-way.
+    """
+    
+    label = 'Report'
+    
+    def add(self, record: PartIngestionRecord):
+        pass
+    
+    @abstractmethod
+    def close(self, batch: IngestionBatchReport, accumulator: BatchAccumulator,
+              context: Dict[str, Any]) -> Optional[str]:
+        ...
+    
+    def abort(self):
+        pass
+
+
+class JsonReportSink(ReportSink):
+    """Streams the JSON report as records arrive."""
+    
+    label = 'JSON Report'
+    
+    def __init__(self, generator: ReportGenerator, batch_id: str, timestamp: str,
+                 mode: str, source_file: Optional[str], fmt: str = 'json',
+                 compress: bool = False):
+        self.writer: StreamingReportWriter = generator.open_json_report(
+            batch_id, timestamp, mode, source_file, fmt=fmt, compress=compress
+        )
+    
+    def add(self, record: PartIngestionRecord):
+        self.writer.write_record(record)
+    
+    def close(self, batch, accumulator, context):
+        return self.writer.finish(batch.statistics(), batch.summary)
+    
+    def abort(self):
+        self.writer.close()
+
+
+class SavedBatchSink(ReportSink):
+    """
+    Streams the processed batch to a saved batch file for a later commit.
+    
+    For CSV, TSV and JSONL input the row index (see row_index.py) is built
+    on close, next to the saved batch.
+    """
+    
+    label = 'Saved Batch'
+    
+    def __init__(self, generator: ReportGenerator, batch_id: str, timestamp: str,
+                 mode: str, source_file: Optional[str], header: Dict[str, Any]):
+        self.writer: StreamingReportWriter = generator.open_saved_batch(
+            batch_id, timestamp, mode, source_file, header
+        )
+        self.source_file = source_file
+        self.file_format = header.get('file_format')
+        self.index_path = generator.row_index_path(batch_id)
+    
+    def add(self, record: PartIngestionRecord):
+        self.writer.write_record(record)
+    
+    def close(self, batch, accumulator, context):
+        path = self.writer.finish(batch.statistics(), batch.summary)
+        if self.file_format in INDEXABLE_FORMATS:
+            index = RowIndex.build(Path(self.source_file), self.file_format)
+            # A file edited mid-run would give offsets for other rows
+            if len(index) == batch.total_records:
+                index.save(self.index_path)
+        return path
+    
+    def abort(self):
+        self.writer.close()
+
+
+class DryRunReportSink(ReportSink):
+    """Dry-run text report, rendered from the batch aggregates."""
+    
+    label = 'Dry Run Report'
+    
+    def __init__(self, generator: ReportGenerator, review_csv: bool = True):
+        self.generator = generator
+        self.review_csv = review_csv
+    
+    def close(self, batch, accumulator, context):
+        return self.generator.generate_dry_run_report(batch, accumulator, self.review_csv)
+
+
+class NeedsReviewCsvSink(ReportSink):
+    """
+    needs-review CSV, written row by row as flagged records arrive.
+    
+    The file is only created once the first flagged record shows up, so a
+    clean batch produces no CSV.
+    """
+    
+    label = 'Needs Review CSV'
+    
+    def __init__(self, generator: ReportGenerator, batch_id: str):
+        self.generator = generator
+        self.path = generator.needs_review_path(batch_id)
+        self._file: Optional[TextIO] = None
+        self._writer = None
+    
+    def add(self, record: PartIngestionRecord):
+        if record.status not in ('needs_review', 'invalid'):
+            return
+        if self._file is None:
+            self._file = open(self.path, 'w', newline='')
+            self._writer = csv.writer(self._file, lineterminator='\n')
+            self._writer.writerow(ReportGenerator.NEEDS_REVIEW_HEADER)
+        entry = BatchAccumulator.review_entry(record)
+        self._writer.writerow(ReportGenerator.needs_review_row(entry))
+    
+    def close(self, batch, accumulator, context):
+        if self._file is None:
+            return None
+        self._file.close()
+        return str(self.path)
+    
+    def abort(self):
+        if self._file is not None:
+            self._file.close()
+
+
+class ExtractionAnalysisSink(ReportSink):
+    """Extraction analysis report."""
+    
+    label = 'Extraction Analysis'
+    
+    def __init__(self, generator: ReportGenerator):
+        self.generator = generator
+    
+    def close(self, batch, accumulator, context):
+        return self.generator.generate_extraction_analysis(batch, accumulator)
+
+
+class CommitSummarySink(ReportSink):
+    """Commit summary; needs 'commit_result' in the close context."""
+    
+    label = 'Commit Summary'
+    
+    def __init__(self, generator: ReportGenerator):
+        self.generator = generator
+    
+    def close(self, batch, accumulator, context):
+        commit_result = context.get('commit_result')
+        if commit_result is None:
+            return None
+        return self.generator.generate_commit_summary(
+            batch, commit_result.committed_ids, commit_result.to_dict()
+        )
+
+
+class ReportStoreSink(ReportSink):
+    """
+    Writes the batch into a ReportStore database.
+    
+    Records are buffered and written in chunks, each chunk in a single
+    transaction. The connection is opened on first use so that it belongs
+    to the writer thread.
+    """
+    
+    label = 'Report Database'
+    
+    def __init__(self, path: Path, batch_id: str, timestamp: str, mode: str,
+                 source_file: Optional[str], chunk_size: int = 1000,
+                 retention_days: Optional[float] = None):
+        self.path = path
+        self.batch_id = batch_id
+        self.batch_info = (batch_id, timestamp, mode, source_file)
+        self.chunk_size = chunk_size
+        self.retention_days = retention_days
+        self._store: Optional[ReportStore] = None
+        self._pending: List[PartIngestionRecord] = []
+    
+    def _open(self) -> ReportStore:
+        if self._store is None:
+            self._store = ReportStore(self.path)
+            self._store.begin_batch(*self.batch_info)
+        return self._store
+    
+    def _flush(self):
+        if self._pending:
+            self._open().add_records(self.batch_id, self._pending)
+            self._pending = []
+    
+    def add(self, record: PartIngestionRecord):
+        self._pending.append(record)
+        if len(self._pending) >= self.chunk_size:
+            self._flush()
+    
+    def close(self, batch, accumulator, context):
+        store = self._open()
+        try:
+            self._flush()
+            store.finish_batch(batch)
+            if self.retention_days is not None:
+                store.prune(keep_days=self.retention_days)
+        finally:
+            store.close()
+        return str(self.path)
+    
+    def abort(self):
+        if self._store is not None:
+            self._store.close()
+
+
+class ReportSinkWriter(Stage):
+    """
+    Runs report sinks on a background thread.
+    
+    Records are handed over through a bounded queue, so a slow disk applies
+    backpressure instead of buffering the whole batch. The writer thread
+    also maintains the BatchAccumulator; it is complete once flush()
+    returns. As a pipeline stage (see stage_engine.py) it passes records
+    on unchanged.
+    
+    Usage:
+        writer = ReportSinkWriter(sinks)
+        for record in records:
+            writer.submit(record)
+        writer.flush()
+        ...build batch from writer.accumulator...
+        paths = writer.close(batch)
+    """
+    
+    name = 'report'
+    kind = IO_BOUND
+    owns_thread = True
+    
+    _RECORD = 'record'
+    _CLOSE = 'close'
+    _ABORT = 'abort'
+    
+    def __init__(self, sinks: List[ReportSink],
+                 accumulator: Optional[BatchAccumulator] = None,
+                 queue_size: int = 1024):
+        self.sinks = sinks
+        self.accumulator = accumulator if accumulator is not None else BatchAccumulator()
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._error: Optional[BaseException] = None
+        self._paths: List[Tuple[str, str]] = []
+        self._thread = threading.Thread(target=self._run, name='report-writer', daemon=True)
+        self._thread.start()
+    
+    def submit(self, record: PartIngestionRecord):
+        """Queue a record for the sinks; blocks while the queue is full."""
+        self._raise_error()
+        self._queue.put((self._RECORD, record))
+    
+    def process(self, record: PartIngestionRecord) -> PartIngestionRecord:
+        self.submit(record)
+        return record
+    
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+    
+    def flush(self):
+        """Wait until every submitted record has reached the sinks."""
+        self._queue.join()
+        self._raise_error()
+    
+    def close(self, batch: IngestionBatchReport, **context) -> List[Tuple[str, str]]:
+        """
+        Finish every sink and stop the writer thread.
+        
+        Args:
+            batch: The completed batch
+            **context: Extra values for sinks (e.g. commit_result)
+        
+        Returns:
+            List of (label, path) for the reports that were written
+        """
+        self._queue.put((self._CLOSE, (batch, context)))
+        self._thread.join()
+        self._raise_error()
+        return self._paths
+    
+    def abort(self):
+        """Stop the writer thread and release sink resources."""
+        if self._thread.is_alive():
+            self._queue.put((self._ABORT, None))
+            self._thread.join()
+    
+    def _raise_error(self):
+        if self._error is not None:
+            raise RuntimeError(f"Report writer failed: {self._error}") from self._error
+    
+    def _run(self):
+        while True:
+            kind, payload = self._queue.get()
+            try:
+                if kind == self._RECORD:
+                    # After a failure keep draining so producers never block
+                    if self._error is None:
+                        self.accumulator.add(payload)
+                        for sink in self.sinks:
+                            sink.add(payload)
+                elif kind == self._CLOSE:
+                    if self._error is None:
+                        batch, context = payload
+                        for sink in self.sinks:
+                            path = sink.close(batch, self.accumulator, context)
+                            if path:
+                                self._paths.append((sink.label, path))
+                    else:
+                        self._abort_sinks()
+                    return
+                else:
+                    self._abort_sinks()
+                    return
+            except BaseException as e:
+                self._error = e
+                if kind != self._RECORD:
+                    self._abort_sinks()
+                    return
+            finally:
+                self._queue.task_done()
+    
+    def _abort_sinks(self):
+        for sink in self.sinks:
+            try:
+                sink.abort()
+            except Exception:
+                pass
+
+
+def parse_sink_names(value: str) -> List[str]:
+    """
+    Parse a comma-separated sink list for the --reports flag.
+    
+    'all' selects every sink; 'none' selects none.
+    """
+    names = [n.strip() for n in value.split(',') if n.strip()]
+    if names == ['all']:
+        return list(SINK_NAMES)
+    if names == ['none']:
+        return []
+    unknown = [n for n in names if n not in SINK_NAMES]
+    if unknown:
+        raise ValueError(
+            f"Unknown report sink(s): {', '.join(unknown)} "
+            f"(choose from {', '.join(SINK_NAMES)}, all, none)"
+        )
+    return names
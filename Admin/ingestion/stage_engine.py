@@ -0,0 +1,306 @@
+"""
+Stage Engine for Go-Kart Part Data Ingestion
+
+Runs the per-record pipeline as a chain of stages. Each stage declares
+whether it is CPU- or I/O-bound, and the engine picks its executor:
+
+- Serial (workers=0): every stage runs in the calling thread, one record
+  after the other; this is how the agent has always processed records
+- CPU-bound stages: chunks of records go to a process pool; results
+  come back in input order
+- Stateful CPU-bound stages (duplicate detection, which depends on the
+  records accepted before): the thread consuming the previous stage
+- I/O-bound stages: a thread of their own, or their own writer thread
+  for stages that bring one (report sinks, commit)
+
+With workers, the source is read on a reader thread and every thread
+hands records on through a bounded queue, so a slow stage applies
+backpressure instead of letting records pile up. The engine records per
+stage how many items it processed, how long it was busy and how deep its
+input queue got.
+
+Usage:
+    engine = StageEngine([PrepareStage(agent), DedupeStage(agent)], workers=4)
+    for record in engine.run(records):
+        ...
+    print(engine.stats())
+"""
+
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Dict, Any, List, Iterable, Iterator, Tuple
+
+
+CPU_BOUND = 'cpu'
+IO_BOUND = 'io'
+
+
+class Stage(ABC):
+    """
+    One step of the per-record pipeline.
+    
+    Subclasses set `name` and `kind` and implement process(). CPU-bound
+    stages must be picklable and must not depend on earlier records
+    unless they set `stateful`, which keeps them in this process.
+    """
+    
+    name = 'stage'
+    kind = CPU_BOUND
+    
+    # Depends on state built up from earlier records (never leaves the process)
+    stateful = False
+    
+    # Has a writer thread of its own; process() only hands items to it, so
+    # its busy time is hand-off time and its queue depth shows whether the
+    # writer keeps up
+    owns_thread = False
+    
+    @abstractmethod
+    def process(self, item: Any) -> Any:
+        """Transform one item; the result is passed to the next stage."""
+    
+    def queue_depth(self) -> int:
+        """Items waiting on the stage's own writer thread (owns_thread only)."""
+        return 0
+
+
+class StageStats:
+    """Items, busy time and input queue depth of one stage."""
+    
+    def __init__(self, executor: str):
+        self.executor = executor
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.queue_max = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+    
+    def sample_queue(self, depth: int):
+        self.queue_max = max(self.queue_max, depth)
+        self._depth_total += depth
+        self._depth_samples += 1
+    
+    def to_dict(self, wall_seconds: float) -> Dict[str, Any]:
+        return {
+            'executor': self.executor,
+            'items': self.items,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'items_per_sec': round(self.items / self.busy_seconds, 1) if self.busy_seconds else None,
+            'utilization': round(min(self.busy_seconds / wall_seconds, 1.0), 3) if wall_seconds else 0.0,
+            'queue_max': self.queue_max,
+            'queue_avg': round(self._depth_total / self._depth_samples, 1) if self._depth_samples else 0.0
+        }
+
+
+class StageEngine:
+    """Runs items through a chain of stages (see module docstring)."""
+    
+    def __init__(self, stages: List[Stage], workers: int = 0,
+                 queue_size: int = 256, chunk_size: int = 32):
+        """
+        Args:
+            stages: Stages in pipeline order
+            workers: Worker processes for CPU-bound stages; 0 runs every
+                stage serially in the calling thread
+            queue_size: Maximum items waiting between two threads
+            chunk_size: Items per task sent to a worker process
+        """
+        self.stages = stages
+        self.workers = workers
+        self.queue_size = queue_size
+        self.chunk_size = chunk_size
+        self._stats: Dict[str, StageStats] = {}
+        self._wall_seconds = 0.0
+    
+    def executor(self, stage: Stage) -> str:
+        """Where a stage runs: 'inline', 'process', 'thread' or 'writer-thread'."""
+        if stage.owns_thread:
+            return 'writer-thread'
+        if self.workers <= 0:
+            return 'inline'
+        if stage.kind == CPU_BOUND:
+            return 'inline' if stage.stateful else 'process'
+        return 'thread'
+    
+    def run(self, source: Iterable[Any]) -> Iterator[Any]:
+        """
+        Run every item of source through the stages.
+        
+        Yields:
+            Output of the last stage, in source order
+        """
+        self._stats = {'parse': StageStats('inline' if self.workers <= 0 else 'thread')}
+        stop = threading.Event()
+        threads: List[threading.Thread] = []
+        pool = None
+        started = time.perf_counter()
+        
+        try:
+            items = self._timed(source, self._stats['parse'])
+            if self.workers > 0:
+                items = self._threaded(items, 'reader', stop, threads)
+            
+            for stage in self.stages:
+                stats = self._stats[stage.name] = StageStats(self.executor(stage))
+                if isinstance(items, _QueueIterator):
+                    items.stats = stats
+                if stats.executor == 'process':
+                    if pool is None:
+                        pool = ProcessPoolExecutor(
+                            max_workers=self.workers, initializer=_init_worker,
+                            initargs=([s for s in self.stages if self.executor(s) == 'process'],)
+                        )
+                    items = self._threaded(
+                        self._in_processes(stage, items, pool, stats), stage.name, stop, threads
+                    )
+                elif stats.executor == 'thread':
+                    items = self._threaded(self._mapped(stage, items, stats), stage.name, stop, threads)
+                else:
+                    items = self._mapped(stage, items, stats)
+            
+            yield from items
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            if pool is not None:
+                pool.shutdown(wait=True)
+            self._wall_seconds = time.perf_counter() - started
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage items, busy time, throughput and queue depth of the last run."""
+        return {name: stats.to_dict(self._wall_seconds) for name, stats in self._stats.items()}
+    
+    @staticmethod
+    def _timed(items: Iterable[Any], stats: StageStats) -> Iterator[Any]:
+        iterator = iter(items)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            stats.busy_seconds += time.perf_counter() - start
+            stats.items += 1
+            yield item
+    
+    @staticmethod
+    def _mapped(stage: Stage, items: Iterable[Any], stats: StageStats) -> Iterator[Any]:
+        for item in items:
+            if stage.owns_thread:
+                stats.sample_queue(stage.queue_depth())
+            start = time.perf_counter()
+            result = stage.process(item)
+            stats.busy_seconds += time.perf_counter() - start
+            stats.items += 1
+            yield result
+    
+    def _in_processes(self, stage: Stage, items: Iterable[Any], pool: ProcessPoolExecutor,
+                      stats: StageStats) -> Iterator[Any]:
+        # Keep two chunks queued per worker, no more
+        pending = deque()
+        for chunk in _chunked(items, self.chunk_size):
+            pending.append(pool.submit(_run_chunk, stage.name, chunk))
+            if len(pending) >= 2 * self.workers:
+                yield from self._collect(pending.popleft(), stats)
+        while pending:
+            yield from self._collect(pending.popleft(), stats)
+    
+    @staticmethod
+    def _collect(future, stats: StageStats) -> List[Any]:
+        results, seconds = future.result()
+        stats.busy_seconds += seconds
+        stats.items += len(results)
+        return results
+    
+    def _threaded(self, items: Iterable[Any], name: str, stop: threading.Event,
+                  threads: List[threading.Thread]) -> '_QueueIterator':
+        """Drive items on a thread of its own and hand them on through a bounded queue."""
+        channel = _QueueIterator(self.queue_size, stop)
+        thread = threading.Thread(target=channel.fill, args=(items,), name=f'stage-{name}',
+                                  daemon=True)
+        threads.append(thread)
+        thread.start()
+        return channel
+
+
+class _QueueIterator:
+    """Bounded queue between a producer thread and the next stage."""
+    
+    _END = object()
+    
+    def __init__(self, size: int, stop: threading.Event):
+        self.queue: queue.Queue = queue.Queue(maxsize=size)
+        self.stop = stop
+        self.stats: Optional[StageStats] = None
+    
+    def fill(self, items: Iterable[Any]):
+        try:
+            for item in items:
+                if not self._put(item):
+                    return
+            self._put(self._END)
+        except BaseException as e:
+            self._put(_Failure(e))
+    
+    def _put(self, item: Any) -> bool:
+        # Blocks while the queue is full, unless the run was stopped
+        while not self.stop.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            if self.stats is not None:
+                self.stats.sample_queue(self.queue.qsize())
+            try:
+                item = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                if self.stop.is_set():
+                    return
+                continue
+            if item is self._END:
+                return
+            if isinstance(item, _Failure):
+                raise RuntimeError(f"Pipeline stage failed: {item.error}") from item.error
+            yield item
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+# Stages of this worker process, by name
+_worker_stages: Dict[str, Stage] = {}
+
+
+def _init_worker(stages: List[Stage]):
+    _worker_stages.update((stage.name, stage) for stage in stages)
+
+
+def _run_chunk(name: str, chunk: List[Any]) -> Tuple[List[Any], float]:
+    """Run a chunk through a stage in a worker process."""
+    stage = _worker_stages[name]
+    start = time.perf_counter()
+    results = [stage.process(item) for item in chunk]
+    return results, time.perf_counter() - start
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,170 @@
+"""
+Stage Store for Go-Kart Part Data Ingestion
+
+Materializes the output of each pipeline stage so a re-run only
+recomputes the stages whose inputs or config changed. Stage outputs are
+keyed by the hash of the input file and a fingerprint of the config the
+stage depends on:
+
+- parse:    the input format
+- prepare:  brand-aliases.json, extraction-patterns.json and the list of
+            categories in category-specs.json (normalize, category, extract)
+- validate: the prepare fingerprint plus the category-specs.json content
+
+Editing the validation rules in category-specs.json therefore only
+invalidates the validate stage; --revalidate re-runs a stored batch from
+its materialized parse and prepare outputs. Duplicate and outlier checks
+and the reports always run.
+
+Usage:
+    python ingest.py --file parts.csv --materialize
+    python ingest.py --revalidate 20260116-103741-8c1f4074
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+
+CONFIG_DIR = Path(__file__).parent / "config"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    batch_id TEXT PRIMARY KEY,
+    input_hash TEXT NOT NULL,
+    file_format TEXT NOT NULL,
+    source_file TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stages (
+    input_hash TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (input_hash, stage)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS stage_rows (
+    input_hash TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    row_no INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (input_hash, stage, row_no)
+) WITHOUT ROWID;
+"""
+
+
+class StageStore:
+    """
+    Materialized stage outputs, one version per input and stage.
+    
+    Saving a stage with a new fingerprint replaces the previous output, so
+    the store holds at most one copy of each stage per input file.
+    """
+    
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Database file (created, with its directory, if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+    
+    def close(self):
+        self.conn.close()
+    
+    def load(self, input_hash: str, stage: str, fingerprint: str) -> Optional[List[Any]]:
+        """Rows of a materialized stage, or None if missing or stale."""
+        row = self.conn.execute(
+            "SELECT fingerprint, rows FROM stages WHERE input_hash = ? AND stage = ?",
+            (input_hash, stage)
+        ).fetchone()
+        if row is None or row[0] != fingerprint:
+            return None
+        
+        rows = [
+            json.loads(data)
+            for (data,) in self.conn.execute(
+                "SELECT data FROM stage_rows WHERE input_hash = ? AND stage = ? ORDER BY row_no",
+                (input_hash, stage)
+            )
+        ]
+        return rows if len(rows) == row[1] else None
+    
+    def save(self, input_hash: str, stage: str, fingerprint: str, rows: List[Any]):
+        """Replace a stage's output in one transaction."""
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM stage_rows WHERE input_hash = ? AND stage = ?", (input_hash, stage)
+            )
+            self.conn.executemany(
+                "INSERT INTO stage_rows (input_hash, stage, row_no, data) VALUES (?, ?, ?, ?)",
+                (
+                    (input_hash, stage, row_no, json.dumps(data, default=str))
+                    for row_no, data in enumerate(rows)
+                )
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO stages (input_hash, stage, fingerprint, rows, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (input_hash, stage, fingerprint, len(rows), time.time())
+            )
+    
+    def record_batch(self, batch_id: str, input_hash: str, file_format: str,
+                     source_file: Optional[str]):
+        """Remember which input a batch was produced from."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO batches (batch_id, input_hash, file_format, source_file, "
+                "created_at) VALUES (?, ?, ?, ?, ?)",
+                (batch_id, input_hash, file_format, source_file, time.time())
+            )
+    
+    def batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Input hash, format and source file of a recorded batch."""
+        row = self.conn.execute(
+            "SELECT input_hash, file_format, source_file FROM batches WHERE batch_id = ?",
+            (batch_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'input_hash': row[0], 'file_format': row[1], 'source_file': row[2]}
+
+
+def config_fingerprint(names: Optional[List[str]] = None,
+                       config_dir: Path = CONFIG_DIR) -> str:
+    """
+    Hash of the config files that processing results depend on.
+    
+    Args:
+        names: Config file names (default: every JSON file in config_dir)
+        config_dir: Directory holding the config files
+    """
+    if names is None:
+        names = sorted(p.name for p in config_dir.glob('*.json'))
+    digest = hashlib.sha256()
+    for name in names:
+        digest.update(name.encode('utf-8'))
+        digest.update((config_dir / name).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def fingerprint(*parts: Any) -> str:
+    """Short hash combining fingerprints and other config values."""
+    content = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+
+
+def input_hash(content: str, file_format: str) -> str:
+    """Hash identifying an input file's content."""
+    digest = hashlib.sha256(file_format.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(content.encode('utf-8'))
+    return digest.hexdigest()
@@ -0,0 +1,100 @@
+"""
+Tests for commit_backends: idempotent re-runs against a SQLite parts table.
+
+Run from Admin/ingestion:
+    python -m unittest discover tests
+"""
+
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from commit_backends import BulkCommitter, SQLiteCommitBackend, PARTS_SCHEMA
+from reporters import PartIngestionRecord
+
+
+def ready_record(name: str, brand: str, sku: str) -> PartIngestionRecord:
+    slug = name.lower().replace(' ', '-')
+    return PartIngestionRecord(
+        original_data={'name': name, 'brand': brand, 'sku': sku},
+        normalized_data={
+            'name': {'normalized': name, 'slug': slug},
+            'brand': {'canonical': brand, 'slug': brand.lower()},
+            'category': {'slug': 'carburetors/complete-carburetors'},
+            'sku': sku,
+            'price': '89.99'
+        },
+        extracted_specs={'metadata': {'bore_mm': 26}},
+        validation_result={'is_valid': True, 'issues': []},
+        status='ready',
+        review_reasons=[]
+    )
+
+
+class SQLiteRerunTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'parts.sqlite'
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def commit(self, records):
+        committer = BulkCommitter(SQLiteCommitBackend(self.path), batch_size=10)
+        try:
+            return committer.commit(records, 'batch', '2026-01-01T00:00:00')
+        finally:
+            committer.close()
+    
+    def slugs_and_skus(self):
+        conn = sqlite3.connect(str(self.path))
+        try:
+            return sorted(conn.execute("SELECT slug, sku FROM parts"))
+        finally:
+            conn.close()
+    
+    def test_rerun_writes_nothing(self):
+        records = [ready_record('Mikuni VM22 Carburetor', 'Mikuni', 'MIK-VM22'),
+                   ready_record('PWK 28mm Carburetor', 'Keihin', 'PWK28')]
+        self.commit(records)
+        result = self.commit(records)
+        self.assertEqual((result.inserted, result.updated, result.unchanged), (0, 0, 2))
+        self.assertEqual(result.failed_rows, [])
+    
+    def test_rerun_after_sku_correction(self):
+        self.commit([ready_record('Mikuni VM22 Carburetor', 'Mikuni', 'MIK-VM22'),
+                     ready_record('PWK 28mm Carburetor', 'Keihin', 'PWK28')])
+        
+        # Same name slug, new part ID: must not roll back the chunk
+        result = self.commit([ready_record('Mikuni VM22 Carburetor', 'Mikuni', 'MIK-VM22-V2'),
+                              ready_record('PWK 28mm Carburetor', 'Keihin', 'PWK28')])
+        self.assertEqual(result.failed_rows, [])
+        self.assertEqual((result.inserted, result.unchanged), (1, 1))
+        self.assertEqual(len(self.slugs_and_skus()), 3)
+    
+    def test_same_name_from_two_brands(self):
+        result = self.commit([ready_record('Racing Carburetor', 'Mikuni', 'MIK-1'),
+                              ready_record('Racing Carburetor', 'Keihin', 'KEI-1')])
+        self.assertEqual(result.failed_rows, [])
+        self.assertEqual(result.inserted, 2)
+    
+    def test_unique_slug_table_is_migrated(self):
+        conn = sqlite3.connect(str(self.path))
+        conn.executescript(
+            PARTS_SCHEMA.replace('slug TEXT NOT NULL,', 'slug TEXT NOT NULL UNIQUE,')
+        )
+        conn.close()
+        
+        self.commit([ready_record('Mikuni VM22 Carburetor', 'Mikuni', 'MIK-VM22')])
+        result = self.commit([ready_record('Mikuni VM22 Carburetor', 'Mikuni', 'MIK-VM22-V2')])
+        self.assertEqual(result.failed_rows, [])
+        self.assertEqual(len(self.slugs_and_skus()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
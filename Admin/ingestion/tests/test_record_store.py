@@ -0,0 +1,73 @@
+"""
+Tests for record_store: records read back from a RecordStore equal the
+ones appended, in memory and spilled to disk.
+
+Run from Admin/ingestion:
+    python -m unittest discover tests
+"""
+
+import datetime
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from record_store import RecordStore
+from reporters import PartIngestionRecord
+
+
+def part_record(name: str, sku: str, **extra) -> PartIngestionRecord:
+    original = dict({'name': name, 'brand': 'Mikuni', 'sku': sku, 'price': '89.99'}, **extra)
+    return PartIngestionRecord(
+        original_data=original,
+        normalized_data={
+            'name': {'original': name, 'normalized': name, 'slug': name.lower().replace(' ', '-')},
+            'brand': {'canonical': 'Mikuni', 'slug': 'mikuni'},
+            'category': {'slug': 'carburetors/complete-carburetors'},
+            'sku': sku,
+            'price': '89.99'
+        },
+        extracted_specs={'metadata': {'bore_mm': 22}},
+        validation_result={'is_valid': True, 'issues': [], 'validated_metadata': {'bore_mm': 22}},
+        status='ready',
+        row_number=1,
+        source_file='feed.csv'
+    )
+
+
+class RecordStoreRoundTripTest(unittest.TestCase):
+    
+    def round_trip(self, records, **store_args):
+        store = RecordStore(**store_args)
+        try:
+            store.extend(records)
+            return [
+                (view.original_data, view.normalized_data, view.extracted_specs,
+                 view.validation_result, view.status, view.row_number)
+                for view in store
+            ]
+        finally:
+            store.close()
+    
+    def test_round_trip(self):
+        records = [part_record('Mikuni VM22 Carburetor', 'MIK-VM22'),
+                   part_record('PWK 28mm Carburetor', 'PWK28')]
+        expected = [(r.original_data, r.normalized_data, r.extracted_specs,
+                     r.validation_result, r.status, r.row_number) for r in records]
+        self.assertEqual(self.round_trip(records), expected)
+        self.assertEqual(self.round_trip(records, memory_budget=1), expected)
+    
+    def test_non_json_value(self):
+        record = part_record('Mikuni VM22 Carburetor', 'MIK-VM22', added=datetime.date(2026, 1, 1))
+        for store_args in ({}, {'memory_budget': 1}):
+            original, normalized = self.round_trip([record], **store_args)[0][:2]
+            self.assertEqual(original['added'], '2026-01-01')
+            self.assertEqual(normalized['name']['normalized'], 'Mikuni VM22 Carburetor')
+            self.assertEqual(normalized['name']['original'], 'Mikuni VM22 Carburetor')
+            self.assertEqual(normalized['sku'], 'MIK-VM22')
+            self.assertEqual(normalized['price'], '89.99')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,11 +9,28 @@ Validates extracted/normalized data against category-specs.json:
 - Cross-field consistency checks
 """
 
+import hashlib
 import json
+import math
+import re
+import statistics
+import time
+import zlib
+from array import array
+from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Iterable, Iterator, Callable
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
+
+from stage_engine import _chunked
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; numeric columns fall back to array.array
+    np = None
 
 
 class ValidationSeverity(Enum):
@@ -75,22 +92,105 @@ class ValidationResult:
                 }
                 for i in self.issues
             ],
-            'validated_metadata': self.validated_metadata
+            'validated_metadata': dict(self.validated_metadata)
+        }
+
+
+class ValidationCache:
+    """
+    LRU cache of category validation results.
+    
+    Entries are keyed by category plus a hash of the metadata and are only
+    valid for one category-specs fingerprint; seeing a different
+    fingerprint empties the cache. Cached results are frozen (issues tuple,
+    read-only metadata) because they are shared between records.
+    """
+    
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.fingerprint: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple[str, bytes], ValidationResult]' = OrderedDict()
+    
+    @staticmethod
+    def key(category_slug: str, metadata: Dict[str, Any]) -> Tuple[str, bytes]:
+        """
+        Cache key for a (category, metadata) pair.
+        
+        Field order is part of the key because it decides issue order; values
+        keep their JSON types, so 212, 212.0 and "212" stay distinct.
+        """
+        canonical = json.dumps(metadata, separators=(',', ':'), default=repr)
+        return category_slug, hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).digest()
+    
+    def get(self, fingerprint: str, key: Tuple[str, bytes]) -> Optional[ValidationResult]:
+        if fingerprint != self.fingerprint:
+            self.clear()
+            self.fingerprint = fingerprint
+        
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+    
+    def put(self, key: Tuple[str, bytes], result: ValidationResult) -> ValidationResult:
+        """Store a frozen copy of result and return it."""
+        frozen = ValidationResult(
+            is_valid=result.is_valid,
+            issues=tuple(result.issues),
+            needs_review=result.needs_review,
+            validated_metadata=MappingProxyType(dict(result.validated_metadata))
+        )
+        self._entries[key] = frozen
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return frozen
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._entries),
+            'specs_fingerprint': self.fingerprint
         }
 
 
 class CategoryValidator:
     """Validates part data against category specifications."""
     
-    def __init__(self, config_path: Optional[Path] = None):
+    def __init__(self, config_path: Optional[Path] = None,
+                 cache: Optional[ValidationCache] = None):
+        """
+        Args:
+            config_path: category-specs.json to validate against
+            cache: Optional result cache shared across validate() calls
+        """
         if config_path is None:
             config_path = Path(__file__).parent / "config" / "category-specs.json"
         
-        with open(config_path, 'r') as f:
-            self.config = json.load(f)
+        with open(config_path, 'rb') as f:
+            raw = f.read()
+        self.config = json.loads(raw)
         
         self.categories = self.config.get('categories', {})
         self.validation_rules = self.config.get('validation_rules', {})
+        
+        # Version plus content hash, so edits without a version bump also
+        # invalidate cached results
+        self.specs_fingerprint = (
+            f"{self.config.get('version', 'unversioned')}:"
+            f"{hashlib.sha256(raw).hexdigest()[:12]}"
+        )
+        self.cache = cache
     
     def validate(self, category_slug: str, metadata: Dict[str, Any]) -> ValidationResult:
         """
@@ -101,8 +201,20 @@ class CategoryValidator:
             metadata: The metadata dictionary to validate
         
         Returns:
-            ValidationResult with issues and validation status
+            ValidationResult with issues and validation status (shared and
+            read-only when served from the cache)
         """
+        if self.cache is None:
+            return self._validate(category_slug, metadata)
+        
+        key = self.cache.key(category_slug, metadata)
+        result = self.cache.get(self.specs_fingerprint, key)
+        if result is None:
+            result = self.cache.put(key, self._validate(category_slug, metadata))
+        return result
+    
+    def _validate(self, category_slug: str, metadata: Dict[str, Any]) -> ValidationResult:
+        """Validate without consulting the cache."""
         result = ValidationResult(is_valid=True)
         result.validated_metadata = metadata.copy()
         
@@ -200,17 +312,22 @@ class CategoryValidator:
         # Check for uncommon values
         common_values = spec.get('common_values', [])
         if common_values and value not in common_values:
-            issues.append(ValidationIssue(
-                field=field_name,
-                message=f"Uncommon value for '{field_name}'",
-                severity=ValidationSeverity.INFO,
-                current_value=value,
-                expected=f"Common values: {common_values}",
-                suggestion="Verify this is correct"
-            ))
+            issues.append(self._uncommon_value_issue(field_name, value, common_values))
         
         return issues
     
+    def _uncommon_value_issue(self, field_name: str, value: Any,
+                              common_values: List[Any]) -> ValidationIssue:
+        """Build the informational issue for a value outside common_values."""
+        return ValidationIssue(
+            field=field_name,
+            message=f"Uncommon value for '{field_name}'",
+            severity=ValidationSeverity.INFO,
+            current_value=value,
+            expected=f"Common values: {common_values}",
+            suggestion="Verify this is correct"
+        )
+    
     def _validate_type(self, field_name: str, value: Any, 
                        expected_type: str) -> Optional[ValidationIssue]:
         """Validate that a value matches the expected type."""
@@ -286,8 +403,6 @@ class CategoryValidator:
     def _validate_pattern(self, field_name: str, value: str,
                           spec: Dict[str, Any]) -> Optional[ValidationIssue]:
         """Validate that a string matches the expected pattern."""
-        import re
-        
         pattern = spec.get('pattern')
         if not pattern:
             return None
@@ -306,6 +421,176 @@ class CategoryValidator:
         
         return None
     
+    def validate_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> Dict[int, ValidationResult]:
+        """
+        Validate many (category_slug, metadata) pairs column by column.
+        
+        Items are grouped by category and every spec field is laid out as a
+        column, so type, range, enum, pattern and common-value checks run once
+        per column instead of once per value. Numeric columns use NumPy when
+        installed and array.array otherwise.
+        
+        Args:
+            items: List of (category_slug, metadata) tuples
+        
+        Returns:
+            Mapping of item index to ValidationResult, only for items that
+            have issues. Items missing from the mapping are valid, have no
+            issues and their validated_metadata is a copy of their metadata.
+        """
+        results: Dict[int, ValidationResult] = {}
+        by_category: Dict[str, List[int]] = {}
+        
+        # With a cache, only the first row of each uncached key is validated
+        keys: Dict[int, Tuple[str, bytes]] = {}
+        repeats: Dict[Tuple[str, bytes], List[int]] = {}
+        
+        for i, (category_slug, metadata) in enumerate(items):
+            if self.cache is not None:
+                key = self.cache.key(category_slug, metadata)
+                if key in repeats:
+                    self.cache.hits += 1
+                    repeats[key].append(i)
+                    continue
+                cached = self.cache.get(self.specs_fingerprint, key)
+                if cached is not None:
+                    if cached.issues:
+                        results[i] = cached
+                    continue
+                keys[i] = key
+                repeats[key] = [i]
+            
+            if category_slug not in self.categories:
+                results[i] = self._validate(category_slug, metadata)
+            else:
+                by_category.setdefault(category_slug, []).append(i)
+        
+        # Per row: issues for missing required fields, then issues per field
+        required_issues: Dict[int, List[ValidationIssue]] = {}
+        field_issues: Dict[int, Dict[str, List[ValidationIssue]]] = {}
+        
+        def emit(row: int, issue: ValidationIssue):
+            field_issues.setdefault(row, {}).setdefault(issue.field, []).append(issue)
+        
+        for category_slug, rows in by_category.items():
+            category_spec = self.categories[category_slug]
+            required_fields = category_spec.get('required', [])
+            optional_fields = category_spec.get('optional', [])
+            specs = category_spec.get('specs', {})
+            all_valid_fields = set(required_fields) | set(optional_fields)
+            
+            # Lay out the category's records as one column per spec field
+            columns: Dict[str, Tuple[List[int], List[Any]]] = {}
+            for row in rows:
+                metadata = items[row][1]
+                
+                for field_name in required_fields:
+                    if metadata.get(field_name) is None:
+                        required_issues.setdefault(row, []).append(ValidationIssue(
+                            field=field_name,
+                            message=f"Required field '{field_name}' is missing",
+                            severity=ValidationSeverity.ERROR,
+                            expected=f"Value of type {specs.get(field_name, {}).get('type', 'unknown')}"
+                        ))
+                
+                for field_name, value in metadata.items():
+                    if value is None:
+                        continue
+                    if field_name not in all_valid_fields:
+                        emit(row, ValidationIssue(
+                            field=field_name,
+                            message=f"Unrecognized field '{field_name}' for category '{category_slug}'",
+                            severity=ValidationSeverity.WARNING,
+                            current_value=value
+                        ))
+                        continue
+                    if not specs.get(field_name):
+                        continue
+                    column = columns.setdefault(field_name, ([], []))
+                    column[0].append(row)
+                    column[1].append(value)
+            
+            for field_name, (column_rows, values) in columns.items():
+                self._validate_column(field_name, column_rows, values, specs[field_name], emit)
+        
+        # Materialize results only for rows that collected issues
+        for row in set(required_issues) | set(field_issues):
+            metadata = items[row][1]
+            issues = list(required_issues.get(row, []))
+            row_field_issues = field_issues.get(row, {})
+            for field_name in metadata:
+                issues.extend(row_field_issues.get(field_name, []))
+            
+            results[row] = ValidationResult(
+                is_valid=not any(i.severity == ValidationSeverity.ERROR for i in issues),
+                issues=issues,
+                needs_review=bool(issues),
+                validated_metadata=metadata.copy()
+            )
+        
+        # Share results with repeated rows and remember them for next time
+        for row, key in keys.items():
+            result = results.get(row)
+            if result is None:
+                result = ValidationResult(is_valid=True, validated_metadata=items[row][1].copy())
+            result = self.cache.put(key, result)
+            for repeat in repeats[key]:
+                if result.issues:
+                    results[repeat] = result
+        
+        return results
+    
+    def _validate_column(self, field_name: str, rows: List[int], values: List[Any],
+                         spec: Dict[str, Any], emit) -> None:
+        """
+        Validate one field's values for many rows at once.
+        
+        Selects the offending positions column-wide, then builds issues with
+        the same per-value helpers used by validate() so messages match.
+        """
+        field_type = spec.get('type')
+        
+        # Type validation; values with the wrong type skip the other checks
+        type_issues = [self._validate_type(field_name, v, field_type) for v in values]
+        if any(type_issues):
+            for row, issue in zip(rows, type_issues):
+                if issue:
+                    emit(row, issue)
+            keep = [k for k, issue in enumerate(type_issues) if issue is None]
+            rows = [rows[k] for k in keep]
+            values = [values[k] for k in keep]
+            if not values:
+                return
+        
+        # Range validation for numeric types
+        if field_type in ('integer', 'decimal'):
+            for k in _out_of_range(values, spec.get('min'), spec.get('max')):
+                for issue in self._validate_range(field_name, values[k], spec):
+                    emit(rows[k], issue)
+        
+        # Enum validation
+        if field_type == 'enum':
+            allowed_values = spec.get('values', [])
+            for k in _not_member(values, allowed_values):
+                emit(rows[k], self._validate_enum(field_name, values[k], spec))
+        
+        # Pattern validation for strings
+        if field_type == 'string' and spec.get('pattern'):
+            try:
+                compiled = re.compile(spec['pattern'])
+            except re.error:
+                compiled = None
+            if compiled is not None:
+                for k, value in enumerate(values):
+                    if not compiled.match(value):
+                        emit(rows[k], self._validate_pattern(field_name, value, spec))
+        
+        # Check for uncommon values
+        common_values = spec.get('common_values', [])
+        if common_values:
+            for k in _not_member(values, common_values):
+                emit(rows[k], self._uncommon_value_issue(field_name, values[k], common_values))
+    
     def get_category_fields(self, category_slug: str) -> Tuple[List[str], List[str]]:
         """Get required and optional fields for a category."""
         if category_slug not in self.categories:
@@ -318,6 +603,141 @@ class CategoryValidator:
         )
 
 
+def _out_of_range(values: List[Any], min_val: Any, max_val: Any) -> List[int]:
+    """Positions of numeric values below min_val or above max_val."""
+    if min_val is None and max_val is None:
+        return []
+    
+    if np is not None:
+        column = np.asarray(values, dtype=float)
+        mask = np.zeros(len(column), dtype=bool)
+        if min_val is not None:
+            mask |= column < min_val
+        if max_val is not None:
+            mask |= column > max_val
+        return np.flatnonzero(mask).tolist()
+    
+    column = array('d', values)
+    low = float('-inf') if min_val is None else min_val
+    high = float('inf') if max_val is None else max_val
+    return [k for k, v in enumerate(column) if v < low or v > high]
+
+
+def _not_member(values: List[Any], allowed: List[Any]) -> List[int]:
+    """Positions of values that are not in the allowed list."""
+    try:
+        allowed_set = set(allowed)
+        return [k for k, v in enumerate(values) if v not in allowed_set]
+    except TypeError:  # Unhashable values; fall back to list membership
+        return [k for k, v in enumerate(values) if v not in allowed]
+
+
+class OutlierDetector:
+    """
+    Flags numeric spec values that are far from the rest of their category.
+    
+    Static min/max bounds in category-specs.json let typos like a 2120cc
+    "212cc" engine through as long as they stay under the maximum. This
+    looks at the batch itself: for every (category, field) column it
+    computes the median and the median absolute deviation (MAD), optionally
+    together with reference values from the catalog, and flags values
+    whose modified z-score 0.6745 * |x - median| / MAD exceeds the
+    threshold (Iglewicz & Hoaglin). When the MAD is zero (most values
+    identical) the mean absolute deviation is used instead.
+    """
+    
+    THRESHOLD = 3.5
+    MIN_SAMPLES = 5
+    
+    def __init__(self, threshold: float = THRESHOLD, min_samples: int = MIN_SAMPLES,
+                 reference: Optional[Callable[[str, str], List[float]]] = None):
+        """
+        Args:
+            threshold: Modified z-score above which a value is an outlier
+            min_samples: Minimum values (batch + reference) per column
+            reference: Optional lookup (category, field) -> known values,
+                e.g. CatalogSnapshot.spec_values
+        """
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.reference = reference
+    
+    def detect(self, items: List[Tuple[str, Dict[str, Any]]]) -> Dict[int, List[ValidationIssue]]:
+        """
+        Find outliers in a batch.
+        
+        Args:
+            items: (category_slug, metadata) per record
+        
+        Returns:
+            {position: [issues]} for records with outlying values only
+        """
+        # One pass to split the batch into numeric columns
+        columns: Dict[Tuple[str, str], Tuple[array, array]] = {}
+        for i, (category, metadata) in enumerate(items):
+            if not category:
+                continue
+            for field_name, value in metadata.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                if not math.isfinite(value):
+                    continue
+                column = columns.get((category, field_name))
+                if column is None:
+                    column = columns[(category, field_name)] = (array('d'), array('l'))
+                column[0].append(value)
+                column[1].append(i)
+        
+        outliers: Dict[int, List[ValidationIssue]] = {}
+        for (category, field_name), (values, positions) in columns.items():
+            reference = self.reference(category, field_name) if self.reference else []
+            if len(values) + len(reference) < self.min_samples:
+                continue
+            
+            center, flagged = _robust_outliers(values, reference, self.threshold)
+            for k in flagged:
+                value = values[k]
+                outliers.setdefault(positions[k], []).append(ValidationIssue(
+                    field=field_name,
+                    message=f"Value {value:g} is an outlier for '{field_name}' in {category}",
+                    severity=ValidationSeverity.WARNING,
+                    current_value=value,
+                    expected=f"near {center:g}",
+                    suggestion=f"Check if {value:g} is correct, typical value is {center:g}"
+                ))
+        
+        return outliers
+
+
+def _robust_outliers(values: array, reference: List[float],
+                     threshold: float) -> Tuple[float, List[int]]:
+    """Median of values + reference, and the positions in values beyond threshold."""
+    if np is not None:
+        column = np.frombuffer(values, dtype=np.float64)
+        sample = np.concatenate([column, np.asarray(reference, dtype=np.float64)]) if reference else column
+        center = float(np.median(sample))
+        deviations = np.abs(sample - center)
+        spread = float(np.median(deviations))
+        mean_deviation = float(deviations.mean())
+    else:
+        sample = list(values) + list(reference)
+        center = statistics.median(sample)
+        deviations = [abs(v - center) for v in sample]
+        spread = statistics.median(deviations)
+        mean_deviation = math.fsum(deviations) / len(deviations)
+    
+    if spread:
+        limit = threshold * spread / 0.6745
+    elif mean_deviation:
+        limit = threshold * 1.253314 * mean_deviation
+    else:
+        return center, []
+    
+    if np is not None:
+        return center, np.flatnonzero(np.abs(column - center) > limit).tolist()
+    return center, [k for k, v in enumerate(values) if abs(v - center) > limit]
+
+
 class PartValidator:
     """Complete part validation including name, brand, and metadata."""
     
@@ -394,91 +814,605 @@ class PartValidator:
             Summary with individual results
         """
         results = []
-        valid_count = 0
-        invalid_count = 0
-        review_count = 0
-        
-        for i, part in enumerate(parts):
-            result = self.validate_part(part)
-            results.append({
-                'index': i,
-                'name': part.get('name', f'Part {i}'),
-                'result': result.to_dict()
-            })
-            
-            if result.is_valid:
-                valid_count += 1
-            else:
-                invalid_count += 1
-            
-            if result.needs_review:
-                review_count += 1
+        summary = {}
+        
+        for entry in self.iter_validate_batch(parts):
+            summary = entry.pop('summary')
+            results.append(entry)
         
         return {
             'total': len(parts),
-            'valid': valid_count,
-            'invalid': invalid_count,
-            'needs_review': review_count,
+            'valid': summary.get('valid', 0),
+            'invalid': summary.get('invalid', 0),
+            'needs_review': summary.get('needs_review', 0),
             'results': results
         }
+    
+    def iter_validate_batch(self, parts: Iterable[Dict[str, Any]],
+                            workers: int = 0,
+                            chunk_size: int = 256,
+                            ordered: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Validate parts lazily, yielding each result as it is ready.
+        
+        Only a bounded number of chunks is in flight at once, so results can
+        be streamed to disk and the caller may stop early (closing the
+        generator cancels pending work).
+        
+        Args:
+            parts: Parts to validate (any iterable, consumed lazily)
+            workers: Worker processes; 0 validates in this process
+            chunk_size: Parts per task sent to a worker
+            ordered: Yield in input order; otherwise in completion order
+        
+        Yields:
+            {'index', 'name', 'result', 'summary'}, where summary holds the
+            running total/valid/invalid/needs_review counters
+        """
+        summary = {'total': 0, 'valid': 0, 'invalid': 0, 'needs_review': 0}
+        
+        def counted(entry: Dict[str, Any]) -> Dict[str, Any]:
+            result = entry['result']
+            summary['total'] += 1
+            summary['valid' if result['is_valid'] else 'invalid'] += 1
+            if result['needs_review']:
+                summary['needs_review'] += 1
+            entry['summary'] = dict(summary)
+            return entry
+        
+        if workers <= 0:
+            for i, part in enumerate(parts):
+                yield counted(_validate_chunk([(i, part)], self)[0])
+            return
+        
+        from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+        
+        chunks = _chunked(enumerate(parts), chunk_size)
+        max_in_flight = workers * 2
+        # Workers validate with a copy of this validator, config and all
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(self,))
+        pending = []
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(_validate_chunk, chunk))
+                if len(pending) < max_in_flight:
+                    continue
+                for entry in _drain(pending, ordered, wait, FIRST_COMPLETED):
+                    yield counted(entry)
+            while pending:
+                for entry in _drain(pending, ordered, wait, FIRST_COMPLETED):
+                    yield counted(entry)
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+
+# Per-process validator for worker processes, set by _init_worker
+_worker_validator: Optional[PartValidator] = None
+
+
+def _init_worker(validator: PartValidator):
+    global _worker_validator
+    _worker_validator = validator
+
+
+def _validate_chunk(chunk: List[Tuple[int, Dict[str, Any]]],
+                    validator: Optional[PartValidator] = None) -> List[Dict[str, Any]]:
+    """Validate (index, part) pairs; runs in a worker when validator is None."""
+    if validator is None:
+        validator = _worker_validator
+    
+    return [
+        {
+            'index': i,
+            'name': part.get('name', f'Part {i}'),
+            'result': validator.validate_part(part).to_dict()
+        }
+        for i, part in chunk
+    ]
+
+
+def _drain(pending: list, ordered: bool, wait, first_completed) -> List[Dict[str, Any]]:
+    """Pop finished chunks off `pending`: the head when ordered, else any."""
+    if ordered:
+        return pending.pop(0).result()
+    done, _ = wait(pending, return_when=first_completed)
+    entries = []
+    for future in done:
+        pending.remove(future)
+        entries.extend(future.result())
+    return entries
+
+
+class MinHashLSHIndex:
+    """
+    MinHash LSH blocking index over character shingles, bucketed by brand.
+    
+    Signatures use one-permutation hashing with densification, so a signature
+    costs one hash per shingle. Each signature is cut into `bands` bands of
+    `rows` values and two names become candidates when any band matches. A
+    pair with shingle Jaccard similarity s is found with probability
+    1 - (1 - s ** rows) ** bands: more bands or fewer rows raise recall at the
+    cost of larger candidate sets.
+    """
+    
+    def __init__(self, bands: int = 32, rows: int = 4, shingle_size: int = 3):
+        self.bands = bands
+        self.rows = rows
+        self.shingle_size = shingle_size
+        self.num_perm = bands * rows
+        # (band, band hash) -> brand slug -> names
+        self._buckets: Dict[Tuple[int, int], Dict[str, set]] = {}
+        # (name, brand slug) -> number of parts indexed under it
+        self._counts: Dict[Tuple[str, str], int] = {}
+    
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """Compute the MinHash signature of a normalized name."""
+        k = self.shingle_size
+        padded = f" {text} "
+        shingles = {padded[i:i + k] for i in range(max(1, len(padded) - k + 1))}
+        
+        n = self.num_perm
+        mins: List[Optional[int]] = [None] * n
+        for shingle in shingles:
+            h = _mix32(zlib.crc32(shingle.encode('utf-8')))
+            slot, value = h % n, h // n
+            if mins[slot] is None or value < mins[slot]:
+                mins[slot] = value
+        
+        # Densify: empty slots borrow the next filled slot's value, offset by
+        # distance so borrowed values don't collide with real ones
+        filled = [i for i, v in enumerate(mins) if v is not None]
+        if not filled:
+            return tuple([0] * n)
+        offset = (1 << 32) // n + 1
+        for i in range(n):
+            if mins[i] is None:
+                distance = 1
+                while mins[(i + distance) % n] is None:
+                    distance += 1
+                mins[i] = mins[(i + distance) % n] + distance * offset
+        return tuple(mins)
+    
+    def band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, int]]:
+        """Bucket keys for each band of a signature (stable across processes)."""
+        r = self.rows
+        return [
+            (b, zlib.crc32(array('Q', signature[b * r:(b + 1) * r]).tobytes()))
+            for b in range(self.bands)
+        ]
+    
+    def add(self, name: str, brand: str = '', signature: Optional[Tuple[int, ...]] = None):
+        """Insert a normalized name under a brand slug ('' when unbranded)."""
+        count = self._counts.get((name, brand), 0)
+        self._counts[(name, brand)] = count + 1
+        if count:
+            return
+        if signature is None:
+            signature = self.signature(name)
+        for key in self.band_keys(signature):
+            self._buckets.setdefault(key, {}).setdefault(brand, set()).add(name)
+    
+    def remove(self, name: str, brand: str = ''):
+        """Drop one occurrence of a name; buckets forget it at zero."""
+        count = self._counts.get((name, brand), 0)
+        if count > 1:
+            self._counts[(name, brand)] = count - 1
+            return
+        if not count:
+            return
+        del self._counts[(name, brand)]
+        for key in self.band_keys(self.signature(name)):
+            by_brand = self._buckets.get(key)
+            names = by_brand.get(brand) if by_brand else None
+            if names is None:
+                continue
+            names.discard(name)
+            if not names:
+                del by_brand[brand]
+                if not by_brand:
+                    del self._buckets[key]
+    
+    def query(self, name: str, brand: str = '') -> set:
+        """
+        Candidate names sharing at least one band with `name`.
+        
+        With a brand, only that brand's bucket and unbranded names are
+        considered; without one, all brands are.
+        """
+        candidates = set()
+        for key in self.band_keys(self.signature(name)):
+            by_brand = self._buckets.get(key)
+            if not by_brand:
+                continue
+            if brand:
+                candidates.update(by_brand.get(brand, ()))
+                candidates.update(by_brand.get('', ()))
+            else:
+                for names in by_brand.values():
+                    candidates.update(names)
+        return candidates
+
+
+def _discard(index: Dict[Any, Dict[int, None]], key: Any, idx: int):
+    """Remove idx from index[key], dropping the key once it is empty."""
+    members = index.get(key)
+    if members is None:
+        return
+    members.pop(idx, None)
+    if not members:
+        del index[key]
+
+
+def _mix32(h: int) -> int:
+    """Scramble a 32-bit hash (crc32 alone is linear in its input)."""
+    h = (h * 0x9E3779B1) & 0xFFFFFFFF
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & 0xFFFFFFFF
+    h ^= h >> 13
+    return h
+
+
+class BloomFilter:
+    """
+    Compact probabilistic set membership for very large key sets.
+    
+    Never reports a false negative; false positives occur at roughly
+    `false_positive_rate` once `capacity` keys have been added.
+    """
+    
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.num_bits = max(8, int(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+    
+    @classmethod
+    def from_bits(cls, capacity: int, num_bits: int, num_hashes: int, bits: bytes) -> 'BloomFilter':
+        """Restore a filter saved as its capacity, shape and bit array."""
+        bloom = cls.__new__(cls)
+        bloom.capacity = capacity
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.bits = bytearray(bits)
+        return bloom
+    
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+    
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+    
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
 
 
 class DuplicateDetector:
     """Detects potential duplicate parts."""
     
-    def __init__(self, existing_parts: Optional[List[Dict]] = None):
-        self.existing_parts = existing_parts or []
+    # Detectors with more distinct names than this use LSH blocking by default
+    LSH_MIN_NAMES = 2000
+    
+    FUZZY_THRESHOLD = 0.85
+    
+    # Top match similarity above which a part is treated as a duplicate
+    DUPLICATE_THRESHOLD = 0.95
+    
+    def __init__(self, existing_parts: Optional[List[Dict]] = None,
+                 use_lsh: Optional[bool] = None,
+                 lsh_bands: int = 32, lsh_rows: int = 4):
+        """
+        Args:
+            existing_parts: Catalog parts (dicts with name, brand, sku, ...);
+                copied, so add() and remove() leave the caller's list alone
+            use_lsh: Use MinHash LSH blocking for fuzzy matching instead of
+                scanning every name. By default it turns on once more than
+                LSH_MIN_NAMES names are indexed, up front for large
+                catalogs or as parts are added (e.g. a batch growing).
+            lsh_bands: LSH bands; more bands raise recall
+            lsh_rows: Rows per band; more rows shrink candidate sets
+        """
+        self.existing_parts = list(existing_parts or [])
         self._index = self._build_index()
+        self._sku_index = self._build_sku_index()
+        
+        self._lsh_auto = use_lsh is None
+        self._lsh_shape = (lsh_bands, lsh_rows)
+        if use_lsh is None:
+            use_lsh = len(self._index) > self.LSH_MIN_NAMES
+        self._lsh = self._build_lsh(lsh_bands, lsh_rows) if use_lsh else None
+    
+    # Index values are dicts used as insertion-ordered sets so add() and
+    # remove() stay O(1) while iteration keeps catalog order.
     
-    def _build_index(self) -> Dict[str, List[int]]:
+    def _build_index(self) -> Dict[str, Dict[int, None]]:
         """Build index of existing parts by normalized name."""
-        index = {}
+        index: Dict[str, Dict[int, None]] = {}
         for i, part in enumerate(self.existing_parts):
+            if part is None:
+                continue
             name = self._normalize_for_matching(part.get('name', ''))
-            if name not in index:
-                index[name] = []
-            index[name].append(i)
+            index.setdefault(name, {})[i] = None
         return index
     
+    def _build_sku_index(self) -> Dict[str, Dict[str, Dict[int, None]]]:
+        """Build index of existing parts by normalized SKU, then brand slug."""
+        index: Dict[str, Dict[str, Dict[int, None]]] = {}
+        for i, part in enumerate(self.existing_parts):
+            if part is None:
+                continue
+            sku = self._part_sku(part)
+            if not sku:
+                continue
+            index.setdefault(sku, {}).setdefault(self._part_brand(part), {})[i] = None
+        return index
+    
+    def _build_lsh(self, bands: int, rows: int) -> MinHashLSHIndex:
+        """Build the LSH blocking index over existing part names."""
+        lsh = MinHashLSHIndex(bands=bands, rows=rows)
+        for part in self._lsh_parts():
+            if part is None:
+                continue
+            lsh.add(self._normalize_for_matching(part.get('name', '')), self._part_brand(part))
+        return lsh
+    
+    def _part_brand(self, part: Dict[str, Any]) -> str:
+        return self._normalize_brand(part.get('brand_slug') or part.get('brand', ''))
+    
+    def _part_sku(self, part: Dict[str, Any]) -> str:
+        return self._normalize_sku(part.get('sku') or part.get('part_number', ''))
+    
+    def add(self, part: Dict[str, Any]) -> int:
+        """
+        Add a part to every index, e.g. a record accepted earlier in a batch.
+        
+        Returns:
+            The part's index, usable with remove()
+        """
+        idx = len(self.existing_parts)
+        self.existing_parts.append(part)
+        self._index_part(idx, *self.index_keys(part))
+        return idx
+    
+    def index_keys(self, part: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Normalized (name, brand slug, SKU) keys a part is indexed under."""
+        return (
+            self._normalize_for_matching(part.get('name', '')),
+            self._part_brand(part),
+            self._part_sku(part)
+        )
+    
+    def _index_part(self, idx: int, name: str, brand: str, sku: str,
+                    signature: Optional[Tuple[int, ...]] = None):
+        """Insert precomputed keys for existing_parts[idx] into the indexes."""
+        self._index.setdefault(name, {})[idx] = None
+        
+        if sku:
+            self._sku_index.setdefault(sku, {}).setdefault(brand, {})[idx] = None
+        
+        if self._lsh is not None:
+            self._lsh.add(name, brand, signature)
+        elif self._lsh_auto and len(self._index) > self.LSH_MIN_NAMES:
+            # Past the threshold a full scan per lookup makes adding parts
+            # quadratic; switch to blocking, indexing the parts so far
+            self._lsh = self._build_lsh(*self._lsh_shape)
+    
+    def remove(self, idx: int):
+        """
+        Remove a part from every index.
+        
+        The slot in existing_parts is set to None so other indices stay
+        valid.
+        """
+        part = self.existing_parts[idx]
+        if part is None:
+            return
+        self.existing_parts[idx] = None
+        
+        name, brand, sku = self.index_keys(part)
+        _discard(self._index, name, idx)
+        
+        if sku and sku in self._sku_index:
+            _discard(self._sku_index[sku], brand, idx)
+            if not self._sku_index[sku]:
+                del self._sku_index[sku]
+        
+        if self._lsh is not None:
+            self._lsh.remove(name, brand)
+    
+    def is_duplicate(self, matches: List[Dict[str, Any]]) -> bool:
+        """Whether find_duplicates() matches make the part a duplicate."""
+        return bool(matches) and matches[0].get('similarity', 0) > self.DUPLICATE_THRESHOLD
+    
+    def merge_batches(self, shards: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Merge the parts accepted by parallel workers into this detector.
+        
+        Each worker only checked its shard against the catalog and its own
+        earlier rows. Parts are replayed in (row_number, shard, position)
+        order, so the outcome doesn't depend on which worker finished first;
+        a part that duplicates the catalog or an earlier replayed part is
+        rejected instead of added.
+        
+        Args:
+            shards: Accepted parts per worker, each with a 'row_number'
+        
+        Returns:
+            List of {'part', 'matches'} for rejected parts, in replay order
+        """
+        ordered = sorted(
+            (part.get('row_number') or 0, shard_no, position, part)
+            for shard_no, parts in enumerate(shards)
+            for position, part in enumerate(parts)
+        )
+        
+        rejected = []
+        for _, _, _, part in ordered:
+            matches = self.find_duplicates(
+                part.get('name', ''),
+                part.get('brand_slug') or part.get('brand', ''),
+                part.get('sku', '')
+            )
+            if self.is_duplicate(matches):
+                rejected.append({'part': part, 'matches': matches})
+            else:
+                self.add(part)
+        
+        return rejected
+    
     def _normalize_for_matching(self, text: str) -> str:
         """Normalize text for duplicate matching."""
-        import re
         text = text.lower().strip()
         text = re.sub(r'[^\w\s]', '', text)
         text = re.sub(r'\s+', ' ', text)
         return text
     
+    def _normalize_sku(self, sku: Any) -> str:
+        """Normalize a SKU/part number (PRED-212-HEMI -> pred212hemi)."""
+        return re.sub(r'[^a-z0-9]', '', str(sku or '').lower())
+    
+    def _normalize_brand(self, brand: Any) -> str:
+        """Normalize a brand name or slug to a slug ('' when unknown)."""
+        if isinstance(brand, dict):
+            brand = brand.get('slug') or brand.get('canonical') or ''
+        slug = re.sub(r'[^a-z0-9]+', '-', str(brand or '').lower()).strip('-')
+        return '' if slug == 'unknown' else slug
+    
     def find_duplicates(self, name: str, brand: str = '', 
                         sku: str = '') -> List[Dict[str, Any]]:
         """
         Find potential duplicates.
         
+        A (brand, SKU) match is the strongest signal and skips the fuzzy
+        name scan entirely.
+        
         Returns:
             List of potential matches with similarity scores
         """
-        from difflib import SequenceMatcher
-        
         normalized = self._normalize_for_matching(name)
-        matches = []
+        brand_slug = self._normalize_brand(brand)
+        matches = self._sku_matches(sku, brand_slug)
+        sku_hit = bool(matches)
+        seen = {m['index'] for m in matches}
         
         # Exact match
-        if normalized in self._index:
-            for idx in self._index[normalized]:
-                matches.append({
-                    'index': idx,
-                    'part': self.existing_parts[idx],
-                    'similarity': 1.0,
-                    'match_type': 'exact'
-                })
-        
-        # Fuzzy match
-        for existing_name, indices in self._index.items():
+        for idx in self._name_lookup(normalized):
+            if idx in seen:
+                continue
+            matches.append({
+                'index': idx,
+                'part': self.existing_parts[idx],
+                'similarity': 1.0,
+                'match_type': 'exact'
+            })
+        
+        # Fuzzy match, against LSH candidates when blocking is enabled
+        if not sku_hit:
+            if self._lsh is not None:
+                candidates = self._lsh_candidates(normalized, brand_slug)
+            else:
+                candidates = self._all_names()
+            matches.extend(self._fuzzy_matches(normalized, candidates))
+        
+        # Sort by similarity
+        matches.sort(key=lambda x: x['similarity'], reverse=True)
+        
+        return matches[:5]  # Return top 5 matches
+    
+    def _sku_matches(self, sku: str, brand_slug: str) -> List[Dict[str, Any]]:
+        """
+        Exact matches on normalized SKU.
+        
+        Parts match when their brand equals `brand_slug` or either side has
+        no known brand.
+        """
+        key = self._normalize_sku(sku)
+        if not key:
+            return []
+        
+        by_brand = self._sku_lookup(key)
+        if not by_brand:
+            return []
+        
+        if brand_slug:
+            indices = list(by_brand.get(brand_slug, ())) + list(by_brand.get('', ()))
+        else:
+            indices = [idx for ids in by_brand.values() for idx in ids]
+        
+        return [
+            {
+                'index': idx,
+                'part': self.existing_parts[idx],
+                'similarity': 1.0,
+                'match_type': 'sku'
+            }
+            for idx in sorted(indices)
+        ]
+    
+    # Index lookups; overridden by detectors backed by a catalog snapshot
+    
+    def _name_lookup(self, name: str) -> Iterable[int]:
+        """Indices of parts with a normalized name."""
+        return self._index.get(name, ())
+    
+    def _sku_lookup(self, sku: str) -> Dict[str, Iterable[int]]:
+        """Indices of parts with a normalized SKU, by brand slug."""
+        return self._sku_index.get(sku, {})
+    
+    def _all_names(self) -> Dict[str, Any]:
+        """Every indexed name, in catalog order."""
+        return self._index
+    
+    def _lsh_parts(self) -> Iterable[Optional[Dict[str, Any]]]:
+        """Parts the in-memory LSH index is built from."""
+        return self.existing_parts
+    
+    def _lsh_candidates(self, name: str, brand_slug: str) -> set:
+        """Names sharing an LSH band with `name`."""
+        return self._lsh.query(name, brand_slug)
+    
+    def _order_candidates(self, names: Iterable[str]) -> List[str]:
+        """Sort candidate names by the catalog position of their first part."""
+        return sorted(
+            (n for n in names if n in self._index),
+            key=lambda n: next(iter(self._index[n]))
+        )
+    
+    def _fuzzy_matches(self, normalized: str, candidates) -> List[Dict[str, Any]]:
+        """Score candidate names against a normalized name."""
+        matches = []
+        
+        # Visit candidates in catalog order so ties sort like a full scan
+        if not isinstance(candidates, dict):
+            candidates = self._order_candidates(candidates)
+        
+        # quick ratios are symmetric upper bounds of ratio(); a probe with
+        # the query as its second sequence counts the query's characters
+        # once instead of once per candidate
+        probe = SequenceMatcher(None)
+        probe.set_seq2(normalized)
+        
+        for existing_name in candidates:
             if existing_name == normalized:
                 continue
             
+            # Skip hopeless pairs
+            probe.set_seq1(existing_name)
+            if (probe.real_quick_ratio() <= self.FUZZY_THRESHOLD or
+                    probe.quick_ratio() <= self.FUZZY_THRESHOLD):
+                continue
+            
             similarity = SequenceMatcher(None, normalized, existing_name).ratio()
-            if similarity > 0.85:
-                for idx in indices:
+            if similarity > self.FUZZY_THRESHOLD:
+                for idx in self._name_lookup(existing_name):
                     matches.append({
                         'index': idx,
                         'part': self.existing_parts[idx],
@@ -486,10 +1420,53 @@ class DuplicateDetector:
                         'match_type': 'fuzzy'
                     })
         
-        # Sort by similarity
-        matches.sort(key=lambda x: x['similarity'], reverse=True)
+        return matches
+    
+    def measure_blocking(self, queries: List[Tuple[str, str]]) -> Dict[str, Any]:
+        """
+        Measure LSH blocking against a brute-force scan of all names.
         
-        return matches[:5]  # Return top 5 matches
+        Args:
+            queries: (name, brand) pairs to look up
+        
+        Returns:
+            Recall of fuzzy matches, mean candidates per query, and
+            queries/sec for the LSH and brute-force paths
+        """
+        if self._lsh is None:
+            raise ValueError("LSH blocking is not enabled for this detector")
+        
+        normalized = [(self._normalize_for_matching(n), self._normalize_brand(b))
+                      for n, b in queries]
+        
+        start = time.perf_counter()
+        all_names = self._all_names()
+        brute = [self._fuzzy_matches(name, all_names) for name, _ in normalized]
+        brute_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        candidate_count = 0
+        blocked = []
+        for name, brand in normalized:
+            candidates = self._lsh_candidates(name, brand)
+            candidate_count += len(candidates)
+            blocked.append(self._fuzzy_matches(name, candidates))
+        lsh_time = time.perf_counter() - start
+        
+        expected = sum(len(m) for m in brute)
+        found = sum(
+            len({m['index'] for m in b} & {m['index'] for m in l})
+            for b, l in zip(brute, blocked)
+        )
+        
+        return {
+            'queries': len(queries),
+            'catalog_names': len(all_names),
+            'recall': found / expected if expected else 1.0,
+            'avg_candidates': candidate_count / len(queries) if queries else 0.0,
+            'lsh_queries_per_sec': len(queries) / lsh_time if lsh_time else 0.0,
+            'brute_force_queries_per_sec': len(queries) / brute_time if brute_time else 0.0
+        }
 
 
 # Convenience function